@@ -1,24 +1,23 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from app.services.analytics_service import AnalyticsService
-from app.core.security import get_current_user
-from app.utils.cache import get_cache, set_cache
+from app.services import rollup_service
+from app.core.security import get_current_user_id
 
 
 router = APIRouter(prefix="/dashboard", tags=["Analytics"])
 svc = AnalyticsService()
 
 @router.get("/analytics")
-def dashboard(user=Depends(get_current_user)):
-    user_id = user["id"]
-    cache_key = f"analytics_{user_id}"
-
-    # ✅ Try to return cached data
-    cached = get_cache(cache_key)
-    if cached:
-        return cached
-
-    # ✅ Otherwise compute and cache
-    result = svc.get_dashboard(user_id)
-    set_cache(cache_key, result, ttl=60)  # Cache for 60 seconds
-    return result
+async def dashboard(user_id: str = Depends(get_current_user_id)):
+    return await svc.get_dashboard(user_id)
 
+@router.get("/analytics/timeseries")
+async def dashboard_timeseries(
+    granularity: str = Query("day", pattern="^(day|week)$"),
+    days: int = Query(30, ge=1, le=366),
+    user_id: str = Depends(get_current_user_id)
+):
+    return {
+        "granularity": granularity,
+        "buckets": await rollup_service.get_timeseries(user_id, granularity, days)
+    }
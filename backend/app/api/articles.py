@@ -1,32 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException
-from app.models.article import ArticleCreate, ArticleUpdate, ArticleResponse
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from app.models.article import ArticleCreate, ArticleUpdate, ArticleResponse, ArticleSummary
 from app.services import article_service
-from app.core.security import get_current_user
+from app.core.security import get_current_user_id
 
 router = APIRouter(prefix="/articles", tags=["Articles"])
 
 @router.post("/", response_model=ArticleResponse)
-def create_article(data: ArticleCreate, user=Depends(get_current_user)):
-    return article_service.save_article(user["id"], data)
+async def create_article(data: ArticleCreate, user_id: str = Depends(get_current_user_id)):
+    return await article_service.save_article(user_id, data)
 
-@router.get("/", response_model=list[ArticleResponse])
-def list_articles(user=Depends(get_current_user)):
-    return article_service.get_user_articles(user["id"])
+@router.get("/", response_model=list[ArticleResponse] | list[ArticleSummary])
+async def list_articles(
+    response: Response,
+    # Defaults to LIST_PAGE_SIZE; follow X-Next-Cursor for the rest
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[str] = None,
+    summary: bool = False,
+    user_id: str = Depends(get_current_user_id)
+):
+    try:
+        articles, next_cursor = await article_service.get_user_articles(user_id, limit, cursor, summary)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # The body stays a plain list; the next page is advertised in a header
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return articles
+
+# Registered before /{article_id} so "export" isn't taken for an id
+@router.get("/export")
+async def export_articles(
+    format: str = Query("zip", enum=["zip", "ndjson", "csv"]),
+    user_id: str = Depends(get_current_user_id)
+):
+    return article_service.export_articles(user_id, format)
 
 @router.get("/{article_id}", response_model=ArticleResponse)
-def get_article(article_id: str, user=Depends(get_current_user)):
-    article = article_service.get_article_by_id(user["id"], article_id)
+async def get_article(article_id: str, user_id: str = Depends(get_current_user_id)):
+    article = await article_service.get_article_by_id(user_id, article_id)
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
     return article
 
 @router.put("/{article_id}", response_model=ArticleResponse)
-def update_article(article_id: str, data: ArticleUpdate, user=Depends(get_current_user)):
-    return article_service.update_article(user["id"], article_id, data)
+async def update_article(article_id: str, data: ArticleUpdate, user_id: str = Depends(get_current_user_id)):
+    return await article_service.update_article(user_id, article_id, data)
 
 @router.delete("/{article_id}")
-def delete_article(article_id: str, user=Depends(get_current_user)):
-    success = article_service.delete_article(user["id"], article_id)
+async def delete_article(article_id: str, user_id: str = Depends(get_current_user_id)):
+    success = await article_service.delete_article(user_id, article_id)
     if not success:
         raise HTTPException(status_code=404, detail="Article not found")
     return {"message": "Article deleted successfully ✅"}
@@ -9,34 +9,45 @@ from app.services.auth_service import (
     reset_password,
     verify_refresh_token
 )
+from app.services.email_outbox import OutboxFullError
+from app.utils.password_hasher import PasswordHasherBusy
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+def _hasher_busy(e: PasswordHasherBusy) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(max(1, round(e.retry_after)))})
+
 @router.post("/register")
-def register(data: RegisterModel):
+async def register(data: RegisterModel):
     try:
-        create_user_and_send_code(data.email, data.password)
+        await create_user_and_send_code(data.email, data.password)
         return {"message": "Verification code sent to email."}
+    except PasswordHasherBusy as e:
+        raise _hasher_busy(e)
+    except OutboxFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/verify")
-def verify(data: VerifyEmailModel):
+async def verify(data: VerifyEmailModel):
     try:
-        token = verify_email(data.email, data.code)
+        token = await verify_email(data.email, data.code)
         return {"message": "Email verified ✅", "access_token": token}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/login")
-def login(data: LoginModel):
+async def login(data: LoginModel):
     try:
-        tokens = login_user(data.email, data.password)
+        tokens = await login_user(data.email, data.password)
         return {
             "message": "Login successful ✅",
             "access_token": tokens["access_token"],
             "refresh_token": tokens["refresh_token"]
         }
+    except PasswordHasherBusy as e:
+        raise _hasher_busy(e)
     except Exception as e:
         raise HTTPException(status_code=401, detail=str(e))
 
@@ -53,22 +64,28 @@ def resend_code(data: ResendCodeModel):
     try:
         resend_verification_code(data.email)
         return {"message": "Verification code resent ✅"}
+    except OutboxFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=429, detail=str(e))
 
 @router.post("/password-reset-request")
-def password_reset_request(data: PasswordResetRequestModel):
+async def password_reset_request(data: PasswordResetRequestModel):
     try:
-        request_password_reset(data.email)
+        await request_password_reset(data.email)
         return {"message": "Reset code sent to email."}
+    except OutboxFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/reset-password")
-def password_reset(data: PasswordResetModel):
+async def password_reset(data: PasswordResetModel):
     try:
-        reset_password(data.email, data.code, data.new_password)
+        await reset_password(data.email, data.code, data.new_password)
         return {"message": "Password reset successful ✅"}
+    except PasswordHasherBusy as e:
+        raise _hasher_busy(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -1,12 +1,20 @@
-from fastapi import APIRouter, HTTPException, Depends
+import json
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from app.services.ai_service import (
     generate_article,
     generate_article_from_template,
-    generate_batch
+    stream_article,
+    stream_article_from_template,
+    GroqRateLimitError
 )
-from app.core.security import get_current_user
-from app.database import supabase
+from app.utils.generation_cache import generation_cache
+from app.core.groq_scheduler import groq_scheduler
+from app.core.security import get_current_user_id
+from app.services import rollup_service
+from app.services.batch_job_service import batch_jobs
+from app.database import async_supabase
 from typing import List, Optional
 
 router = APIRouter(prefix="/generate", tags=["Content Generation"])
@@ -29,31 +37,51 @@ class BatchItem(BaseModel):
     tone: str = "professional"
 
 class BatchGenerationRequest(BaseModel):
-    items: List[BatchItem]
+    items: List[BatchItem] = Field(..., min_length=1)
 
-class BatchGenerationResponse(BaseModel):
-    results: List[dict]
+class BatchJobCreated(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    status_url: str
+
+class BatchJobStatus(BaseModel):
+    id: str
+    status: str
+    total: int
+    counts: dict
+    created_at: float
+    finished_at: Optional[float] = None
+    items: List[dict]
+
+def _busy(e: GroqRateLimitError) -> HTTPException:
+    headers = {"Retry-After": str(max(1, round(e.retry_after)))} if e.retry_after else None
+    return HTTPException(status_code=503, detail=str(e), headers=headers)
 
 # ----------------------------
 # 🚀 Generate Standard Article
 # ----------------------------
 @router.post("/article")
-def create_article(payload: GenerateRequest, user=Depends(get_current_user)):
+async def create_article(payload: GenerateRequest, fresh: bool = Query(False),
+                         user_id: str = Depends(get_current_user_id)):
     try:
-        content = generate_article(payload.keyword, payload.tone, payload.length)
-        supabase.table("articles").insert({
-            "user_id": user["id"],
+        content = await generate_article(payload.keyword, payload.tone, payload.length, fresh=fresh)
+        await async_supabase.table("articles").insert({
+            "user_id": user_id,
             "keyword": payload.keyword,
             "length": payload.length,
             "tone": payload.tone,
             "article": content
         }).execute()
+        rollup_service.record_articles(user_id)
         return {
             "keyword": payload.keyword,
             "length": payload.length,
             "tone": payload.tone,
             "article": content
         }
+    except GroqRateLimitError as e:
+        raise _busy(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -62,40 +90,130 @@ def create_article(payload: GenerateRequest, user=Depends(get_current_user)):
 # 🧩 Generate From Template
 # ----------------------------
 @router.post("/from-template")
-def from_template(req: TemplateGenerationRequest, user=Depends(get_current_user)):
+async def from_template(req: TemplateGenerationRequest, fresh: bool = Query(False),
+                        user_id: str = Depends(get_current_user_id)):
     try:
-        art = generate_article_from_template(
-            req.keyword, req.tone, req.length, req.template_id
+        art = await generate_article_from_template(
+            req.keyword, req.tone, req.length, req.template_id, fresh=fresh
         )
-        supabase.table("articles").insert({
-            "user_id": user["id"],
+        await async_supabase.table("articles").insert({
+            "user_id": user_id,
             "keyword": req.keyword,
             "length": req.length,
             "tone": req.tone,
             "article": art
         }).execute()
+        rollup_service.record_articles(user_id)
         return {"article": art}
+    except GroqRateLimitError as e:
+        raise _busy(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # ----------------------------
-# 📚 Batch Generation
+# 📡 Streaming Generation (SSE)
 # ----------------------------
-@router.post("/batch", response_model=BatchGenerationResponse)
-def batch_gen(req: BatchGenerationRequest, user=Depends(get_current_user)):
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _stream_and_save(request: Request, chunks, record: dict):
+    """Relay Groq deltas as SSE `token` events, then save the finished article once.
+
+    If the client goes away mid-stream the upstream request is closed and nothing is saved.
+    """
+    parts = []
     try:
-        results = generate_batch(req.items)
-        for r in results:
-            if "article" in r:
-                supabase.table("articles").insert({
-                    "user_id": user["id"],
-                    "keyword": r["keyword"],
-                    "length": "medium",
-                    "tone": "neutral",
-                    "article": r["article"]
-                }).execute()
-        return {"results": results}
+        async for delta in chunks:
+            if await request.is_disconnected():
+                return
+            parts.append(delta)
+            yield _sse("token", {"content": delta})
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        yield _sse("error", {"detail": str(e)})
+        return
+    finally:
+        await chunks.aclose()
+
+    article = "".join(parts)
+    try:
+        saved = await async_supabase.table("articles").insert({**record, "article": article}).execute()
+        rollup_service.record_articles(record["user_id"])
+    except Exception as e:
+        yield _sse("error", {"detail": str(e)})
+        return
+
+    article_id = saved.data[0]["id"] if saved.data else None
+    yield _sse("done", {
+        "id": article_id,
+        "keyword": record["keyword"],
+        "length": record["length"],
+        "tone": record["tone"]
+    })
+
+def _sse_response(request: Request, chunks, record: dict) -> StreamingResponse:
+    return StreamingResponse(
+        _stream_and_save(request, chunks, record),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/article/stream")
+async def create_article_stream(payload: GenerateRequest, request: Request, fresh: bool = Query(False),
+                                user_id: str = Depends(get_current_user_id)):
+    chunks = stream_article(payload.keyword, payload.tone, payload.length, fresh=fresh)
+    return _sse_response(request, chunks, {
+        "user_id": user_id,
+        "keyword": payload.keyword,
+        "length": payload.length,
+        "tone": payload.tone
+    })
+
+@router.post("/from-template/stream")
+async def from_template_stream(req: TemplateGenerationRequest, request: Request, fresh: bool = Query(False),
+                               user_id: str = Depends(get_current_user_id)):
+    try:
+        chunks = stream_article_from_template(req.keyword, req.tone, req.length, req.template_id, fresh=fresh)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _sse_response(request, chunks, {
+        "user_id": user_id,
+        "keyword": req.keyword,
+        "length": req.length,
+        "tone": req.tone
+    })
+
+
+# ----------------------------
+# 📚 Batch Generation
+# ----------------------------
+@router.post("/batch", response_model=BatchJobCreated, status_code=202)
+async def batch_gen(req: BatchGenerationRequest, fresh: bool = Query(False),
+                    user_id: str = Depends(get_current_user_id)):
+    # Queued and worked through in the background; each article is saved as it finishes
+    job_id = await batch_jobs.submit(user_id, [item.model_dump() for item in req.items], fresh=fresh)
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "total": len(req.items),
+        "status_url": f"/generate/jobs/{job_id}"
+    }
+
+@router.get("/jobs/{job_id}", response_model=BatchJobStatus)
+async def batch_job_status(job_id: str, user_id: str = Depends(get_current_user_id)):
+    job = await batch_jobs.get_job(job_id)
+    if not job or job["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+# ----------------------------
+# 🗄️ Generation Cache Stats
+# ----------------------------
+@router.get("/cache/stats")
+def cache_stats(user_id: str = Depends(get_current_user_id)):
+    return generation_cache.stats()
 
+@router.get("/scheduler/stats")
+def scheduler_stats(user_id: str = Depends(get_current_user_id)):
+    return groq_scheduler.stats()
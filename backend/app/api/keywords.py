@@ -1,21 +1,55 @@
+import json
 from fastapi import APIRouter, Query
-from app.services.keyword_service import save_keywords
-from app.services.scraping_service import get_suggestions
-from app.database import supabase
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from app.config import settings
+from app.services.keyword_service import research_keywords, expand_keywords, research_keywords_bulk
+from app.utils.keyword_matcher import normalize_keyword
+from typing import List
 
 router = APIRouter(prefix="/keywords", tags=["Keywords"])
 
-@router.get("/suggest")
-def suggest_keywords(q: str = Query(..., min_length=2)):
-    suggestions = get_suggestions(q)
-    save_keywords(q, suggestions)
+class BulkKeywordRequest(BaseModel):
+    seeds: List[str] = Field(..., min_length=1, max_length=settings.KEYWORD_BULK_MAX_SEEDS)
 
-    stored = supabase.table("keyword_research") \
-        .select("suggestion, search_volume, keyword_difficulty") \
-        .eq("query", q).execute()
+@router.get("/suggest")
+async def suggest_keywords(q: str = Query(..., min_length=2)):
+    query = normalize_keyword(q)
+    try:
+        rows = await research_keywords(query)
+    except Exception as e:
+        print(f"Error fetching suggestions: {e}")
+        rows = []
 
     return {
         "query": q,
-        "suggestions": stored.data
+        "suggestions": [
+            {
+                "suggestion": row["suggestion"],
+                "search_volume": row["search_volume"],
+                "keyword_difficulty": row["keyword_difficulty"]
+            }
+            for row in rows
+        ]
     }
 
+@router.get("/expand")
+async def expand(
+    q: str = Query(..., min_length=2),
+    concurrency: int = Query(None, ge=1, le=36)
+):
+    return await expand_keywords(normalize_keyword(q), concurrency)
+
+@router.post("/bulk")
+async def bulk_research(payload: BulkKeywordRequest):
+    """Stream one NDJSON line per seed as it completes, then a summary line."""
+    seeds = [seed for seed in map(normalize_keyword, payload.seeds) if len(seed) >= 2]
+
+    async def lines():
+        try:
+            async for event in research_keywords_bulk(seeds):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -1,32 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from app.models.seo import SEOAnalyzeRequest, SEOResponse
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from app.models.seo import SEOAnalyzeRequest, SEOResponse, SEOBatchAnalyzeRequest, SEOBatchResponse
 from app.services.seo_service import SEOService
-from app.core.security import get_current_user
+from app.core.security import get_current_user_id
 
 # ✅ FIXED: removed trailing slash
 router = APIRouter(tags=["SEO"])
 seo_service = SEOService()
 
 @router.post("/seo/analyze", response_model=SEOResponse)
-async def analyze_seo(payload: SEOAnalyzeRequest, user=Depends(get_current_user)):
-    result = seo_service.full_seo_analysis(
+async def analyze_seo(payload: SEOAnalyzeRequest, user_id: str = Depends(get_current_user_id)):
+    result = await seo_service.full_seo_analysis(
         title=payload.title,
         meta=payload.meta_description,
         content=payload.content,
         keyword=payload.keyword,
-        user_id=user["id"]
+        user_id=user_id,
+        secondary_keywords=payload.secondary_keywords
     )
     return result
 
+@router.post("/seo/analyze/batch", response_model=SEOBatchResponse)
+async def analyze_seo_batch(payload: SEOBatchAnalyzeRequest, user_id: str = Depends(get_current_user_id)):
+    try:
+        results = await seo_service.batch_seo_analysis(payload.items, user_id=user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"results": results}
+
 @router.get("/seo/reports/me")
-async def get_my_reports(user=Depends(get_current_user)):
-    return seo_service.get_user_reports(user_id=user["id"])
+async def get_my_reports(
+    response: Response,
+    # Defaults to LIST_PAGE_SIZE; follow X-Next-Cursor for the rest
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[str] = None,
+    summary: bool = False,
+    user_id: str = Depends(get_current_user_id)
+):
+    try:
+        reports, next_cursor = await seo_service.get_user_reports(user_id, limit, cursor, summary)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return reports
 
 @router.get("/seo/reports/average")
-async def get_average_score(user=Depends(get_current_user)):
-    return seo_service.get_average_seo_score(user_id=user["id"])
+async def get_average_score(user_id: str = Depends(get_current_user_id)):
+    return await seo_service.get_average_seo_score(user_id=user_id)
+
+@router.get("/seo/reports/export")
+async def export_reports(
+    format: str = Query("zip", enum=["zip", "ndjson", "csv"]),
+    file_format: str = Query("pdf", enum=["pdf", "html"]),
+    user_id: str = Depends(get_current_user_id)
+):
+    return await seo_service.export_reports(user_id, format, file_format)
 
 @router.get("/seo/reports/export/{report_id}")
 async def export_report(report_id: str, format: str = Query("pdf", enum=["pdf", "html"])):
-    return seo_service.export_report(report_id=report_id, format=format)
+    try:
+        return await seo_service.export_report(report_id=report_id, format=format)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
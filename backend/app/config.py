@@ -6,14 +6,100 @@ load_dotenv()
 class Settings:
     SUPABASE_URL = os.getenv("SUPABASE_URL")
     SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "30"))
     JWT_SECRET = os.getenv("JWT_SECRET")
     EMAIL_HOST = os.getenv("EMAIL_HOST")
     EMAIL_PORT = int(os.getenv("EMAIL_PORT"))
     EMAIL_USER = os.getenv("EMAIL_USER")
     EMAIL_PASS = os.getenv("EMAIL_PASS")
     EMAIL_FROM = os.getenv("EMAIL_FROM")
+    # STARTTLS before login; disable only for local SMTP sinks (benchmarks/fake_smtp.py)
+    EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "true").lower() == "true"
+    EMAIL_TIMEOUT = float(os.getenv("EMAIL_TIMEOUT", "10"))
+    # Outbox worker (app/services/email_outbox.py)
+    EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "50"))
+    EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "8"))
+    EMAIL_IDLE_TIMEOUT = float(os.getenv("EMAIL_IDLE_TIMEOUT", "60"))
+    EMAIL_OUTBOX_MAX = int(os.getenv("EMAIL_OUTBOX_MAX", "10000"))
     CODE_EXPIRATION_MINUTES = int(os.getenv("CODE_EXPIRATION_MINUTES"))
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))
+
+    # Password hashing (app/utils/password_hasher.py). Existing hashes are upgraded to
+    # BCRYPT_ROUNDS on the next successful login.
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS = int(
+        os.getenv("PASSWORD_HASH_WORKERS")
+        or max(1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY") or 1))
+    )
+    # Hashes queued or running before new logins/signups get a 503; bounds the wait to a few hash times
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING") or PASSWORD_HASH_WORKERS * 4)
+
+    # In-process cache (app/utils/cache.py)
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    CACHE_SWEEP_INTERVAL = float(os.getenv("CACHE_SWEEP_INTERVAL", "30"))
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY")
+    GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+    GROQ_HTTP2 = os.getenv("GROQ_HTTP2", "true").lower() == "true"
+    GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "20"))
+    GROQ_MAX_KEEPALIVE = int(os.getenv("GROQ_MAX_KEEPALIVE", "10"))
+    GROQ_KEEPALIVE_EXPIRY = float(os.getenv("GROQ_KEEPALIVE_EXPIRY", "30"))
+    GROQ_CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", "5"))
+    GROQ_READ_TIMEOUT = float(os.getenv("GROQ_READ_TIMEOUT", "120"))
+    # Account rate limits enforced client-side by app/core/groq_scheduler.py; 0 disables a budget
+    GROQ_RPM = float(os.getenv("GROQ_RPM", "30"))
+    GROQ_TPM = float(os.getenv("GROQ_TPM", "30000"))
+    GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "4"))
+    GROQ_BACKOFF_BASE = float(os.getenv("GROQ_BACKOFF_BASE", "0.5"))
+    GROQ_BACKOFF_MAX = float(os.getenv("GROQ_BACKOFF_MAX", "30"))
+
+    # Generation cache: "memory", "disk" or empty to disable
+    GENERATION_CACHE_BACKEND = os.getenv("GENERATION_CACHE_BACKEND", "").lower()
+    GENERATION_CACHE_MAX_ENTRIES = int(os.getenv("GENERATION_CACHE_MAX_ENTRIES", "500"))
+    GENERATION_CACHE_TTL = float(os.getenv("GENERATION_CACHE_TTL", "600"))
+    GENERATION_CACHE_DIR = os.getenv("GENERATION_CACHE_DIR", ".cache")
+
+    # Batch generation
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "5"))
+    BATCH_ITEM_TIMEOUT = float(os.getenv("BATCH_ITEM_TIMEOUT", "90"))
+    # Seconds from submission until a batch job's unfinished items are failed; 0 disables
+    BATCH_DEADLINE = float(os.getenv("BATCH_DEADLINE", "1800"))
+
+    # Background batch jobs (app/utils/job_store.py)
+    JOB_DB_PATH = os.getenv("JOB_DB_PATH", ".cache/jobs.sqlite3")
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+
+    # SEO analysis process pool (WEB_CONCURRENCY = uvicorn worker count)
+    SEO_POOL_WORKERS = int(
+        os.getenv("SEO_POOL_WORKERS")
+        or max(1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY") or 1))
+    )
+    SEO_BATCH_MAX_ITEMS = int(os.getenv("SEO_BATCH_MAX_ITEMS", "500"))
+
+    # Keyset-paginated lists (/articles/, /seo/reports/me): rows per page when no limit is sent
+    LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "50"))
+
+    # Rendered report exports (app/utils/export_cache.py)
+    EXPORT_CACHE_DIR = os.getenv("EXPORT_CACHE_DIR", ".cache/exports")
+    EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    # How long a report id maps to its cached export before the report is fetched again
+    EXPORT_CACHE_TTL = int(os.getenv("EXPORT_CACHE_TTL", "300"))
+    # Rows fetched (and rendered) per page by the bulk /export endpoints
+    EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "200"))
+
+    # Keyword suggestions
+    SUGGEST_API_URL = os.getenv("SUGGEST_API_URL", "https://suggestqueries.google.com/complete/search")
+    SUGGEST_TIMEOUT = float(os.getenv("SUGGEST_TIMEOUT", "10"))
+    SUGGEST_MAX_CONNECTIONS = int(os.getenv("SUGGEST_MAX_CONNECTIONS", "10"))
+    SUGGEST_CACHE_TTL = int(os.getenv("SUGGEST_CACHE_TTL", "3600"))
+    # Requests per second (and burst) sent to the suggest host; 0 disables the limit
+    SUGGEST_RATE_LIMIT = float(os.getenv("SUGGEST_RATE_LIMIT", "10"))
+    SUGGEST_RATE_BURST = float(os.getenv("SUGGEST_RATE_BURST", "5"))
+    EXPAND_CONCURRENCY = int(os.getenv("EXPAND_CONCURRENCY", "8"))
+    KEYWORD_BULK_MAX_SEEDS = int(os.getenv("KEYWORD_BULK_MAX_SEEDS", "500"))
+    KEYWORD_BULK_CONCURRENCY = int(os.getenv("KEYWORD_BULK_CONCURRENCY", "16"))
+    KEYWORD_UPSERT_CHUNK = int(os.getenv("KEYWORD_UPSERT_CHUNK", "1000"))
 
 settings = Settings()
 
@@ -0,0 +1,49 @@
+from typing import Optional
+
+import httpx
+from app.config import settings
+from app.utils.metrics import instrument_httpx
+
+# One pooled, keep-alive async client shared by every Groq call for the life of the app.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    client = httpx.AsyncClient(
+        base_url=settings.GROQ_BASE_URL,
+        headers={
+            "Authorization": f"Bearer {settings.GROQ_API_KEY}",
+            "Content-Type": "application/json"
+        },
+        http2=settings.GROQ_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.GROQ_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.GROQ_MAX_KEEPALIVE,
+            keepalive_expiry=settings.GROQ_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(
+            settings.GROQ_READ_TIMEOUT,
+            connect=settings.GROQ_CONNECT_TIMEOUT
+        )
+    )
+    return instrument_httpx(client, "groq")
+
+
+def get_groq_client() -> httpx.AsyncClient:
+    # Only touched from the event loop, so no lock is needed
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
+async def set_groq_client(client: Optional[httpx.AsyncClient]):
+    """Swap the shared client, e.g. for one pointed at a local stand-in server."""
+    global _client
+    previous, _client = _client, client
+    if previous is not None and previous is not client:
+        await previous.aclose()
+
+
+async def close_groq_client():
+    await set_groq_client(None)
@@ -0,0 +1,225 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import httpx
+from app.config import settings
+
+# Lower runs first: interactive requests jump ahead of queued batch work
+INTERACTIVE = 0
+BATCH = 1
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class Budget:
+    """Token bucket refilled continuously at `per_minute / 60` per second.
+
+    It holds at most `window` seconds' worth; the default of 60 matches Groq's per-minute limits.
+    """
+
+    def __init__(self, per_minute: float, window: float = 60):
+        self.capacity = per_minute * window / 60
+        self.rate = per_minute / 60
+        self.available = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def refill(self, now: float):
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if it already is)."""
+        if self.unlimited or self.available >= amount:
+            return 0
+        return (amount - self.available) / self.rate
+
+    def take(self, amount: float):
+        if not self.unlimited:
+            self.available -= amount
+
+    def give_back(self, amount: float):
+        if not self.unlimited:
+            self.available = min(self.capacity, self.available + amount)
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(payload: dict) -> int:
+    """Tokens to reserve for a request: ~4 characters per prompt token plus the full max_tokens."""
+    prompt_chars = sum(len(m.get("content", "")) for m in payload.get("messages", []))
+    return prompt_chars // 4 + payload.get("max_tokens", 0)
+
+
+class GroqScheduler:
+    """Admission control for every Groq call.
+
+    Requests wait in a priority queue until both the request and token budgets can
+    cover them. Tokens are reserved from the request's max_tokens and reconciled with
+    the usage Groq reports. 429s and 5xx responses are retried with full-jitter
+    exponential backoff; a Retry-After on a 429 pauses the whole queue, since every
+    other request would hit the same limit.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, max_retries: int = 4,
+                 backoff_base: float = 0.5, backoff_max: float = 30, window: float = 60):
+        self.requests = Budget(requests_per_minute, window)
+        self.tokens = Budget(tokens_per_minute, window)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._waiters = []  # heap of (priority, seq, tokens, future)
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._paused_until = 0.0
+
+        self.retries = 0
+        self.throttled = 0
+
+    # ---- admission ----
+
+    async def acquire(self, tokens: int, priority: int = INTERACTIVE) -> int:
+        """Wait for budget; returns the tokens actually reserved."""
+        if not self.tokens.unlimited:
+            tokens = min(tokens, self.tokens.capacity)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(tokens)  # granted just as we were cancelled
+            raise
+        return tokens
+
+    def release(self, reserved: int, used: int = 0):
+        """Return the unused part of a reservation, e.g. once Groq reports actual usage."""
+        self.tokens.give_back(max(0, reserved - used))
+        self._dispatch()
+
+    def _dispatch(self):
+        now = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if now < self._paused_until:
+            self._schedule(self._paused_until - now)
+            return
+
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():  # cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            wait = max(self.requests.wait_for(1), self.tokens.wait_for(tokens))
+            if wait > 0:
+                # Strict priority: lower-priority work never overtakes the head of the queue
+                self._schedule(wait)
+                return
+            heapq.heappop(self._waiters)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            future.set_result(None)
+
+    def _schedule(self, delay: float):
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    # ---- sending ----
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def send(self, client: httpx.AsyncClient, build_request: Callable[[], httpx.Request],
+                   tokens: int, priority: int = INTERACTIVE, stream: bool = False):
+        """Send a request under the budgets, retrying 429/5xx and transport errors.
+
+        Returns (response, reserved tokens). Non-streamed responses have already been
+        reconciled against the reported usage; for streamed ones the caller calls
+        `release(reserved, used)` when the stream ends. The last response is returned
+        as-is when retries run out, so the caller decides how to surface it.
+        """
+        for attempt in range(self.max_retries + 1):
+            reserved = await self.acquire(tokens, priority)
+            try:
+                response = await client.send(build_request(), stream=stream)
+            except httpx.TransportError:
+                self.release(reserved)
+                if attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(self.backoff(attempt))
+                continue
+            except BaseException:
+                # Cancelled mid-send (client disconnect, batch item timeout): hand the budget back
+                self.release(reserved)
+                raise
+
+            if response.status_code == 429:
+                self.throttled += 1
+            if response.status_code not in RETRYABLE_STATUS or attempt == self.max_retries:
+                if not stream:
+                    self.release(reserved, self._usage(response, reserved))
+                return response, reserved
+
+            self.release(reserved)  # rejected requests don't consume tokens
+            if stream:
+                await response.aclose()
+            self.retries += 1
+            delay = retry_after_seconds(response)
+            if response.status_code == 429 and delay is not None:
+                self._pause(delay)
+            await asyncio.sleep(self.backoff(attempt) if delay is None else delay + random.uniform(0, 0.25))
+
+    @staticmethod
+    def _usage(response: httpx.Response, reserved: int) -> int:
+        if response.is_error:
+            return 0
+        try:
+            return response.json()["usage"]["total_tokens"]
+        except (ValueError, KeyError, TypeError):
+            return reserved
+
+    def stats(self) -> dict:
+        return {
+            "queued": sum(1 for *_, future in self._waiters if not future.done()),
+            "requests_available": None if self.requests.unlimited else round(self.requests.available, 2),
+            "tokens_available": None if self.tokens.unlimited else round(self.tokens.available),
+            "retries": self.retries,
+            "throttled": self.throttled
+        }
+
+
+groq_scheduler = GroqScheduler(
+    requests_per_minute=settings.GROQ_RPM,
+    tokens_per_minute=settings.GROQ_TPM,
+    max_retries=settings.GROQ_MAX_RETRIES,
+    backoff_base=settings.GROQ_BACKOFF_BASE,
+    backoff_max=settings.GROQ_BACKOFF_MAX
+)
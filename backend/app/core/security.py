@@ -1,8 +1,10 @@
+import time
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 from app.config import settings
-from app.database import supabase
+from app.database import async_supabase
+from app.utils.cache import get_cache, set_cache, delete_cache
 
 security = HTTPBearer()
 
@@ -19,15 +21,39 @@ def verify_jwt(credentials: HTTPAuthorizationCredentials = Depends(security)):
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-def get_current_user(payload: dict = Depends(verify_jwt)):
+def _user_cache_key(email: str) -> str:
+    return f"user:{email}"
+
+def invalidate_user(email: str):
+    """Drop the cached user row, e.g. after a password reset or verification change."""
+    delete_cache(_user_cache_key(email))
+
+async def get_current_user(payload: dict = Depends(verify_jwt)):
     email = payload.get("email")
     if not email:
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    user = supabase.table("users").select("*").eq("email", email).single().execute()
+    cached = get_cache(_user_cache_key(email))
+    if cached:
+        return cached
+
+    user = await async_supabase.table("users").select("*").eq("email", email).single().execute()
     
     if not user.data:
         raise HTTPException(status_code=401, detail="User not found")
 
+    # Never keep the row longer than the token that fetched it is valid
+    ttl = settings.USER_CACHE_TTL
+    if payload.get("exp"):
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        set_cache(_user_cache_key(email), user.data, ttl=ttl)
+
     return user.data  # This returns full user dict with "id", "email", etc.
 
+async def get_current_user_id(payload: dict = Depends(verify_jwt)) -> str:
+    # Tokens carry the user id in "uid"; older tokens fall back to the lookup
+    user_id = payload.get("uid")
+    if user_id:
+        return user_id
+    return (await get_current_user(payload))["id"]
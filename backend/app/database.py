@@ -1,5 +1,24 @@
-from supabase import create_client
+from supabase import create_client, AsyncClient, AsyncClientOptions
 from .config import settings
+from .utils.metrics import instrument_httpx
 
+# Blocking client: scripts (e.g. the rollup backfill)
 supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
 
+# Non-blocking client for request handlers: `await async_supabase.table(...)...execute()`
+async_supabase = AsyncClient(
+    settings.SUPABASE_URL,
+    settings.SUPABASE_SERVICE_ROLE_KEY,
+    AsyncClientOptions(postgrest_client_timeout=settings.SUPABASE_TIMEOUT)
+)
+
+def _postgrest_operation(request) -> str:
+    # /rest/v1/<table> or /rest/v1/rpc/<function>
+    resource = request.url.path.split("/rest/v1/", 1)[-1]
+    return f"{request.method} {resource}"
+
+instrument_httpx(supabase.postgrest.session, "supabase", _postgrest_operation)
+instrument_httpx(async_supabase.postgrest.session, "supabase", _postgrest_operation)
+
+async def close_async_supabase():
+    await async_supabase.postgrest.aclose()
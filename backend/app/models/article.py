@@ -20,3 +20,12 @@ class ArticleResponse(ArticleCreate):
     user_id: UUID
     created_at: datetime
 
+class ArticleSummary(BaseModel):
+    """Listing row without the article body."""
+    id: UUID
+    user_id: UUID
+    keyword: str
+    length: str
+    tone: str
+    created_at: datetime
+
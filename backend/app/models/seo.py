@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List
 
 class TitleMetaAnalysis(BaseModel):
@@ -6,11 +6,18 @@ class TitleMetaAnalysis(BaseModel):
     issues: List[str]
     length: int
 
+class KeywordMatch(BaseModel):
+    keyword: str
+    count: int
+    density: float
+    positions: List[int]
+
 class SEOContentAnalysis(BaseModel):
     seo_score: int
     readability: float
     keyword_density: float
     recommendations: List[str]
+    keywords: List[KeywordMatch] = []
 
 class SEOResponse(BaseModel):
     title_analysis: TitleMetaAnalysis
@@ -22,4 +29,10 @@ class SEOAnalyzeRequest(BaseModel):
     meta_description: str
     content: str
     keyword: str
+    secondary_keywords: List[str] = []
+
+class SEOBatchAnalyzeRequest(BaseModel):
+    items: List[SEOAnalyzeRequest] = Field(..., min_length=1)
 
+class SEOBatchResponse(BaseModel):
+    results: List[SEOResponse]
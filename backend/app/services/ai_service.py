@@ -1,8 +1,17 @@
+import json
+import logging
 import httpx
 from app.config import settings
+from app.core.groq_client import get_groq_client
+from app.core.groq_scheduler import groq_scheduler, estimate_tokens, retry_after_seconds, INTERACTIVE
 from app.services.template_service import get_template_by_id
+from app.utils.generation_cache import generation_cache
 
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+logger = logging.getLogger(__name__)
+
+GROQ_MODEL = "mistral-saba-24b"
+ARTICLE_SYSTEM_PROMPT = "You are an expert SEO content writer."
+TEMPLATE_SYSTEM_PROMPT = "Expert SEO writer."
 
 # Word count mapping
 word_counts = {
@@ -11,6 +20,121 @@ word_counts = {
     "long": 1500
 }
 
+# ----------------------------------------
+# 🔌 Groq Chat Completion
+# ----------------------------------------
+def build_payload(system_prompt: str, prompt: str) -> dict:
+    return {
+        "model": GROQ_MODEL,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.7,
+        "top_p": 1.0,
+        "max_tokens": 2048
+    }
+
+class GroqRateLimitError(Exception):
+    """Groq kept answering 429 after every retry."""
+
+    def __init__(self, retry_after: float = None):
+        super().__init__("AI provider is rate limiting requests, please retry shortly")
+        self.retry_after = retry_after
+
+class GroqStreamIncomplete(Exception):
+    """The completion stream ended before Groq's [DONE] sentinel, so the text is partial."""
+
+    def __init__(self):
+        super().__init__("AI provider stream ended early, please try again")
+
+def _raise_for_status(response: httpx.Response):
+    if response.status_code == 429:
+        raise GroqRateLimitError(retry_after_seconds(response))
+    response.raise_for_status()
+
+async def chat_completion(system_prompt: str, prompt: str, fresh: bool = False,
+                          priority: int = INTERACTIVE) -> str:
+    payload = build_payload(system_prompt, prompt)
+    cache_key = generation_cache.key_for(payload)
+    if not fresh:
+        cached = await generation_cache.aget(cache_key)
+        if cached is not None:
+            return cached
+
+    client = get_groq_client()
+    response, _ = await groq_scheduler.send(
+        client,
+        lambda: client.build_request("POST", "/chat/completions", json=payload),
+        tokens=estimate_tokens(payload),
+        priority=priority
+    )
+    try:
+        _raise_for_status(response)
+        content = response.json()["choices"][0]["message"]["content"]
+    except httpx.HTTPStatusError as e:
+        print(f"API Error: {e.response.text}")
+        raise
+
+    await generation_cache.aset(cache_key, content)
+    return content
+
+async def stream_chat_completion(system_prompt: str, prompt: str, fresh: bool = False,
+                                 priority: int = INTERACTIVE):
+    """Yield content deltas from Groq's `stream: true` SSE response as they arrive."""
+    payload = build_payload(system_prompt, prompt)
+    cache_key = generation_cache.key_for(payload)
+    if not fresh:
+        cached = await generation_cache.aget(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+    payload["stream"] = True
+    client = get_groq_client()
+    response, reserved = await groq_scheduler.send(
+        client,
+        lambda: client.build_request("POST", "/chat/completions", json=payload),
+        tokens=estimate_tokens(payload),
+        priority=priority,
+        stream=True
+    )
+    parts, used, done = [], reserved, False
+    try:
+        if response.is_error:
+            await response.aread()
+            print(f"API Error: {response.text}")
+            used = 0
+            _raise_for_status(response)
+
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                done = True
+                break
+            chunk = json.loads(data)
+            # Groq reports usage on the final chunk
+            usage = (chunk.get("x_groq") or {}).get("usage") or chunk.get("usage")
+            if usage:
+                used = usage.get("total_tokens", used)
+            if not chunk.get("choices"):
+                continue
+            delta = chunk["choices"][0]["delta"].get("content")
+            if delta:
+                parts.append(delta)
+                yield delta
+    finally:
+        await response.aclose()
+        groq_scheduler.release(reserved, used)
+
+    # A stream cut off before [DONE] holds a partial article: fail it rather than pass it off as whole
+    if not done:
+        logger.warning("Groq stream ended without [DONE] after %d chunk(s)", len(parts))
+        raise GroqStreamIncomplete()
+    await generation_cache.aset(cache_key, "".join(parts))
+
 # ----------------------------------------
 # ⚙️ Standard Prompt (No Template)
 # ----------------------------------------
@@ -24,30 +148,14 @@ def build_prompt(keyword: str, tone: str, length: str) -> str:
         f"Use the keyword naturally and make it valuable to readers.\n"
     )
 
-def generate_article(keyword: str, tone: str, length: str) -> str:
+async def generate_article(keyword: str, tone: str, length: str, fresh: bool = False) -> str:
     prompt = build_prompt(keyword, tone, length)
-    headers = {
-        "Authorization": f"Bearer {settings.GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": "mistral-saba-24b",
-        "messages": [
-            {"role": "system", "content": "You are an expert SEO content writer."},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.7,
-        "top_p": 1.0,
-        "max_tokens": 2048
-    }
+    return await chat_completion(ARTICLE_SYSTEM_PROMPT, prompt, fresh=fresh)
 
-    try:
-        response = httpx.post(GROQ_API_URL, headers=headers, json=payload)
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"]
-    except httpx.HTTPStatusError as e:
-        print(f"API Error: {e.response.text}")
-        raise
+def stream_article(keyword: str, tone: str, length: str, fresh: bool = False):
+    # Prompt is built eagerly so bad input fails before the stream starts
+    prompt = build_prompt(keyword, tone, length)
+    return stream_chat_completion(ARTICLE_SYSTEM_PROMPT, prompt, fresh=fresh)
 
 # ----------------------------------------
 # 🧩 Template-based Prompt
@@ -63,54 +171,11 @@ def build_prompt_with_template(keyword: str, tone: str, length: str, template_id
         f"Use this structure:\n{structure}"
     )
 
-def generate_article_from_template(keyword: str, tone: str, length: str, template_id: str) -> str:
+async def generate_article_from_template(keyword: str, tone: str, length: str, template_id: str,
+                                         fresh: bool = False, priority: int = INTERACTIVE) -> str:
     prompt = build_prompt_with_template(keyword, tone, length, template_id)
+    return await chat_completion(TEMPLATE_SYSTEM_PROMPT, prompt, fresh=fresh, priority=priority)
 
-    headers = {
-        "Authorization": f"Bearer {settings.GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "model": "mistral-saba-24b",
-        "messages": [
-            {"role": "system", "content": "Expert SEO writer."},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.7,
-        "top_p": 1.0,
-        "max_tokens": 2048
-    }
-
-    try:
-        response = httpx.post(GROQ_API_URL, headers=headers, json=payload)
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"]
-    except httpx.HTTPStatusError as e:
-        print(f"API Error: {e.response.text}")
-        raise
-
-# ----------------------------------------
-# 🚀 Batch Article Generator
-# ----------------------------------------
-def generate_batch(items):
-    results = []
-    for it in items:
-        try:
-            article = generate_article_from_template(
-                it.keyword,
-                it.tone,
-                it.length,
-                template_id="how-to-guide"  # default fallback template
-            )
-            results.append({
-                "keyword": it.keyword,
-                "article": article
-            })
-        except Exception as e:
-            results.append({
-                "keyword": it.keyword,
-                "error": str(e)
-            })
-    return results
-
+def stream_article_from_template(keyword: str, tone: str, length: str, template_id: str, fresh: bool = False):
+    prompt = build_prompt_with_template(keyword, tone, length, template_id)
+    return stream_chat_completion(TEMPLATE_SYSTEM_PROMPT, prompt, fresh=fresh)
@@ -1,37 +1,81 @@
-from app.database import supabase
-from app.models.article import ArticleCreate, ArticleUpdate, ArticleResponse
+from app.database import async_supabase
+from app.models.article import ArticleCreate, ArticleUpdate, ArticleResponse, ArticleSummary
+from app.services import rollup_service
+from app.utils.pagination import fetch_page
+from app.utils.bulk_export import iter_pages, ndjson_stream, csv_stream, zip_stream, export_response
+from app.config import settings
 from typing import List
 from uuid import UUID
 
-def save_article(user_id: str, data: ArticleCreate) -> ArticleResponse:
-    response = supabase.table("articles").insert({
+async def save_article(user_id: str, data: ArticleCreate, article_id: str = None) -> ArticleResponse:
+    row = {
         "user_id": user_id,
         "keyword": data.keyword,
         "length": data.length,
         "tone": data.tone,
         "article": data.article
-    }).execute()
+    }
+    if article_id:
+        row["id"] = article_id  # chosen by the caller so a retried save can't create a second copy
+    response = await async_supabase.table("articles").insert(row).execute()
 
     record = response.data[0]
+    rollup_service.record_articles(user_id)
     return ArticleResponse(**record)
 
-def get_user_articles(user_id: str) -> List[ArticleResponse]:
-    response = supabase.table("articles").select("*").eq("user_id", user_id).order("created_at", desc=True).execute()
-    return [ArticleResponse(**row) for row in response.data]
+ARTICLE_SUMMARY_FIELDS = "id, user_id, keyword, length, tone, created_at"
+ARTICLE_EXPORT_FIELDS = ("id", "created_at", "keyword", "length", "tone", "article")
 
-def get_article_by_id(user_id: str, article_id: str) -> ArticleResponse | None:
-    response = supabase.table("articles").select("*").eq("user_id", user_id).eq("id", article_id).single().execute()
+async def get_user_articles(user_id: str, limit: int = None, cursor: str = None, summary: bool = False):
+    """Return (page of articles, next cursor); pages are LIST_PAGE_SIZE rows unless `limit` is given.
+
+    Summary rows leave out the article body.
+    """
+    fields = ARTICLE_SUMMARY_FIELDS if summary else "*"
+    rows, next_cursor = await fetch_page(
+        lambda: async_supabase.table("articles").select(fields).eq("user_id", user_id),
+        limit or settings.LIST_PAGE_SIZE, cursor
+    )
+    model = ArticleSummary if summary else ArticleResponse
+    return [model(**row) for row in rows], next_cursor
+
+async def article_exists(user_id: str, article_id: str) -> bool:
+    response = await async_supabase.table("articles").select("id").eq("user_id", user_id).eq("id", article_id).limit(1).execute()
+    return bool(response.data)
+
+async def get_article_by_id(user_id: str, article_id: str) -> ArticleResponse | None:
+    response = await async_supabase.table("articles").select("*").eq("user_id", user_id).eq("id", article_id).single().execute()
     if response.data:
         return ArticleResponse(**response.data)
     return None
 
-def update_article(user_id: str, article_id: str, data: ArticleUpdate) -> ArticleResponse:
-    response = supabase.table("articles").update(data.dict(exclude_unset=True)).eq("user_id", user_id).eq("id", article_id).execute()
+async def update_article(user_id: str, article_id: str, data: ArticleUpdate) -> ArticleResponse:
+    response = await async_supabase.table("articles").update(data.dict(exclude_unset=True)).eq("user_id", user_id).eq("id", article_id).execute()
     if not response.data:
         raise ValueError("Article not found")
     return ArticleResponse(**response.data[0])
 
-def delete_article(user_id: str, article_id: str) -> bool:
-    response = supabase.table("articles").delete().eq("user_id", user_id).eq("id", article_id).execute()
+async def delete_article(user_id: str, article_id: str) -> bool:
+    response = await async_supabase.table("articles").delete().eq("user_id", user_id).eq("id", article_id).execute()
+    # Take it back out of the trend buckets for the day it was generated
+    for row in response.data or []:
+        rollup_service.record_articles(user_id, -1, at=row["created_at"])
     return bool(response.data)
 
+
+def export_articles(user_id: str, format: str = "zip"):
+    """Stream all of a user's articles as a ZIP of Markdown files, NDJSON or CSV."""
+    pages = iter_pages(
+        lambda: async_supabase.table("articles").select("*").eq("user_id", user_id),
+        settings.EXPORT_PAGE_SIZE
+    )
+    if format == "ndjson":
+        return export_response(ndjson_stream(pages), format, "articles")
+    if format == "csv":
+        return export_response(csv_stream(pages, ARTICLE_EXPORT_FIELDS), format, "articles")
+
+    async def files():
+        async for rows in pages:
+            yield [(f"article_{row['id']}.md", row["article"].encode()) for row in rows]
+
+    return export_response(zip_stream(files()), format, "articles")
@@ -1,23 +1,17 @@
-import smtplib
 import jwt
-import bcrypt
 from datetime import datetime, timedelta
-from email.mime.text import MIMEText
 from app.config import settings
-from app.database import supabase
-from app.utils.validators import generate_code, store_code, validate_code, rate_limit_check
-
-# General email sender
+from app.database import async_supabase
+from app.core.security import invalidate_user
+from app.services.email_outbox import OutboxFullError, outbox
+from app.utils.password_hasher import password_hasher
+from app.utils.validators import (
+    generate_code, store_code, check_code, validate_code, rate_limit_check, rate_limit, verification_codes
+)
+
+# General email sender: queued and delivered by the outbox worker
 def send_email(to_email: str, subject: str, body: str):
-    msg = MIMEText(body)
-    msg["Subject"] = subject
-    msg["From"] = settings.EMAIL_FROM
-    msg["To"] = to_email
-
-    with smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT) as server:
-        server.starttls()
-        server.login(settings.EMAIL_USER, settings.EMAIL_PASS)
-        server.sendmail(settings.EMAIL_FROM, [to_email], msg.as_string())
+    outbox.send(to_email, subject, body)
 
 # Verification email
 def send_verification_email(to_email: str, code: str):
@@ -49,83 +43,128 @@ If you did not request this, please ignore this email.
 """
     send_email(to_email, "RankCraft Password Reset Request", body)
 
+# Store a fresh code and queue its email. If the outbox is full nothing was sent, so the
+# previous code stays valid and the resend cooldown is lifted for an immediate retry.
+def _issue_code(email: str, send):
+    previous = verification_codes.get(email)
+    code = generate_code()
+    store_code(email, code)
+    try:
+        send(email, code)
+    except OutboxFullError:
+        rate_limit.pop(email, None)
+        if previous is not None:
+            verification_codes[email] = previous
+        else:
+            verification_codes.pop(email, None)
+        raise
+
 # Create user & send verification code
-def create_user_and_send_code(email: str, password: str):
-    existing = supabase.table("users").select("*").eq("email", email).execute()
+async def create_user_and_send_code(email: str, password: str):
+    password_hasher.check_capacity()
+    outbox.check_capacity()
+    existing = await async_supabase.table("users").select("id").eq("email", email).execute()
     if existing.data:
         raise Exception("Email already registered.")
 
-    hashed_pw = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
-    supabase.table("users").insert({"email": email, "password": hashed_pw}).execute()
+    hashed_pw = await password_hasher.hash(password)
+    await async_supabase.table("users").insert({"email": email, "password": hashed_pw}).execute()
 
-    code = generate_code()
-    store_code(email, code)
-    send_verification_email(email, code)
+    try:
+        _issue_code(email, send_verification_email)
+    except OutboxFullError:
+        # The account exists now; failing here would make the retry say "Email already registered."
+        print(f"❌ Verification email for {email} not queued (outbox full); waiting for a resend")
 
 # Verify email using code & issue access token
-def verify_email(email: str, code: str) -> str:
+async def verify_email(email: str, code: str) -> str:
     if not validate_code(email, code):
         raise Exception("Invalid or expired code")
 
-    supabase.table("users").update({"is_verified": True}).eq("email", email).execute()
-    return create_access_token(email)
+    updated = await async_supabase.table("users").update({"is_verified": True}).eq("email", email).execute()
+    invalidate_user(email)
+    user_id = updated.data[0]["id"] if updated.data else None
+    return create_access_token(email, user_id)
 
 # Login user and issue tokens
-def login_user(email: str, password: str) -> dict:
-    user = supabase.table("users").select("*").eq("email", email).single().execute()
+async def login_user(email: str, password: str) -> dict:
+    password_hasher.check_capacity()
+    user = await async_supabase.table("users").select("*").eq("email", email).single().execute()
     if not user.data:
         raise Exception("Invalid credentials")
 
     stored_hash = user.data["password"]
-    if not bcrypt.checkpw(password.encode(), stored_hash.encode()):
+    if not await password_hasher.verify(password, stored_hash):
         raise Exception("Invalid credentials")
 
     if not user.data.get("is_verified"):
         raise Exception("Email not confirmed")
 
+    if password_hasher.needs_rehash(stored_hash):
+        await _upgrade_hash(email, password)
+
     return {
-        "access_token": create_access_token(email),
-        "refresh_token": create_refresh_token(email)
+        "access_token": create_access_token(email, user.data["id"]),
+        "refresh_token": create_refresh_token(email, user.data["id"])
     }
 
+async def _upgrade_hash(email: str, password: str):
+    """Re-hash at the current BCRYPT_ROUNDS; the login still succeeds if this fails."""
+    try:
+        hashed_pw = await password_hasher.hash(password)
+        await async_supabase.table("users").update({"password": hashed_pw}).eq("email", email).execute()
+        invalidate_user(email)
+    except Exception as e:
+        print(f"❌ Password hash upgrade failed for {email}: {e}")
+
 # Resend verification code (rate-limited)
 def resend_verification_code(email: str):
     if not rate_limit_check(email):
         raise Exception("Please wait before requesting a new code")
 
-    code = generate_code()
-    store_code(email, code)
-    send_verification_email(email, code)
+    outbox.check_capacity()
+    _issue_code(email, send_verification_email)
 
 # Request password reset code
-def request_password_reset(email: str):
-    user = supabase.table("users").select("*").eq("email", email).single().execute()
+async def request_password_reset(email: str):
+    outbox.check_capacity()
+    user = await async_supabase.table("users").select("id").eq("email", email).single().execute()
     if not user.data:
         raise Exception("User not found")
 
-    code = generate_code()
-    store_code(email, code)
-    send_password_reset_email(email, code)
+    _issue_code(email, send_password_reset_email)
 
 # Reset password using code
-def reset_password(email: str, code: str, new_password: str):
-    if not validate_code(email, code):
+async def reset_password(email: str, code: str, new_password: str):
+    password_hasher.check_capacity()
+    if not check_code(email, code):
         raise Exception("Invalid or expired code")
 
-    hashed_pw = bcrypt.hashpw(new_password.encode(), bcrypt.gensalt()).decode()
-    supabase.table("users").update({"password": hashed_pw}).eq("email", email).execute()
+    # Only use up the code once the hash is done, so a busy hasher (503) leaves it valid for a retry
+    hashed_pw = await password_hasher.hash(new_password)
+    if not validate_code(email, code):
+        raise Exception("Invalid or expired code")
+    await async_supabase.table("users").update({"password": hashed_pw}).eq("email", email).execute()
+    invalidate_user(email)
 
 # JWT token helpers
-def create_access_token(email: str) -> str:
+def _token_claims(email: str, user_id: str | None, lifetime: timedelta) -> dict:
+    claims = {"email": email, "exp": datetime.utcnow() + lifetime}
+    if user_id:
+        # Lets routes that only need the id skip the users lookup
+        claims["uid"] = str(user_id)
+    return claims
+
+def create_access_token(email: str, user_id: str | None = None) -> str:
     return jwt.encode(
-        {"email": email, "exp": datetime.utcnow() + timedelta(minutes=15)},
+        _token_claims(email, user_id, timedelta(minutes=15)),
         settings.JWT_SECRET,
         algorithm="HS256"
     )
 
-def create_refresh_token(email: str) -> str:
+def create_refresh_token(email: str, user_id: str | None = None) -> str:
     return jwt.encode(
-        {"email": email, "exp": datetime.utcnow() + timedelta(days=7)},
+        _token_claims(email, user_id, timedelta(days=7)),
         settings.JWT_SECRET,
         algorithm="HS256"
     )
@@ -133,7 +172,7 @@ def create_refresh_token(email: str) -> str:
 def verify_refresh_token(refresh_token: str) -> str:
     try:
         payload = jwt.decode(refresh_token, settings.JWT_SECRET, algorithms=["HS256"])
-        return create_access_token(payload["email"])
+        return create_access_token(payload["email"], payload.get("uid"))
     except jwt.ExpiredSignatureError:
         raise Exception("Refresh token expired")
     except jwt.InvalidTokenError:
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Optional
+
+from app.config import settings
+from app.models.article import ArticleCreate
+from app.services import article_service
+from app.core.groq_scheduler import BATCH
+from app.services.ai_service import generate_article_from_template
+from app.utils.job_store import JobStore
+
+BATCH_JOB = "batch_generation"
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class BatchJobRunner:
+    """Works through queued batch-generation items with a pool of asyncio workers.
+
+    Each finished article is saved straight away, and its outcome recorded in the
+    job store, so a restart only resumes the items that never completed.
+
+    An item gets `item_timeout` seconds to generate and save its article, and is tried
+    up to `max_attempts` times, whether earlier attempts failed or their worker died
+    holding the lease. A job gets `deadline` seconds from submission (0 for none);
+    items still unfinished by then are marked failed rather than started or retried.
+    Each item saves under an id derived from its job and index, so a retry after a save
+    that did land never stores a second copy.
+    """
+
+    def __init__(self, store: JobStore, workers: int, item_timeout: float, lease: float,
+                 max_attempts: int, poll_interval: float, deadline: float = 0):
+        self.store = store
+        self.workers = workers
+        self.item_timeout = item_timeout
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.deadline = deadline
+        # Unique per process start, so leases from a previous run are never mistaken for ours
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._tasks: list = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def submit(self, user_id: str, items: list, fresh: bool = False) -> str:
+        params = {"fresh": fresh}
+        if self.deadline:
+            params["deadline"] = time.time() + self.deadline
+        job_id = await asyncio.to_thread(self.store.create_job, user_id, BATCH_JOB, items, params)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    async def get_job(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.store.get_job, job_id)
+
+    def start(self):
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Requeue whatever we were in the middle of so the next start picks it up immediately
+        await asyncio.to_thread(self.store.release, self.owner)
+
+    async def _worker(self):
+        while True:
+            try:
+                await self._work_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # e.g. the job database is locked; the item's lease runs out and it is claimed again
+                logger.exception("Batch worker error; retrying in %gs", self.poll_interval)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _work_once(self):
+        # Cleared before claiming so a submit that lands mid-claim still wakes us
+        self._wakeup.clear()
+        item = await asyncio.to_thread(self.store.claim, self.owner, self.lease)
+        if item is None:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            return
+
+        timeout, retry = self._timeout(item), False
+        try:
+            result, error = await self._run(item, timeout), None
+        except asyncio.CancelledError:
+            raise
+        except DeadlineExceeded as e:
+            result, error = None, str(e)
+        except asyncio.TimeoutError:
+            result, error = None, f"Timed out after {timeout:g}s"
+            retry = True
+        except Exception as e:
+            logger.warning("Batch job %s item %s failed: %s", item["job_id"], item["index"], e)
+            result, error = None, str(e)
+            retry = True
+
+        if retry and item["attempts"] < self.max_attempts:
+            delay = self.poll_interval * 2 ** (item["attempts"] - 1)
+            await asyncio.to_thread(
+                self.store.retry, item["job_id"], item["index"], self.owner, error, delay
+            )
+        else:
+            await asyncio.to_thread(
+                self.store.finish, item["job_id"], item["index"], self.owner, result, error
+            )
+
+    def _timeout(self, item: dict) -> float:
+        """The item timeout, cut short by the job's deadline."""
+        deadline = item["params"].get("deadline")
+        if deadline is None:
+            return self.item_timeout
+        return min(self.item_timeout, deadline - time.time())
+
+    async def _run(self, item: dict, timeout: float) -> dict:
+        if item["attempts"] > self.max_attempts:
+            raise RuntimeError(f"Gave up after {self.max_attempts} attempts")
+        if timeout <= 0:
+            raise DeadlineExceeded("Batch deadline passed before this item finished")
+        # Generation and saving share the budget, so a slow database write can't hold the lease past it
+        return await asyncio.wait_for(self._generate_and_save(item), timeout=timeout)
+
+    @staticmethod
+    def _article_id(item: dict) -> str:
+        # Fixed per item, so every attempt saves under the same id
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"batch-job:{item['job_id']}:{item['index']}"))
+
+    async def _generate_and_save(self, item: dict) -> dict:
+        article_id = self._article_id(item)
+        # An earlier attempt may have saved it and then timed out (or crashed) before recording that
+        if item["attempts"] > 1 and await article_service.article_exists(item["user_id"], article_id):
+            return {"article_id": article_id}
+
+        spec = item["payload"]
+        article = await generate_article_from_template(
+            spec["keyword"],
+            spec["tone"],
+            spec["length"],
+            template_id="how-to-guide",  # default fallback template
+            fresh=item["params"].get("fresh", False),
+            priority=BATCH  # queued behind interactive requests
+        )
+        saved = await article_service.save_article(
+            item["user_id"], ArticleCreate(**spec, article=article), article_id=article_id
+        )
+        return {"article_id": str(saved.id)}
+
+
+batch_jobs = BatchJobRunner(
+    JobStore(settings.JOB_DB_PATH),
+    workers=settings.BATCH_CONCURRENCY,
+    item_timeout=settings.BATCH_ITEM_TIMEOUT,
+    lease=settings.BATCH_ITEM_TIMEOUT + 30,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    poll_interval=settings.JOB_POLL_INTERVAL,
+    deadline=settings.BATCH_DEADLINE
+)
@@ -0,0 +1,226 @@
+import heapq
+import queue
+import random
+import smtplib
+import threading
+import time
+from email.mime.text import MIMEText
+from typing import Optional
+
+from app.config import settings
+from app.utils.metrics import time_dependency
+
+
+class OutboxFullError(Exception):
+    pass
+
+
+class EmailOutbox:
+    """Sends mail from a background thread over one reused, authenticated SMTP connection.
+
+    `send` only queues the message, so requests never wait on the mail server. The
+    worker drains up to `batch_size` queued messages per session, keeps the connection
+    open for `idle_timeout` seconds between batches, and reconnects and retries (with
+    backoff) when the server drops it. 4xx replies are retried; 5xx rejections are
+    logged and dropped. The queue lives in memory: codes expire within minutes, and
+    users can ask for a new one if a restart loses theirs.
+    """
+
+    def __init__(self, host: str, port: int, username: Optional[str], password: Optional[str],
+                 sender: str, use_tls: bool = True, timeout: float = 10, batch_size: int = 50,
+                 max_attempts: int = 8, idle_timeout: float = 60, max_queued: int = 10000):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.idle_timeout = idle_timeout
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._retry_heap = []  # (due, to_email, message, attempts); only touched by the worker
+
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.connections = 0
+
+    # ---- producer side ----
+
+    def check_capacity(self):
+        """Fail fast, e.g. before a signup creates the account its email is for."""
+        if self._queue.full():
+            raise OutboxFullError("Email service is busy, please try again shortly")
+
+    def send(self, to_email: str, subject: str, body: str):
+        msg = MIMEText(body)
+        msg["Subject"] = subject
+        msg["From"] = self.sender
+        msg["To"] = to_email
+        try:
+            self._queue.put_nowait((to_email, msg.as_string(), 0))
+        except queue.Full:
+            raise OutboxFullError("Email service is busy, please try again shortly")
+        self.start()
+
+    # ---- lifecycle ----
+
+    def start(self):
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+            self._worker.start()
+
+    def stop(self, timeout: float = 10):
+        """Flush what's queued (for up to `timeout` seconds) and close the connection."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        self._stop.set()
+        worker.join(timeout)
+        if worker.is_alive():
+            print(f"❌ Email outbox stopped with {self._queue.qsize()} message(s) unsent")
+
+    # ---- worker ----
+
+    def _run(self):
+        while True:
+            batch = self._due_retries()
+            try:
+                batch.append(self._queue.get(timeout=0 if batch else self._idle_wait()))
+            except queue.Empty:
+                if not batch:
+                    if self._stop.is_set():
+                        break
+                    if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+                        self._disconnect()
+                    continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._send_batch(batch)
+
+        if self._retry_heap:
+            print(f"❌ Email outbox stopped with {len(self._retry_heap)} retry(ies) pending")
+        self._disconnect()
+
+    def _idle_wait(self) -> float:
+        if not self._retry_heap:
+            return 0.5
+        return min(0.5, max(0.0, self._retry_heap[0][0] - time.monotonic()))
+
+    def _due_retries(self) -> list:
+        now = time.monotonic()
+        due = []
+        while self._retry_heap and self._retry_heap[0][0] <= now and len(due) < self.batch_size:
+            _, to_email, message, attempts = heapq.heappop(self._retry_heap)
+            due.append((to_email, message, attempts))
+        return due
+
+    def _send_batch(self, batch: list):
+        for to_email, message, attempts in batch:
+            try:
+                self._deliver(to_email, message)
+                self.sent += 1
+                continue
+            except smtplib.SMTPRecipientsRefused as e:
+                error = e
+                transient = all(400 <= code < 500 for code, _ in e.recipients.values())
+            except smtplib.SMTPResponseException as e:
+                # Also covers connect, HELO and login replies; the retry starts on a fresh connection
+                error = e
+                transient = 400 <= e.smtp_code < 500
+                self._disconnect()
+            except OSError as e:  # dropped connection, timeout, refused (SMTPException is an OSError)
+                error = e
+                transient = True
+                self._disconnect()
+
+            if transient and attempts + 1 < self.max_attempts:
+                self.retries += 1
+                # Full-jitter backoff; other messages keep flowing meanwhile
+                delay = random.uniform(0, min(60, 0.5 * 2 ** attempts))
+                heapq.heappush(self._retry_heap, (time.monotonic() + delay, to_email, message, attempts + 1))
+            else:
+                self.failed += 1
+                print(f"❌ Email to {to_email} failed after {attempts + 1} attempt(s): {error}")
+
+    def _deliver(self, to_email: str, message: str):
+        reused = self._server is not None
+        try:
+            with time_dependency("smtp", "send_email"):
+                self._connection().sendmail(self.sender, [to_email], message)
+        except smtplib.SMTPServerDisconnected:
+            if not reused:
+                raise
+            # The server closed the kept-alive connection; retry once on a new one straight away
+            self._disconnect()
+            with time_dependency("smtp", "send_email"):
+                self._connection().sendmail(self.sender, [to_email], message)
+        self._last_used = time.monotonic()
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._server is not None:
+            return self._server
+        with time_dependency("smtp", "connect"):
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.use_tls:
+                    server.starttls()
+                if self.username:
+                    server.login(self.username, self.password)
+            except BaseException:
+                server.close()
+                raise
+        self._server = server
+        self.connections += 1
+        return server
+
+    def _disconnect(self):
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "retrying": len(self._retry_heap),
+            "connected": self._server is not None,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "connections": self.connections
+        }
+
+
+outbox = EmailOutbox(
+    host=settings.EMAIL_HOST,
+    port=settings.EMAIL_PORT,
+    username=settings.EMAIL_USER,
+    password=settings.EMAIL_PASS,
+    sender=settings.EMAIL_FROM,
+    use_tls=settings.EMAIL_USE_TLS,
+    timeout=settings.EMAIL_TIMEOUT,
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+    idle_timeout=settings.EMAIL_IDLE_TIMEOUT,
+    max_queued=settings.EMAIL_OUTBOX_MAX
+)
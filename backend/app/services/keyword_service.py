@@ -1,10 +1,17 @@
+import asyncio
+import string
 from datetime import datetime
-from app.database import supabase
+from app.config import settings
+from app.database import async_supabase
+from app.services.scraping_service import fetch_suggestions
+from app.utils.cache import cached
+from postgrest import ReturnMethod
 import random
 
-def save_keywords(query: str, suggestions: list[str]) -> dict:
+def score_keywords(query: str, suggestions: list[str]) -> list[dict]:
     results = []
-    for i, suggestion in enumerate(suggestions):
+    # Suggest can repeat an entry; one upsert can't touch the same (query, suggestion) twice
+    for i, suggestion in enumerate(dict.fromkeys(suggestions)):
         # Simulated values for MVP
         volume = random.randint(1000, 5000) - i * 100
         difficulty = random.randint(10, 70) + i
@@ -16,7 +23,142 @@ def save_keywords(query: str, suggestions: list[str]) -> dict:
             "keyword_difficulty": min(difficulty, 100),
             "created_at": datetime.utcnow().isoformat()
         })
+    return results
 
-    supabase.table("keyword_research").insert(results).execute()
-    return {"saved": len(results)}
+async def upsert_keywords(rows: list[dict]):
+    if rows:
+        await async_supabase.table("keyword_research") \
+            .upsert(rows, on_conflict="query,suggestion", returning=ReturnMethod.minimal) \
+            .execute()
 
+async def save_keywords(query: str, suggestions: list[str]) -> list[dict]:
+    results = score_keywords(query, suggestions)
+    await upsert_keywords(results)
+    return results
+
+@cached(ttl=settings.SUGGEST_CACHE_TTL, key=lambda query: f"suggest_{query}")
+async def lookup_suggestions(query: str) -> list[str]:
+    """Google Suggest completions, cached per query. Errors propagate and are not cached."""
+    return await fetch_suggestions(query)
+
+@cached(ttl=settings.SUGGEST_CACHE_TTL, key=lambda query: f"keywords_{query}")
+async def research_keywords(query: str) -> list[dict]:
+    """Fetch, score and store suggestions for a normalized query.
+
+    Cached per query, so repeat lookups within the TTL skip both Google Suggest and the write.
+    """
+    suggestions = await lookup_suggestions(query)
+    return await save_keywords(query, suggestions)
+
+# ----------------------------------------
+# 🔤 Alphabet soup expansion
+# ----------------------------------------
+EXPANSION_SUFFIXES = string.ascii_lowercase + string.digits
+
+def rank_suggestions(branches: list[dict], seed: str) -> list[dict]:
+    """Merge branch suggestions: most branches first, then best position within a branch."""
+    merged = {}
+    for branch in branches:
+        for position, suggestion in enumerate(branch["suggestions"]):
+            if suggestion == seed:
+                continue
+            entry = merged.get(suggestion)
+            if entry is None:
+                merged[suggestion] = {"suggestion": suggestion, "frequency": 1, "best_position": position}
+            else:
+                entry["frequency"] += 1
+                entry["best_position"] = min(entry["best_position"], position)
+    return sorted(merged.values(), key=lambda e: (-e["frequency"], e["best_position"], e["suggestion"]))
+
+async def expand_keywords(seed: str, concurrency: int = None) -> dict:
+    """Look up `seed` plus `seed a..z` and `seed 0..9` concurrently, then save the merged,
+    ranked suggestions with one bulk upsert and return the whole tree."""
+    semaphore = asyncio.Semaphore(concurrency or settings.EXPAND_CONCURRENCY)
+    queries = [seed] + [f"{seed} {suffix}" for suffix in EXPANSION_SUFFIXES]
+
+    async def expand(query: str) -> dict:
+        async with semaphore:
+            try:
+                return {"query": query, "suggestions": await lookup_suggestions(query)}
+            except Exception as e:
+                print(f"Error expanding {query!r}: {e}")
+                return {"query": query, "suggestions": [], "error": str(e)}
+
+    branches = await asyncio.gather(*(expand(q) for q in queries))
+    ranked = rank_suggestions(branches, seed)
+
+    rows = await save_keywords(seed, [entry["suggestion"] for entry in ranked])
+    keywords = [
+        {
+            "suggestion": row["suggestion"],
+            "search_volume": row["search_volume"],
+            "keyword_difficulty": row["keyword_difficulty"],
+            "frequency": entry["frequency"]
+        }
+        for entry, row in zip(ranked, rows)
+    ]
+
+    return {
+        "seed": seed,
+        "branches": branches,
+        "keywords": keywords,
+        "failed": [b["query"] for b in branches if "error" in b]
+    }
+
+# ----------------------------------------
+# 📚 Bulk seed research
+# ----------------------------------------
+async def research_keywords_bulk(seeds: list[str], concurrency: int = None, chunk_size: int = None):
+    """Research many normalized seeds concurrently, yielding one event per seed as it completes.
+
+    Scored rows are buffered and upserted in chunks of `chunk_size`, so 500 seeds cost a
+    handful of writes. The last event summarizes the run.
+    """
+    semaphore = asyncio.Semaphore(concurrency or settings.KEYWORD_BULK_CONCURRENCY)
+    chunk_size = chunk_size or settings.KEYWORD_UPSERT_CHUNK
+
+    async def research(seed: str):
+        async with semaphore:
+            try:
+                return seed, await lookup_suggestions(seed), None
+            except Exception as e:
+                print(f"Error fetching suggestions for {seed!r}: {e}")
+                return seed, [], str(e)
+
+    tasks = [asyncio.create_task(research(seed)) for seed in dict.fromkeys(seeds)]
+    pending_rows, saved, failed = [], 0, []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            seed, suggestions, error = await next_done
+            rows = score_keywords(seed, suggestions)
+            pending_rows.extend(rows)
+            if error:
+                failed.append(seed)
+
+            event = {
+                "seed": seed,
+                "suggestions": [
+                    {
+                        "suggestion": row["suggestion"],
+                        "search_volume": row["search_volume"],
+                        "keyword_difficulty": row["keyword_difficulty"]
+                    }
+                    for row in rows
+                ]
+            }
+            if error:
+                event["error"] = error
+            yield event
+
+            if len(pending_rows) >= chunk_size:
+                chunk, pending_rows = pending_rows[:chunk_size], pending_rows[chunk_size:]
+                await upsert_keywords(chunk)
+                saved += len(chunk)
+
+        await upsert_keywords(pending_rows)
+        saved += len(pending_rows)
+        yield {"done": True, "seeds": len(tasks), "saved": saved, "failed": failed}
+    finally:
+        # Client went away or a write failed: stop outstanding lookups
+        for task in tasks:
+            task.cancel()
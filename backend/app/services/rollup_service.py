@@ -0,0 +1,90 @@
+# app/services/rollup_service.py
+import asyncio
+from datetime import date, datetime, timedelta
+from app.database import supabase, async_supabase
+
+# Daily and weekly per-user buckets kept current by the article and SEO write paths.
+# See supabase/migrations/*_analytics_rollups.sql for the table and RPCs.
+GRANULARITIES = ("day", "week")
+
+# Rollup RPCs run as background tasks, off the request that triggered them;
+# held here so they aren't garbage-collected mid-flight, and drained on shutdown.
+_pending: set = set()
+
+
+async def _record(user_id: str, **counts):
+    # Best effort: a missed rollup must never fail the write that triggered it;
+    # the backfill command can always rebuild the buckets from raw rows.
+    try:
+        await async_supabase.rpc("record_analytics_rollup", {"p_user_id": user_id, **counts}).execute()
+    except Exception as e:
+        print(f"Rollup update failed for {user_id}: {e}")
+
+
+def _schedule(user_id: str, **counts):
+    task = asyncio.get_running_loop().create_task(_record(user_id, **counts))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+def record_articles(user_id: str, count: int = 1, at: str = None):
+    """Count `count` articles in the buckets for `at` (default now); negative for deletes."""
+    if count:
+        _schedule(user_id, p_articles=count, **({"p_at": at} if at else {}))
+
+
+def record_seo_reports(user_id: str, rows: list):
+    # Reports are never deleted through the API, so these buckets only grow
+    if rows:
+        _schedule(
+            user_id,
+            p_reports=len(rows),
+            p_seo_score_sum=sum(r["seo_score"] for r in rows),
+            p_title_score_sum=sum(r["title_score"] for r in rows),
+            p_meta_score_sum=sum(r["meta_score"] for r in rows)
+        )
+
+
+async def drain(timeout: float = 5):
+    """Wait for scheduled rollups to land, e.g. before closing the database client."""
+    if _pending:
+        await asyncio.wait(list(_pending), timeout=timeout)
+
+
+def backfill(user_id: str = None) -> int:
+    # Run from the CLI, so it uses the blocking client
+    return supabase.rpc("backfill_analytics_rollups", {"p_user_id": user_id}).execute().data
+
+
+def _bucket_start(day: date, granularity: str) -> date:
+    # Postgres date_trunc('week') starts weeks on Monday
+    return day - timedelta(days=day.weekday()) if granularity == "week" else day
+
+
+async def get_timeseries(user_id: str, granularity: str, days: int) -> list:
+    step = timedelta(days=7 if granularity == "week" else 1)
+    end = _bucket_start(datetime.utcnow().date(), granularity)
+    start = _bucket_start(end - timedelta(days=days - 1), granularity)
+
+    rows = (await async_supabase.table("analytics_rollups").select(
+        "bucket_start, articles_generated, seo_reports, seo_score_sum, title_score_sum, meta_score_sum"
+    ).eq("user_id", user_id).eq("granularity", granularity) \
+        .gte("bucket_start", start.isoformat()).order("bucket_start").execute()).data or []
+    by_bucket = {r["bucket_start"]: r for r in rows}
+
+    # Emit every bucket in range so charts get explicit zeros for quiet periods
+    series = []
+    bucket = start
+    while bucket <= end:
+        r = by_bucket.get(bucket.isoformat(), {})
+        reports = r.get("seo_reports", 0)
+        series.append({
+            "bucket_start": bucket.isoformat(),
+            "articles_generated": r.get("articles_generated", 0),
+            "seo_reports": reports,
+            "avg_seo_score": r["seo_score_sum"] / reports if reports else 0.0,
+            "avg_title_score": r["title_score_sum"] / reports if reports else 0.0,
+            "avg_meta_score": r["meta_score_sum"] / reports if reports else 0.0
+        })
+        bucket += step
+    return series
@@ -1,18 +1,25 @@
 import httpx
-from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
+from app.config import settings
+from app.utils.rate_limiter import HostRateLimiter
+from app.utils.metrics import instrument_httpx
 
-def get_suggestions(query: str) -> list[str]:
-    url = f"https://suggestqueries.google.com/complete/search?client=firefox&q={query}"
-    headers = {
-        "User-Agent": "Mozilla/5.0"
-    }
+# Shared client so suggestion lookups reuse pooled connections instead of blocking a worker
+_client = httpx.AsyncClient(
+    headers={"User-Agent": "Mozilla/5.0"},
+    timeout=settings.SUGGEST_TIMEOUT,
+    limits=httpx.Limits(max_connections=settings.SUGGEST_MAX_CONNECTIONS)
+)
+instrument_httpx(_client, "google_suggest", lambda request: "suggest")
+# Stay polite to the suggest host however many lookups are in flight
+_limiter = HostRateLimiter(settings.SUGGEST_RATE_LIMIT, settings.SUGGEST_RATE_BURST)
 
-    try:
-        response = httpx.get(url, headers=headers)
-        response.raise_for_status()
-        suggestions = response.json()[1]
-        return suggestions
-    except Exception as e:
-        print(f"Error fetching suggestions: {e}")
-        return []
+async def fetch_suggestions(query: str) -> list[str]:
+    """Google Suggest completions for `query`; raises on HTTP or decoding errors."""
+    await _limiter.acquire(urlsplit(settings.SUGGEST_API_URL).netloc)
+    response = await _client.get(settings.SUGGEST_API_URL, params={"client": "firefox", "q": query})
+    response.raise_for_status()
+    return response.json()[1]
 
+async def close_scraping_client():
+    await _client.aclose()
@@ -1,70 +1,156 @@
-from app.utils.seo_analyzer import (
-    analyze_title_tag,
-    analyze_meta_description,
-    seo_score,
-    keyword_density,
-    calculate_readability_score,
-    get_suggestions,
-)
-from app.utils.report_exporter import generate_pdf, generate_html
-from app.database import supabase
+import asyncio
+import logging
+from app.utils.seo_analyzer import analyze_seo
+from app.utils.report_exporter import render_pdf, render_html
+from app.utils.export_cache import export_cache
+from app.utils.bulk_export import iter_pages, ndjson_stream, csv_stream, zip_stream, export_response
+from app.utils.cache import get_cache, set_cache
+from app.utils.process_pool import run_in_process
+from app.utils.metrics import time_section
+from app.services import rollup_service
+from app.utils.pagination import fetch_page
+from app.database import async_supabase
+from app.config import settings
 from uuid import uuid4
-from fastapi.responses import FileResponse
-import tempfile
+from fastapi.responses import Response
+
+logger = logging.getLogger(__name__)
 
 class SEOService:
-    def full_seo_analysis(self, title, meta, content, keyword, user_id):
-        title_result = analyze_title_tag(title, keyword)
-        meta_result = analyze_meta_description(meta, keyword)
-        content_result = {
-            "seo_score": seo_score(content, keyword),
-            "readability": calculate_readability_score(content),
-            "keyword_density": keyword_density(content, keyword),
-            "recommendations": get_suggestions(content, keyword),
-        }
+    async def full_seo_analysis(self, title, meta, content, keyword, user_id, secondary_keywords=()):
+        # Analysis is CPU-bound; run it on the process pool, off the event loop
+        with time_section("analyze_seo"):
+            result = await run_in_process(analyze_seo, title, meta, content, keyword, secondary_keywords)
 
         # Save report to Supabase
-        report_id = str(uuid4())
-        supabase.table("seo_reports").insert({
-            "id": report_id,
+        row = self._report_row(user_id, title, meta, content, keyword, result)
+        await async_supabase.table("seo_reports").insert(row).execute()
+        rollup_service.record_seo_reports(user_id, [row])
+
+        return result
+
+    async def batch_seo_analysis(self, items, user_id):
+        """Analyze many pages on the process pool, then save every report with one bulk insert."""
+        if not items:
+            return []
+        if len(items) > settings.SEO_BATCH_MAX_ITEMS:
+            raise ValueError(f"Batch is limited to {settings.SEO_BATCH_MAX_ITEMS} items")
+
+        with time_section("analyze_seo_batch"):
+            results = await asyncio.gather(*(
+                run_in_process(analyze_seo, it.title, it.meta_description, it.content, it.keyword, it.secondary_keywords)
+                for it in items
+            ))
+
+        rows = [
+            self._report_row(user_id, it.title, it.meta_description, it.content, it.keyword, result)
+            for it, result in zip(items, results)
+        ]
+        await async_supabase.table("seo_reports").insert(rows).execute()
+        rollup_service.record_seo_reports(user_id, rows)
+
+        return results
+
+    @staticmethod
+    def _report_row(user_id, title, meta, content, keyword, result) -> dict:
+        return {
+            "id": str(uuid4()),
             "user_id": user_id,
             "title": title,
             "meta": meta,
             "content": content,
             "keyword": keyword,
-            "seo_score": content_result["seo_score"],
-            "title_score": title_result["score"],
-            "meta_score": meta_result["score"]
-        }).execute()
-
-        return {
-            "title_analysis": title_result,
-            "meta_analysis": meta_result,
-            "content_analysis": content_result
+            "seo_score": result["content_analysis"]["seo_score"],
+            "title_score": result["title_analysis"]["score"],
+            "meta_score": result["meta_analysis"]["score"]
         }
 
-    def get_user_reports(self, user_id: str):
-        response = supabase.table("seo_reports").select("*").eq("user_id", user_id).execute()
-        return response.data
+    REPORT_SUMMARY_FIELDS = "id, user_id, title, meta, keyword, seo_score, title_score, meta_score, created_at"
+
+    async def get_user_reports(self, user_id: str, limit: int = None, cursor: str = None, summary: bool = False):
+        """Return (page of reports, next cursor); pages are LIST_PAGE_SIZE rows unless `limit` is given.
+
+        Summary rows leave out the content body.
+        """
+        fields = self.REPORT_SUMMARY_FIELDS if summary else "*"
+        return await fetch_page(
+            lambda: async_supabase.table("seo_reports").select(fields).eq("user_id", user_id),
+            limit or settings.LIST_PAGE_SIZE, cursor
+        )
 
-    def get_average_seo_score(self, user_id: str):
-        response = supabase.table("seo_reports").select("seo_score").eq("user_id", user_id).execute()
+    async def get_average_seo_score(self, user_id: str):
+        response = await async_supabase.table("seo_reports").select("seo_score").eq("user_id", user_id).execute()
         scores = [row["seo_score"] for row in response.data]
         if not scores:
             return {"average_score": 0}
         return {"average_score": sum(scores) / len(scores)}
 
-    def export_report(self, report_id: str, format: str = "pdf"):
-        response = supabase.table("seo_reports").select("*").eq("id", report_id).single().execute()
-        report = response.data
+    REPORT_EXPORT_FIELDS = (
+        "id", "created_at", "keyword", "title", "meta", "content", "seo_score", "title_score", "meta_score"
+    )
+
+    async def export_reports(self, user_id: str, format: str = "zip", file_format: str = "pdf"):
+        """Stream all of a user's reports as a ZIP of rendered reports, NDJSON or CSV."""
+        pages = iter_pages(
+            lambda: async_supabase.table("seo_reports").select("*").eq("user_id", user_id),
+            settings.EXPORT_PAGE_SIZE
+        )
+        if format == "ndjson":
+            return export_response(ndjson_stream(pages), format, "seo_reports")
+        if format == "csv":
+            return export_response(csv_stream(pages, self.REPORT_EXPORT_FIELDS), format, "seo_reports")
+
+        async def render(row) -> bytes:
+            if file_format == "pdf":
+                return await run_in_process(render_pdf, row)
+            return render_html(row).encode()
 
-        if not report:
+        async def rendered():
+            async for rows in pages:
+                with time_section(f"render_{file_format}_page"):
+                    files = await asyncio.gather(*(render(row) for row in rows), return_exceptions=True)
+                members = []
+                for row, data in zip(rows, files):
+                    if isinstance(data, Exception):
+                        # e.g. characters fpdf can't encode; one bad report mustn't cut the ZIP short
+                        logger.warning("Report %s could not be rendered as %s: %s", row["id"], file_format, data)
+                        members.append((f"seo_report_{row['id']}.error.txt",
+                                        f"This report could not be rendered as {file_format}: {data}\n".encode()))
+                    else:
+                        members.append((f"seo_report_{row['id']}.{file_format}", data))
+                yield members
+
+        return export_response(zip_stream(rendered()), format, "seo_reports")
+
+    async def _fetch_report(self, report_id: str) -> dict:
+        response = await async_supabase.table("seo_reports").select("*").eq("id", report_id).limit(1).execute()
+        if not response.data:
             raise ValueError("Report not found")
+        return response.data[0]
+
+    async def export_report(self, report_id: str, format: str = "pdf"):
+        headers = {"Content-Disposition": f'attachment; filename="seo_report_{report_id}.{format}"'}
+
+        if format == "html":
+            # Cheap to render, so it never touches the disk
+            report = await self._fetch_report(report_id)
+            return Response(render_html(report), media_type="text/html", headers=headers)
+
+        # Reports don't change once saved, so remember which export a report id maps to
+        # and serve repeat downloads without refetching the row
+        alias = f"export_{report_id}_{format}"
+        key = get_cache(alias)
+        data = await asyncio.to_thread(export_cache.get, key) if key else None
 
-        if format == "pdf":
-            file_path = generate_pdf(report)
-        else:
-            file_path = generate_html(report)
+        if data is None:
+            report = await self._fetch_report(report_id)
+            key = export_cache.key_for(report_id, report, format)
+            data = await asyncio.to_thread(export_cache.get, key)
+            if data is None:
+                with time_section("render_pdf"):
+                    data = await run_in_process(render_pdf, report)
+                await asyncio.to_thread(export_cache.put, key, data)
+            set_cache(alias, key, ttl=settings.EXPORT_CACHE_TTL)
 
-        return FileResponse(path=file_path, filename=f"seo_report_{report_id}.{format}")
+        return Response(data, media_type="application/pdf", headers=headers)
 
@@ -1,18 +1,259 @@
 # utils/cache.py
+import asyncio
+import sys
+import threading
 import time
-from typing import Any
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+_MISSING = object()
+_LEADER_CANCELLED = object()
+
+
+def approximate_size(value: Any, _depth: int = 0) -> int:
+    """Rough deep size of JSON-like values; good enough for a byte budget."""
+    size = sys.getsizeof(value)
+    if _depth > 4:
+        return size
+    if isinstance(value, dict):
+        size += sum(approximate_size(k, _depth + 1) + approximate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(v, _depth + 1) for v in value)
+    return size
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and an entry-count and byte budget.
+
+    Expired entries are dropped when read and by an optional background sweeper,
+    so keys that are never read again do not pile up.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None,
+                 default_ttl: float = 60, sizeof: Callable[[Any], int] = approximate_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._sizeof = sizeof
+        self._data = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at, size = entry
+            if time.monotonic() >= expires_at:
+                self._remove(key, size)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        size = self._sizeof(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return  # would evict everything else and still not fit
+
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._remove(key, entry[2])
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def sweep(self) -> int:
+        """Remove every expired entry; returns how many were dropped."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [(k, entry[2]) for k, entry in self._data.items() if now >= entry[1]]
+            for key, size in expired:
+                self._remove(key, size)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def start_sweeper(self, interval: float):
+        if self._sweeper is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                self.sweep()
+
+        self._sweeper = threading.Thread(target=run, name="cache-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        if self._sweeper is None:
+            return
+        self._stop.set()
+        self._sweeper.join()
+        self._sweeper = None
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+    def _remove(self, key: str, size: int):
+        del self._data[key]
+        self._bytes -= size
+
+
+class _Flight:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def cached(ttl: float = 60, key: Optional[Callable[..., str]] = None, cache: Optional[TTLCache] = None):
+    """Cache a function's result with single-flight: on a miss only one caller computes
+    the value while concurrent callers for the same key wait for it. If that caller is
+    cancelled, one of the waiting callers takes over instead of being cancelled too.
+
+    Works on plain and `async def` functions. `key` builds the cache key from the call
+    arguments; by default it is derived from the function name and arguments.
+    """
+    def decorator(fn):
+        store = cache if cache is not None else default_cache
+        prefix = f"{fn.__module__}.{fn.__qualname__}"
+        make_key = key or (lambda *args, **kwargs: f"{prefix}:{args!r}:{sorted(kwargs.items())!r}")
+
+        if asyncio.iscoroutinefunction(fn):
+            in_flight = {}
+
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                cache_key = make_key(*args, **kwargs)
+                while True:
+                    value = store.get(cache_key, _MISSING)
+                    if value is not _MISSING:
+                        return value
+
+                    pending = in_flight.get(cache_key)
+                    if pending is None:
+                        break
+                    value = await asyncio.shield(pending)
+                    if value is not _LEADER_CANCELLED:
+                        return value
+                    # The leader was cancelled, not us: go round again and follow (or become) the next one
+
+                pending = in_flight[cache_key] = asyncio.get_running_loop().create_future()
+                try:
+                    value = await fn(*args, **kwargs)
+                except asyncio.CancelledError:
+                    pending.set_result(_LEADER_CANCELLED)
+                    raise
+                except BaseException as e:
+                    pending.set_exception(e)
+                    pending.exception()  # mark retrieved when nobody else was waiting
+                    raise
+                else:
+                    store.set(cache_key, value, ttl)
+                    pending.set_result(value)
+                    return value
+                finally:
+                    in_flight.pop(cache_key, None)
+
+            async_wrapper.cache = store
+            return async_wrapper
+
+        in_flight = {}
+        lock = threading.Lock()
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache_key = make_key(*args, **kwargs)
+            value = store.get(cache_key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            with lock:
+                flight = in_flight.get(cache_key)
+                leader = flight is None
+                if leader:
+                    flight = in_flight[cache_key] = _Flight()
+
+            if not leader:
+                flight.event.wait()
+                if flight.error is not None:
+                    raise flight.error
+                return flight.value
+
+            try:
+                flight.value = fn(*args, **kwargs)
+                store.set(cache_key, flight.value, ttl)
+                return flight.value
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                with lock:
+                    in_flight.pop(cache_key, None)
+                flight.event.set()
+
+        wrapper.cache = store
+        return wrapper
+
+    return decorator
+
+
+default_cache = TTLCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+)
 
-cache_store = {}
 
 def set_cache(key: str, value: Any, ttl: int = 60):
-    expiry = time.time() + ttl
-    cache_store[key] = (value, expiry)
+    default_cache.set(key, value, ttl)
 
 def get_cache(key: str):
-    value, expiry = cache_store.get(key, (None, 0))
-    if time.time() < expiry:
-        return value
-    if key in cache_store:
-        del cache_store[key]
-    return None
+    return default_cache.get(key)
 
+def delete_cache(key: str):
+    default_cache.delete(key)
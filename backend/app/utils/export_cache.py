@@ -0,0 +1,100 @@
+# utils/export_cache.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from app.config import settings
+from app.utils.metrics import export_cache_events
+
+TEMP_SUFFIX = ".tmp"
+
+
+class ExportCache:
+    """Content-addressed on-disk cache for rendered report exports.
+
+    Files are named after the report id plus a hash of the report and the format,
+    so a changed report never serves a stale file. Each hit refreshes the file's
+    mtime, and writes evict least recently used files once the directory exceeds
+    `max_bytes`. Writes go through a temp file and an atomic rename, so concurrent
+    workers never see a partial export.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, temp_max_age: float = 3600):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.temp_max_age = temp_max_age
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(report_id: str, report: dict, format: str) -> str:
+        raw = json.dumps(report, sort_keys=True, default=str).encode()
+        return f"{report_id}-{hashlib.sha256(raw).hexdigest()[:16]}.{format}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, os.path.basename(key))
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # LRU clock
+        except FileNotFoundError:
+            export_cache_events.inc(("miss",))
+            return None
+        export_cache_events.inc(("hit",))
+        return data
+
+    def put(self, key: str, data: bytes):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=TEMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        self.evict()
+
+    def evict(self):
+        """Drop abandoned temp files and trim the directory to `max_bytes`, oldest first."""
+        with self._lock:
+            now = time.time()
+            files, total = [], 0
+            for entry in os.scandir(self.directory):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # removed by another worker
+                if entry.name.endswith(TEMP_SUFFIX):
+                    if now - stat.st_mtime > self.temp_max_age:
+                        self._unlink(entry.path)
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+            files.sort()
+            for _, size, path in files:
+                if total <= self.max_bytes:
+                    break
+                self._unlink(path)
+                total -= size
+                export_cache_events.inc(("eviction",))
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+export_cache = ExportCache(settings.EXPORT_CACHE_DIR, settings.EXPORT_CACHE_MAX_BYTES)
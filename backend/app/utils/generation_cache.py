@@ -0,0 +1,160 @@
+# utils/generation_cache.py
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+
+class MemoryBackend:
+    """In-process LRU store with per-entry expiry."""
+
+    name = "memory"
+    blocking = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._cache = TTLCache(max_entries=max_entries)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: str, ttl: float):
+        self._cache.set(key, value, ttl)
+
+    def size(self) -> int:
+        return len(self._cache)
+
+
+class DiskBackend:
+    """SQLite-backed LRU store so cached articles survive restarts."""
+
+    name = "disk"
+    blocking = True
+
+    def __init__(self, directory: str, max_entries: int):
+        os.makedirs(directory, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "generation_cache.sqlite3"),
+            check_same_thread=False
+        )
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now >= row[1]:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: float):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now)
+            )
+            self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM entries ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+class GenerationCache:
+    """Optional cache of Groq completions keyed on the full request payload."""
+
+    def __init__(self, backend=None, ttl: float = 600):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def key_for(payload: dict) -> str:
+        # Prompt, system prompt, model and sampling parameters all live in the payload
+        blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str):
+        if self.enabled:
+            self.backend.set(key, value, self.ttl)
+
+    async def aget(self, key: str) -> Optional[str]:
+        # The disk backend does file I/O; keep it off the event loop
+        if self.enabled and self.backend.blocking:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, value: str):
+        if self.enabled and self.backend.blocking:
+            await asyncio.to_thread(self.set, key, value)
+        else:
+            self.set(key, value)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend.name if self.enabled else None,
+            "size": self.backend.size() if self.enabled else 0,
+            "max_entries": self.backend.max_entries if self.enabled else 0,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+def build_generation_cache() -> GenerationCache:
+    kind = settings.GENERATION_CACHE_BACKEND
+    if kind == "memory":
+        backend = MemoryBackend(settings.GENERATION_CACHE_MAX_ENTRIES)
+    elif kind == "disk":
+        backend = DiskBackend(settings.GENERATION_CACHE_DIR, settings.GENERATION_CACHE_MAX_ENTRIES)
+    else:
+        backend = None
+    return GenerationCache(backend, ttl=settings.GENERATION_CACHE_TTL)
+
+
+generation_cache = build_generation_cache()
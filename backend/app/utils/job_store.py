@@ -0,0 +1,172 @@
+# utils/job_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobStore:
+    """SQLite-backed job and work-item state, shared by every worker process on the host.
+
+    Items are claimed with a lease: a claimed item is owned by one worker until it
+    finishes or the lease runs out, after which any worker may claim it again. That
+    is what lets a restarted (or crashed) process pick up exactly the items that never
+    finished, without redoing the ones that did.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, user_id TEXT NOT NULL, kind TEXT NOT NULL, "
+                "params TEXT NOT NULL, total INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, finished_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_items ("
+                "job_id TEXT NOT NULL, idx INTEGER NOT NULL, payload TEXT NOT NULL, "
+                "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+                "owner TEXT, lease_until REAL, result TEXT, error TEXT, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (job_id, idx))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS job_items_claim ON job_items (status, lease_until)")
+
+    def create_job(self, user_id: str, kind: str, items: list, params: Optional[dict] = None) -> str:
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, user_id, kind, params, total, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, user_id, kind, json.dumps(params or {}), len(items), now)
+            )
+            self._conn.executemany(
+                "INSERT INTO job_items (job_id, idx, payload, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(job_id, i, json.dumps(item), PENDING, now) for i, item in enumerate(items)]
+            )
+        return job_id
+
+    def claim(self, owner: str, lease: float) -> Optional[dict]:
+        """Take the oldest pending item that is due, or a running one whose lease expired."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "UPDATE job_items SET status = ?, owner = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? "
+                "WHERE rowid = ("
+                "  SELECT rowid FROM job_items "
+                "  WHERE (status = ? AND (lease_until IS NULL OR lease_until <= ?)) "
+                "     OR (status = ? AND lease_until < ?) "
+                "  ORDER BY updated_at LIMIT 1"
+                ") RETURNING job_id, idx, payload, attempts",
+                (RUNNING, owner, now + lease, now, PENDING, now, RUNNING, now)
+            ).fetchone()
+            if row is None:
+                return None
+            job = self._conn.execute(
+                "SELECT user_id, kind, params FROM jobs WHERE id = ?", (row[0],)
+            ).fetchone()
+        return {
+            "job_id": row[0],
+            "index": row[1],
+            "payload": json.loads(row[2]),
+            "attempts": row[3],
+            "user_id": job[0],
+            "kind": job[1],
+            "params": json.loads(job[2])
+        }
+
+    def finish(self, job_id: str, index: int, owner: str, result: Optional[dict] = None,
+               error: Optional[str] = None):
+        """Record an item's outcome, unless its lease was lost to another worker."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE job_items SET status = ?, result = ?, error = ?, owner = NULL, "
+                "lease_until = NULL, updated_at = ? "
+                "WHERE job_id = ? AND idx = ? AND owner = ? AND status = ?",
+                (FAILED if error else DONE, json.dumps(result) if result is not None else None,
+                 error, now, job_id, index, owner, RUNNING)
+            )
+            self._conn.execute(
+                "UPDATE jobs SET finished_at = ? WHERE id = ? AND finished_at IS NULL AND NOT EXISTS ("
+                "SELECT 1 FROM job_items WHERE job_id = ? AND status IN (?, ?))",
+                (now, job_id, job_id, PENDING, RUNNING)
+            )
+
+    def retry(self, job_id: str, index: int, owner: str, error: str, delay: float):
+        """Put a failed item back in the queue, claimable again after `delay` seconds."""
+        now = time.time()
+        with self._lock, self._conn:
+            # On a pending item lease_until is the earliest time it may be claimed again
+            self._conn.execute(
+                "UPDATE job_items SET status = ?, error = ?, owner = NULL, lease_until = ?, updated_at = ? "
+                "WHERE job_id = ? AND idx = ? AND owner = ? AND status = ?",
+                (PENDING, error, now + delay, now, job_id, index, owner, RUNNING)
+            )
+
+    def release(self, owner: str):
+        """Hand an owner's in-flight items back to the queue, e.g. on graceful shutdown."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE job_items SET status = ?, owner = NULL, lease_until = NULL, "
+                "attempts = attempts - 1 WHERE owner = ? AND status = ?",
+                (PENDING, owner, RUNNING)
+            )
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._conn.execute(
+                "SELECT id, user_id, kind, total, created_at, finished_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            items = self._conn.execute(
+                "SELECT idx, payload, status, attempts, result, error FROM job_items "
+                "WHERE job_id = ? ORDER BY idx", (job_id,)
+            ).fetchall()
+
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for item in items:
+            counts[item[2]] += 1
+        if job[5] is not None:
+            status = "completed"
+        elif counts[PENDING] == job[3]:
+            status = "queued"
+        else:
+            status = "running"
+
+        return {
+            "id": job[0],
+            "user_id": job[1],
+            "kind": job[2],
+            "status": status,
+            "total": job[3],
+            "counts": counts,
+            "created_at": job[4],
+            "finished_at": job[5],
+            "items": [
+                {
+                    "index": idx,
+                    **json.loads(payload),
+                    "status": item_status,
+                    "attempts": attempts,
+                    **(json.loads(result) if result else {}),
+                    **({"error": error} if error else {})
+                }
+                for idx, payload, item_status, attempts, result, error in items
+            ]
+        }
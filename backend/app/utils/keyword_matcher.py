@@ -0,0 +1,95 @@
+# utils/keyword_matcher.py
+from collections import deque
+from functools import lru_cache
+
+
+def normalize_keyword(keyword: str) -> str:
+    return " ".join(keyword.lower().split())
+
+
+class KeywordMatcher:
+    """Token-level Aho–Corasick automaton over a fixed set of (multi-word) keywords.
+
+    Content is matched as lowercased whitespace tokens, the same tokens keyword_density
+    has always counted, so every keyword — phrases included — is found in one scan.
+    """
+
+    def __init__(self, keywords: tuple):
+        self.keywords = keywords
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for index, keyword in enumerate(keywords):
+            tokens = keyword.split()
+            state = 0
+            for token in tokens:
+                nxt = self._goto[state].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][token] = nxt
+                state = nxt
+            self._out[state] += ((index, len(tokens)),)
+
+        # Breadth-first pass to fill failure links and merge outputs of proper suffixes
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(token, 0) if state else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+        self._single_tokens = all(len(k.split()) == 1 for k in keywords)
+
+    def scan(self, tokens: list) -> list:
+        """Return, per keyword, the token index of every (possibly overlapping) match."""
+        positions = [[] for _ in self.keywords]
+
+        if self._single_tokens:
+            # No phrases: a plain lookup per token, no automaton walk needed
+            lookup = {k: positions[i] for i, k in enumerate(self.keywords)}
+            for i, token in enumerate(tokens):
+                hits = lookup.get(token)
+                if hits is not None:
+                    hits.append(i)
+            return positions
+
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for index, size in out[state]:
+                positions[index].append(i - size + 1)
+        return positions
+
+
+@lru_cache(maxsize=256)
+def _cached_matcher(keywords: tuple) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def _normalized(keywords) -> list:
+    """Normalised, non-empty keywords without duplicates, in the order given."""
+    return list(dict.fromkeys(k for k in map(normalize_keyword, keywords) if k))
+
+
+def get_matcher(keywords) -> KeywordMatcher:
+    """Build (or reuse) the automaton for a keyword set; order and duplicates are normalised away."""
+    return _cached_matcher(tuple(sorted(_normalized(keywords))))
+
+
+def match_keywords(tokens: list, keywords) -> dict:
+    """Map each normalised keyword, in the order given, to its match positions in the (lowercased) tokens."""
+    wanted = _normalized(keywords)
+    matcher = get_matcher(wanted)
+    found = dict(zip(matcher.keywords, matcher.scan(tokens)))
+    return {keyword: found[keyword] for keyword in wanted}
@@ -0,0 +1,257 @@
+# utils/metrics.py
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import httpx
+from starlette.routing import Match
+
+# Minimal Prometheus text-format metrics. Each uvicorn worker keeps its own registry,
+# so scrape every worker (or run one worker per container).
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_format_labels(self.labelnames, k)} {v:g}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, labels: tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        lines = self.header()
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+# ---- registry ----
+
+http_requests = Counter("http_requests_total", "HTTP requests by route and status code.",
+                        ("method", "route", "status"))
+http_latency = Histogram("http_request_duration_seconds", "HTTP request latency until the response is complete.",
+                         ("method", "route"))
+http_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being handled.", ("method", "route"))
+dependency_latency = Histogram("dependency_request_duration_seconds",
+                               "Latency of calls to external services (time to response headers for streams).",
+                               ("dependency", "operation", "outcome"))
+section_latency = Histogram("section_duration_seconds", "Latency of CPU-heavy sections of our own code.",
+                            ("section",))
+export_cache_events = Counter("export_cache_events_total", "Rendered report export cache hits, misses and evictions.",
+                              ("event",))
+
+REGISTRY = [http_requests, http_latency, http_in_flight, dependency_latency, section_latency, export_cache_events]
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---- timing helpers ----
+
+@contextmanager
+def time_dependency(dependency: str, operation: str):
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        dependency_latency.observe((dependency, operation, outcome), time.perf_counter() - started)
+
+
+@contextmanager
+def time_section(section: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        section_latency.observe((section,), time.perf_counter() - started)
+
+
+def instrument_httpx(client, dependency: str, operation=None):
+    """Record every request made by an httpx client as a `dependency` call.
+
+    Wraps the client's `send`, so the time is measured up to the response headers
+    and connect, read and timeout errors are recorded too (outcome "timeout" or
+    "error"). `operation(request)` names the call; by default it's the method and path.
+    """
+    name = operation or (lambda request: f"{request.method} {request.url.path}")
+
+    def observe(request, started: float, outcome: str):
+        dependency_latency.observe((dependency, name(request), outcome), time.perf_counter() - started)
+
+    def failed(e: Exception) -> str:
+        return "timeout" if isinstance(e, httpx.TimeoutException) else "error"
+
+    def succeeded(response) -> str:
+        return "ok" if response.status_code < 400 else f"{response.status_code // 100}xx"
+
+    send = client.send
+    if isinstance(client, httpx.AsyncClient):
+        async def timed_send(request, **kwargs):
+            started = time.perf_counter()
+            try:
+                response = await send(request, **kwargs)
+            except Exception as e:
+                observe(request, started, failed(e))
+                raise
+            observe(request, started, succeeded(response))
+            return response
+    else:
+        def timed_send(request, **kwargs):
+            started = time.perf_counter()
+            try:
+                response = send(request, **kwargs)
+            except Exception as e:
+                observe(request, started, failed(e))
+                raise
+            observe(request, started, succeeded(response))
+            return response
+
+    client.send = timed_send
+    return client
+
+
+# ---- ASGI middleware ----
+
+class MetricsMiddleware:
+    """Per-route request count, latency and in-flight gauge.
+
+    Plain ASGI rather than BaseHTTPMiddleware so streamed responses pass straight through;
+    the clock stops when the last body chunk is sent. Routes are labelled by their path
+    template (e.g. /articles/{article_id}) to keep label cardinality bounded.
+    """
+
+    def __init__(self, app, skip_paths=("/metrics",), max_memo: int = 4096):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+        self.max_memo = max_memo
+        self._routes = None
+        # (method, path) -> route label, so repeat paths skip the route scan; bounded since ids vary
+        self._memo: OrderedDict = OrderedDict()
+
+    def _route_for(self, scope) -> str:
+        key = (scope["method"], scope["path"])
+        route = self._memo.get(key)
+        if route is not None:
+            self._memo.move_to_end(key)
+            return route
+
+        route = self._match(scope)
+        self._memo[key] = route
+        if len(self._memo) > self.max_memo:
+            self._memo.popitem(last=False)
+        return route
+
+    def _match(self, scope) -> str:
+        if self._routes is None:
+            self._routes = scope["app"].router.routes
+        for route in self._routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", scope["path"])
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_for(scope)
+        status: Optional[int] = None
+        started = time.perf_counter()
+        http_in_flight.inc((method, route))
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            status = status or 500
+            raise
+        finally:
+            http_in_flight.dec((method, route))
+            http_latency.observe((method, route), time.perf_counter() - started)
+            http_requests.inc((method, route, str(status or 500)))
@@ -0,0 +1,69 @@
+# utils/pagination.py
+import base64
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Callable, Optional
+
+# Keyset pagination over (created_at, id), newest first. The cursor is the
+# position of the last row on the previous page, so each page is an index
+# range scan no matter how deep the client pages.
+
+
+def encode_cursor(row: dict) -> str:
+    raw = f"{row['created_at']}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|", 1)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    # Both parts end up inside a PostgREST or=() filter, so accept nothing but the two shapes we emit
+    try:
+        datetime.fromisoformat(created_at)
+        uuid.UUID(row_id)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    return created_at, row_id
+
+
+def keyset_page(query, limit: int, cursor: Optional[str] = None):
+    """Order a PostgREST query newest-first and restrict it to the page after `cursor`."""
+    query = query.order("created_at", desc=True).order("id", desc=True)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # Quoted: timestamps contain ':' and '.', which are reserved in or=() filters
+        query = query.or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.lt."{row_id}")'
+        )
+    # One extra row tells us whether there is a next page
+    return query.limit(limit + 1)
+
+
+def split_page(rows: list, limit: int) -> tuple:
+    """Return (rows for this page, cursor for the next page or None)."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+
+async def iter_pages(make_query: Callable, page_size: int) -> AsyncIterator[list]:
+    """Yield pages of rows newest first. `make_query` returns a fresh filtered query."""
+    cursor = None
+    while True:
+        response = await keyset_page(make_query(), page_size, cursor).execute()
+        rows, cursor = split_page(response.data, page_size)
+        if rows:
+            yield rows
+        if not cursor:
+            return
+
+
+async def fetch_page(make_query: Callable, limit: int, cursor: Optional[str] = None) -> tuple:
+    """Return (rows, next cursor) for one page of a list endpoint."""
+    response = await keyset_page(make_query(), limit, cursor).execute()
+    return split_page(response.data, limit)
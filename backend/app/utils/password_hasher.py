@@ -0,0 +1,113 @@
+# utils/password_hasher.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+from app.config import settings
+from app.utils.metrics import time_section
+
+
+class PasswordHasherBusy(Exception):
+    def __init__(self, retry_after: float = 1):
+        super().__init__("Too many sign-in requests, please try again shortly")
+        self.retry_after = retry_after
+
+
+def hash_rounds(hashed: str) -> Optional[int]:
+    """The cost factor stored in a bcrypt hash ("$2b$12$..." -> 12)."""
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """bcrypt on a small dedicated thread pool, off the request threads and the event loop.
+
+    bcrypt releases the GIL while hashing, so threads use every core without the pickling
+    and start-up cost of a process pool. At most `max_pending` hashes may be queued or
+    running; past that callers get `PasswordHasherBusy` straight away instead of piling
+    up behind a login spike and starving the rest of the app.
+    """
+
+    def __init__(self, rounds: int = 12, workers: int = 1, max_pending: int = 4):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    def check_capacity(self):
+        """Fail fast, e.g. before the database lookup a login does ahead of verifying."""
+        if self._pending >= self.max_pending:
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy()
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    @staticmethod
+    def _hash(password: str, rounds: int) -> str:
+        with time_section("bcrypt_hash"):
+            return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+
+    @staticmethod
+    def _verify(password: str, hashed: str) -> bool:
+        with time_section("bcrypt_verify"):
+            try:
+                return bcrypt.checkpw(password.encode(), hashed.encode())
+            except ValueError:  # not a bcrypt hash
+                return False
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(self._verify, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return hash_rounds(hashed) != self.rounds
+
+    def stats(self) -> dict:
+        return {
+            "rounds": self.rounds,
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
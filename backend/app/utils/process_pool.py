@@ -0,0 +1,61 @@
+# utils/process_pool.py
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from app.config import settings
+
+# CPU-bound work (SEO analysis) runs here instead of on request threads.
+# Each uvicorn worker owns one pool; SEO_POOL_WORKERS defaults to its share of the cores.
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                # spawn: forking a threaded server process can deadlock the children
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.SEO_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+
+def reset_process_pool(broken: Optional[ProcessPoolExecutor] = None):
+    """Drop a broken pool so the next call builds a fresh one.
+
+    Pass the pool that failed so concurrent callers don't tear down its healthy replacement.
+    """
+    global _pool
+    with _lock:
+        if broken is not None and _pool is not broken:
+            return
+        previous, _pool = _pool, None
+    if previous is not None:
+        previous.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_in_process(fn, *args):
+    """Run a picklable, CPU-bound call on the pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM); rebuild the pool and retry once
+        reset_process_pool(pool)
+        return await loop.run_in_executor(get_process_pool(), fn, *args)
+
+
+def shutdown_process_pool():
+    global _pool
+    with _lock:
+        previous, _pool = _pool, None
+    if previous is not None:
+        previous.shutdown(wait=True, cancel_futures=True)
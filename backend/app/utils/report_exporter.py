@@ -1,8 +1,7 @@
 from fpdf import FPDF
-import tempfile
-import os
+from html import escape
 
-def generate_pdf(report):
+def render_pdf(report) -> bytes:
     pdf = FPDF()
     pdf.add_page()
     pdf.set_font("Arial", size=12)
@@ -16,20 +15,19 @@ def generate_pdf(report):
     pdf.cell(0, 10, txt=f"Title Score: {report['title_score']}", ln=1)
     pdf.cell(0, 10, txt=f"Meta Score: {report['meta_score']}", ln=1)
 
-    temp_path = tempfile.mktemp(suffix=".pdf")
-    pdf.output(temp_path)
-    return temp_path
+    # Render to memory; fpdf 1.x returns a latin-1 string
+    return pdf.output(dest="S").encode("latin-1")
 
-def generate_html(report):
-    html = f"""
+def render_html(report) -> str:
+    return f"""
     <html>
       <head><title>SEO Report</title></head>
       <body>
         <h1>SEO Report</h1>
-        <p><strong>Title:</strong> {report['title']}</p>
-        <p><strong>Meta:</strong> {report['meta']}</p>
-        <p><strong>Content:</strong> {report['content'][:200]}...</p>
-        <p><strong>Keyword:</strong> {report['keyword']}</p>
+        <p><strong>Title:</strong> {escape(str(report['title']))}</p>
+        <p><strong>Meta:</strong> {escape(str(report['meta']))}</p>
+        <p><strong>Content:</strong> {escape(str(report['content'][:200]))}...</p>
+        <p><strong>Keyword:</strong> {escape(str(report['keyword']))}</p>
         <p><strong>SEO Score:</strong> {report['seo_score']}</p>
         <p><strong>Title Score:</strong> {report['title_score']}</p>
         <p><strong>Meta Score:</strong> {report['meta_score']}</p>
@@ -37,8 +35,3 @@ def generate_html(report):
     </html>
     """
 
-    temp_path = tempfile.mktemp(suffix=".html")
-    with open(temp_path, "w") as f:
-        f.write(html)
-    return temp_path
-
@@ -1,4 +1,7 @@
 import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from app.utils.keyword_matcher import match_keywords, normalize_keyword
 
 def analyze_title_tag(title: str, keyword: str) -> dict:
     issues = []
@@ -50,44 +53,155 @@ def analyze_meta_description(meta: str, keyword: str) -> dict:
     }
 
 
-def calculate_readability_score(text: str) -> float:
-    words = text.split()
-    sentences = re.split(r'[.!?]+', text)
-    syllables = sum(count_syllables(word) for word in words)
+SENTENCE_SPLIT = re.compile(r'[.!?]+')
+VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+VOWEL_BYTES = b"aeiouy"
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the multi-document path uses it
+    np = None
+
+
+@dataclass
+class TextStats:
+    """Everything the content scorers need, gathered in one pass over the text."""
+    char_count: int
+    word_count: int
+    sentence_count: int
+    syllable_count: int
+    keyword_hits: int
+    # normalised keyword -> token positions, for the target and any secondary keywords
+    keyword_positions: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_text(cls, text: str, keyword: str = "", secondary_keywords=()) -> "TextStats":
+        lowered = text.lower()
+        words = lowered.split()
+        positions = match_keywords(words, (keyword, *secondary_keywords)) if keyword or secondary_keywords else {}
+        return cls(
+            char_count=len(text),
+            word_count=len(words),
+            sentence_count=count_sentences(text),
+            # Vowel groups never span whitespace, so one scan of the whole text
+            # gives the same total as counting word by word.
+            syllable_count=len(VOWEL_GROUPS.findall(lowered)),
+            keyword_hits=len(positions.get(normalize_keyword(keyword), ())),
+            keyword_positions=positions
+        )
+
+    @property
+    def readability(self) -> float:
+        return flesch_reading_ease(self.word_count, self.sentence_count, self.syllable_count)
+
+    @property
+    def keyword_density(self) -> float:
+        return self.density_of(self.keyword_hits)
+
+    def density_of(self, hits: int) -> float:
+        return (hits / self.word_count) * 100 if self.word_count > 0 else 0.0
+
+    def keyword_report(self) -> list:
+        return [
+            {
+                "keyword": keyword,
+                "count": len(positions),
+                "density": self.density_of(len(positions)),
+                "positions": positions
+            }
+            for keyword, positions in self.keyword_positions.items()
+        ]
+
+
+def flesch_reading_ease(words: int, sentences: int, syllables: int) -> float:
+    num_sentences = max(1, sentences)
+    num_words = max(1, words)
+    return 206.835 - 1.015 * (num_words / num_sentences) - 84.6 * (syllables / num_words)
 
-    num_sentences = max(1, len([s for s in sentences if s.strip()]))
-    num_words = max(1, len(words))
+def count_sentences(text: str) -> int:
+    return sum(1 for s in SENTENCE_SPLIT.split(text) if s.strip())
 
-    return 206.835 - 1.015 * (num_words / num_sentences) - 84.6 * (syllables / num_words)
+def calculate_readability_score(text: str, stats: TextStats = None) -> float:
+    if stats is None:
+        lowered = text.lower()
+        return flesch_reading_ease(
+            len(lowered.split()), count_sentences(text), len(VOWEL_GROUPS.findall(lowered))
+        )
+    return stats.readability
 
+@lru_cache(maxsize=65536)
 def count_syllables(word: str) -> int:
-    return len(re.findall(r'[aeiouy]+', word.lower()))
+    return len(VOWEL_GROUPS.findall(word.lower()))
+
+def readability_scores(texts: list) -> list:
+    """Flesch scores for many documents at once.
+
+    With NumPy installed, syllables for the whole corpus are counted in one vectorised
+    pass over the UTF-8 bytes (multi-byte characters never match an ASCII vowel) and the
+    formula is applied column-wise; otherwise this falls back to the per-document scan.
+    """
+    if np is None or not texts:
+        return [calculate_readability_score(t) for t in texts]
+
+    lowered = [t.lower() for t in texts]
+    encoded = [t.encode("utf-8") for t in lowered]
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+
+    # Follow every document with a non-vowel separator so groups cannot run across
+    # documents and every slice handed to reduceat is non-empty
+    corpus = np.frombuffer(b" ".join(encoded) + b" ", dtype=np.uint8)
+    is_vowel = np.isin(corpus, np.frombuffer(VOWEL_BYTES, dtype=np.uint8))
+    group_starts = is_vowel.copy()
+    group_starts[1:] &= ~is_vowel[:-1]
 
-def keyword_density(text: str, keyword: str) -> float:
-    words = text.lower().split()
-    count = words.count(keyword.lower())
-    return (count / len(words)) * 100 if len(words) > 0 else 0.0
+    offsets = np.concatenate(([0], np.cumsum(lengths[:-1] + 1)))
+    syllables = np.add.reduceat(group_starts.astype(np.int64), offsets)
 
-def seo_score(content: str, keyword: str) -> int:
-    density = keyword_density(content, keyword)
-    readability = calculate_readability_score(content)
+    words = np.maximum(1, np.fromiter((len(t.split()) for t in lowered), dtype=np.float64, count=len(texts)))
+    sentences = np.maximum(1, np.fromiter((count_sentences(t) for t in texts), dtype=np.float64, count=len(texts)))
+    scores = 206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words)
+    return scores.tolist()
+
+def keyword_density(text: str, keyword: str, stats: TextStats = None) -> float:
+    return (stats or TextStats.from_text(text, keyword)).keyword_density
+
+def seo_score(content: str, keyword: str, stats: TextStats = None) -> int:
+    stats = stats or TextStats.from_text(content, keyword)
+    density = stats.keyword_density
+    readability = stats.readability
 
     score = 0
     if 1 <= density <= 2.5:
         score += 40
     if readability >= 60:
         score += 30
-    if len(content) >= 500:
+    if stats.char_count >= 500:
         score += 30
     return min(score, 100)
 
-def get_suggestions(content: str, keyword: str) -> list:
+def get_suggestions(content: str, keyword: str, stats: TextStats = None) -> list:
+    stats = stats or TextStats.from_text(content, keyword)
     suggestions = []
-    if keyword_density(content, keyword) < 1:
+    if stats.keyword_density < 1:
         suggestions.append("Increase keyword usage.")
-    if len(content) < 500:
+    if stats.char_count < 500:
         suggestions.append("Write at least 500 words.")
-    if calculate_readability_score(content) < 60:
+    if stats.readability < 60:
         suggestions.append("Simplify sentences for better readability.")
     return suggestions
 
+
+def analyze_seo(title: str, meta: str, content: str, keyword: str, secondary_keywords=()) -> dict:
+    """Full title/meta/content analysis; pure and picklable so it can run in a worker process."""
+    stats = TextStats.from_text(content, keyword, secondary_keywords)
+    return {
+        "title_analysis": analyze_title_tag(title, keyword),
+        "meta_analysis": analyze_meta_description(meta, keyword),
+        "content_analysis": {
+            "seo_score": seo_score(content, keyword, stats),
+            "readability": calculate_readability_score(content, stats),
+            "keyword_density": keyword_density(content, keyword, stats),
+            "recommendations": get_suggestions(content, keyword, stats),
+            "keywords": stats.keyword_report(),
+        }
+    }
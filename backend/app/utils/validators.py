@@ -13,14 +13,18 @@ def store_code(email: str, code: str):
     verification_codes[email] = {"code": code, "expires": expires}
     rate_limit[email] = datetime.utcnow()
 
-def validate_code(email: str, code: str) -> bool:
+def check_code(email: str, code: str) -> bool:
+    """Whether `code` is currently valid for `email`, without using it up."""
     data = verification_codes.get(email)
     if not data:
         return False
     if datetime.utcnow() > data["expires"]:
         verification_codes.pop(email, None)
         return False
-    if data["code"] != code:
+    return data["code"] == code
+
+def validate_code(email: str, code: str) -> bool:
+    if not check_code(email, code):
         return False
     verification_codes.pop(email, None)
     return True
@@ -0,0 +1,120 @@
+"""Load-test one app instance against stand-in Groq and Supabase backends with fixed latency.
+
+Run from backend/:  python -m benchmarks.bench_event_loop [--requests 200] [--concurrency 200] [--latency 0.05] [--skip-blocking]
+
+Three rows are compared on the same in-process app:
+  blocking-async : `async def` route calling blocking I/O (how /seo/analyze used to behave)
+  threadpool     : `def` route calling blocking I/O (how articles/generate/keywords used to behave)
+  async          : the real /generate/article route on the async Groq and Supabase clients
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends
+
+import main
+from app.core.groq_client import set_groq_client
+from app.core.security import get_current_user_id
+from app.database import async_supabase
+from app.services.auth_service import create_access_token
+
+GROQ_URL = "http://groq.local/openai/v1"
+
+
+def fake_groq(latency: float):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Generated article body."}}]})
+    return httpx.MockTransport(handler)
+
+
+def fake_postgrest(latency: float):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        if request.url.path.startswith("/rest/v1/rpc/"):
+            return httpx.Response(200, json=None)
+        return httpx.Response(201, json=[{}])
+    return httpx.MockTransport(handler)
+
+
+def add_legacy_routes(app, latency: float):
+    """Routes that wait on blocking I/O the way the old handlers did."""
+    @app.post("/bench/blocking-async")
+    async def blocking_async(user_id: str = Depends(get_current_user_id)):
+        time.sleep(latency)       # Groq call
+        time.sleep(latency / 4)   # Supabase insert
+        return {"ok": True}
+
+    @app.post("/bench/threadpool")
+    def threadpool(user_id: str = Depends(get_current_user_id)):
+        time.sleep(latency)
+        time.sleep(latency / 4)
+        return {"ok": True}
+
+
+async def run_load(client: httpx.AsyncClient, method: str, url: str, body: dict,
+                   total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await client.request(method, url, json=body)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - started
+
+
+async def bench(args):
+    app = main.app
+    add_legacy_routes(app, args.latency)
+
+    await set_groq_client(httpx.AsyncClient(base_url=GROQ_URL, transport=fake_groq(args.latency)))
+    postgrest = async_supabase.postgrest
+    postgrest.session = httpx.AsyncClient(
+        base_url=str(postgrest.session.base_url),
+        headers=postgrest.session.headers,
+        transport=fake_postgrest(args.latency / 4)
+    )
+
+    token = create_access_token("bench@example.com", "bench-user")
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://app",
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=None
+    )
+    article = {"keyword": "coffee beans", "tone": "professional", "length": "short"}
+    rows = [
+        ("blocking-async", "/bench/blocking-async", {}),
+        ("threadpool", "/bench/threadpool", {}),
+        ("async", "/generate/article?fresh=true", article),
+    ]
+    if args.skip_blocking:
+        rows = rows[1:]
+
+    ideal = args.requests / args.concurrency * args.latency * 1.5
+    print(f"{args.requests} requests, concurrency {args.concurrency}, "
+          f"backend latency {args.latency * 1000:.0f} ms (ideal ~{ideal:.2f}s)")
+    async with client:
+        for name, url, body in rows:
+            elapsed = await run_load(client, "POST", url, body, args.requests, args.concurrency)
+            print(f"  {name:<15}: {elapsed:7.2f}s  {args.requests / elapsed:8.1f} req/s")
+
+    await set_groq_client(None)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stand-in Groq call")
+    parser.add_argument("--skip-blocking", action="store_true", help="skip the slow blocking-async row")
+    asyncio.run(bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,90 @@
+"""Batch and interactive generation against the rate-limited fake Groq, with and without the scheduler.
+
+Run from backend/:  python -m benchmarks.bench_groq_scheduler [--batch 100] [--interactive 10]
+
+Batch calls are fired all at once. Interactive calls arrive one second later, while the
+batch backlog is still queued. "unscheduled" sends everything straight through with no
+budgets or retries, which is how a 429 used to reach users. The scheduler rows use the
+same limits as the fake server.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+from benchmarks.bench_keyword_expand import free_port, serve_in_thread
+
+RPM, TPM, WINDOW = 600, 600000, 2
+
+
+async def run_scenario(name: str, scheduler, args, base_url: str):
+    from app.core import groq_client
+    from app.core.groq_scheduler import BATCH, INTERACTIVE
+    from app.services import ai_service
+
+    ai_service.groq_scheduler = scheduler
+    await groq_client.set_groq_client(httpx.AsyncClient(base_url=base_url, timeout=60))
+
+    async def call(priority: int, delay: float = 0):
+        await asyncio.sleep(delay)
+        started = time.perf_counter()
+        try:
+            await ai_service.chat_completion("system", "Write about coffee.", fresh=True, priority=priority)
+            return priority, time.perf_counter() - started, None
+        except Exception as e:
+            return priority, time.perf_counter() - started, type(e).__name__
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(call(BATCH) for _ in range(args.batch)),
+        *(call(INTERACTIVE, delay=1 + i * 0.1) for i in range(args.interactive))
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f"  {name}: {elapsed:.1f}s total, retries {scheduler.retries}, 429s seen {scheduler.throttled}")
+    for label, priority in (("interactive", INTERACTIVE), ("batch", BATCH)):
+        ok = sorted(t for p, t, err in results if p == priority and err is None)
+        failed = sum(1 for p, _, err in results if p == priority and err is not None)
+        if ok:
+            print(f"    {label:<12} ok {len(ok):>4}  failed {failed:>4}  "
+                  f"p50 {statistics.median(ok):6.2f}s  max {ok[-1]:6.2f}s")
+        else:
+            print(f"    {label:<12} ok    0  failed {failed:>4}")
+
+
+async def bench(args, base_url: str):
+    from app.core.groq_scheduler import GroqScheduler
+
+    await run_scenario("unscheduled", GroqScheduler(0, 0, max_retries=0), args, base_url)
+    await asyncio.sleep(WINDOW)  # let the fake's buckets refill
+    await run_scenario("scheduler  ", GroqScheduler(RPM, TPM, window=WINDOW), args, base_url)
+    await asyncio.sleep(WINDOW)
+    # Budgets set too high: the scheduler only learns about the limit from 429 + Retry-After
+    await run_scenario("retry only ", GroqScheduler(0, 0), args, base_url)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--interactive", type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ.update({
+        "FAKE_GROQ_RPM": str(RPM), "FAKE_GROQ_TPM": str(TPM), "FAKE_GROQ_WINDOW": str(WINDOW)
+    })
+    from benchmarks import fake_groq
+    port = free_port()
+    server = serve_in_thread(fake_groq.app, port)
+    print(f"fake Groq: {RPM} RPM, {TPM} TPM, {WINDOW}s burst, {fake_groq.LATENCY * 1000:.0f} ms latency; "
+          f"{args.batch} batch + {args.interactive} interactive calls")
+    try:
+        asyncio.run(bench(args, f"http://127.0.0.1:{port}/openai/v1"))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main_cli()
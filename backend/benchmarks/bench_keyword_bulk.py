@@ -0,0 +1,95 @@
+"""End-to-end timing of POST /keywords/bulk for a pasted seed list, against local stubs.
+
+Run from backend/:  python -m benchmarks.bench_keyword_bulk [--seeds 500] [--latency 0.05] [--write-latency 0.02]
+
+The suggest stub is benchmarks.fake_suggest; Supabase writes are stubbed with a fixed latency.
+The baseline calls /keywords/suggest once per seed, the way the seed list used to be scripted.
+The app runs on a real uvicorn server so time-to-first-line reflects actual streaming.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+from benchmarks.bench_keyword_expand import free_port, serve_in_thread
+
+
+async def bench(args):
+    from app.database import async_supabase
+    from app.utils.cache import default_cache
+    import main
+
+    writes = []
+
+    async def postgrest(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(args.write_latency)
+        writes.append(len(json.loads(request.content)))
+        return httpx.Response(201)
+
+    session = async_supabase.postgrest.session
+    async_supabase.postgrest.session = httpx.AsyncClient(
+        base_url=str(session.base_url), headers=session.headers, transport=httpx.MockTransport(postgrest)
+    )
+    seeds = [f"seed keyword {i}" for i in range(args.seeds)]
+
+    port = free_port()
+    server = await asyncio.to_thread(serve_in_thread, main.app, port)
+    client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None)
+    async with client:
+        default_cache.clear()
+        writes.clear()
+        started = time.perf_counter()
+        for seed in seeds:
+            (await client.get("/keywords/suggest", params={"q": seed})).raise_for_status()
+        baseline = time.perf_counter() - started
+        print(f"  one request per seed : {baseline:7.2f}s  {len(writes)} writes")
+
+        default_cache.clear()
+        writes.clear()
+        started = time.perf_counter()
+        first_line, events = None, []
+        async with client.stream("POST", "/keywords/bulk", json={"seeds": seeds}) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                if first_line is None:
+                    first_line = time.perf_counter() - started
+                events.append(json.loads(line))
+        bulk = time.perf_counter() - started
+
+    server.should_exit = True
+
+    summary = events[-1]
+    assert summary.get("done") and summary["seeds"] == args.seeds and not summary["failed"], summary
+    assert summary["saved"] == sum(writes)
+    print(f"  bulk NDJSON          : {bulk:7.2f}s  {len(writes)} writes of {writes}, "
+          f"first line after {first_line * 1000:.0f} ms  ({baseline / bulk:.1f}x)")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seeds", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stub suggest lookup")
+    parser.add_argument("--write-latency", type=float, default=0.02, help="seconds per stub Supabase write")
+    args = parser.parse_args()
+
+    port = free_port()
+    os.environ["FAKE_SUGGEST_LATENCY"] = str(args.latency)
+    os.environ["SUGGEST_API_URL"] = f"http://127.0.0.1:{port}/complete/search"
+    os.environ["SUGGEST_RATE_LIMIT"] = "0"
+    from benchmarks import fake_suggest
+    server = serve_in_thread(fake_suggest.app, port)
+    print(f"{args.seeds} seeds, suggest latency {args.latency * 1000:.0f} ms, "
+          f"write latency {args.write_latency * 1000:.0f} ms")
+    try:
+        asyncio.run(bench(args))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main_cli()
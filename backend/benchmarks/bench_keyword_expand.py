@@ -0,0 +1,90 @@
+"""Exercise GET /keywords/expand against the local suggest stand-in.
+
+Run from backend/:  python -m benchmarks.bench_keyword_expand [--latency 0.05] [--rate 0]
+
+Starts benchmarks.fake_suggest on a free port, stubs the Supabase upsert, and compares
+one lookup at a time (the old external script) with the concurrent fan-out. Also checks
+that the merged suggestions are unique and saved with a single write.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import threading
+import time
+
+import httpx
+import uvicorn
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve_in_thread(app, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def bench(args):
+    from app.database import async_supabase
+    from app.utils.cache import default_cache
+    import main
+
+    writes = []
+
+    def postgrest(request: httpx.Request) -> httpx.Response:
+        writes.append(request)
+        return httpx.Response(201)
+
+    session = async_supabase.postgrest.session
+    async_supabase.postgrest.session = httpx.AsyncClient(
+        base_url=str(session.base_url), headers=session.headers, transport=httpx.MockTransport(postgrest)
+    )
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://app", timeout=None)
+    async with client:
+        for concurrency in (1, 8, 36):
+            default_cache.clear()
+            writes.clear()
+            started = time.perf_counter()
+            response = await client.get("/keywords/expand", params={"q": "coffee beans", "concurrency": concurrency})
+            elapsed = time.perf_counter() - started
+            response.raise_for_status()
+            body = response.json()
+
+            suggestions = [k["suggestion"] for k in body["keywords"]]
+            assert len(suggestions) == len(set(suggestions)), "duplicate suggestions"
+            assert len(writes) == 1, f"expected one bulk write, got {len(writes)}"
+            assert not body["failed"], body["failed"]
+            print(f"  concurrency {concurrency:>2}: {elapsed:6.2f}s  {len(body['branches'])} lookups, "
+                  f"{len(suggestions)} unique keywords, top: {suggestions[0]!r}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stand-in lookup")
+    parser.add_argument("--rate", type=float, default=0, help="suggest requests per second; 0 disables")
+    args = parser.parse_args()
+
+    port = free_port()
+    # Settings are read at import time, so configure before importing the app
+    os.environ["FAKE_SUGGEST_LATENCY"] = str(args.latency)
+    os.environ["SUGGEST_API_URL"] = f"http://127.0.0.1:{port}/complete/search"
+    os.environ["SUGGEST_RATE_LIMIT"] = str(args.rate)
+    from benchmarks import fake_suggest
+    server = serve_in_thread(fake_suggest.app, port)
+    print(f"fake suggest on :{port}, latency {args.latency * 1000:.0f} ms, rate limit {args.rate or 'off'}")
+    try:
+        asyncio.run(bench(args))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,124 @@
+"""Login throughput at a given bcrypt cost, and what a login spike does to other endpoints.
+
+Run from backend/:  python -m benchmarks.bench_password_hash [--rounds 10 12] [--concurrency 50] [--requests 200]
+
+For each cost the full stack from benchmarks.harness is started with BCRYPT_ROUNDS set
+and users seeded with hashes at that cost. `--concurrency` clients then log in while one
+client keeps fetching /articles/ (JWT auth plus a database read, no bcrypt). The probe's
+latency during the spike shows whether hashing starves unrelated requests. Logins turned
+away by admission control (503) are retried after Retry-After and counted; latency is
+measured from the first attempt.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from benchmarks.harness import PASSWORD, Stack, build_scenarios, percentile, token_for
+
+
+async def send_retrying(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+    # uvicorn closes keep-alive connections idle for 5s; a client sleeping on Retry-After can race it
+    for attempt in range(3):
+        try:
+            return await client.request(method, url, **kwargs)
+        except (httpx.ReadError, httpx.RemoteProtocolError):
+            if attempt == 2:
+                raise
+
+
+async def probe(client: httpx.AsyncClient, headers: dict, stop: asyncio.Event) -> list:
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await send_retrying(client, "GET", "/articles/?limit=20", headers=headers)
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+async def probe_for(client: httpx.AsyncClient, headers: dict, seconds: float) -> list:
+    stop = asyncio.Event()
+    task = asyncio.create_task(probe(client, headers, stop))
+    await asyncio.sleep(seconds)
+    stop.set()
+    return await task
+
+
+async def login_until_done(client: httpx.AsyncClient, users: list, concurrency: int, total: int) -> dict:
+    """Closed loop of logins; a 503 is retried after its Retry-After, like a well-behaved client would."""
+    latencies, rejected, errors = [], 0, 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal rejected, errors
+        for i in counter:
+            body = {"email": f"{users[i % len(users)]}@bench.example.com", "password": PASSWORD}
+            started = time.perf_counter()
+            while True:
+                response = await send_retrying(client, "POST", "/auth/login", json=body)
+                if response.status_code != 503:
+                    break
+                rejected += 1
+                await asyncio.sleep(float(response.headers.get("retry-after", 1)))
+            errors += response.status_code != 200
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {"logins_per_s": total / wall, "p50": percentile(latencies, 50), "p95": percentile(latencies, 95),
+            "rejected_503": rejected, "errors": errors}
+
+
+async def run(stack: Stack, args) -> dict:
+    users = [str(uuid.uuid4()) for _ in range(args.users)]
+    _, seed, _ = build_scenarios(stack, users)
+    headers = {"Authorization": f"Bearer {token_for(users[0])}"}
+
+    async with httpx.AsyncClient(base_url=stack.url("app"), timeout=120,
+                                 limits=httpx.Limits(max_connections=args.concurrency + 10)) as client:
+        async with httpx.AsyncClient(timeout=30) as seed_client:
+            await seed(seed_client)
+        await login_until_done(client, users, 2, 4)
+
+        idle = await probe_for(client, headers, seconds=2)
+
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, headers, stop))
+        result = await login_until_done(client, users, args.concurrency, args.requests)
+        stop.set()
+        busy = await probe_task
+
+    result.update({"probe_idle": percentile(idle, 95), "probe_during": percentile(busy, 95)})
+    return result
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[12])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--db-latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    for rounds in args.rounds:
+        stack_args = argparse.Namespace(
+            bcrypt_rounds=rounds, db_latency=args.db_latency,
+            groq_latency=0.2, suggest_latency=0.05, smtp_latency=0.01
+        )
+        stack = Stack(stack_args)
+        stack.start()
+        try:
+            r = asyncio.run(run(stack, argparse.Namespace(**vars(args), bcrypt_rounds=rounds)))
+        finally:
+            stack.stop()
+        print(f"cost {rounds:>2}: {r['logins_per_s']:>5.1f} logins/s  p50 {r['p50'] * 1000:>7.0f}  "
+              f"p95 {r['p95'] * 1000:>7.0f} ms  503s retried {r['rejected_503']}  errors {r['errors']}  | "
+              f"/articles/ p95 idle {r['probe_idle'] * 1000:.0f} ms, during logins {r['probe_during'] * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,44 @@
+"""Compare the readability engine with the original per-word implementation.
+
+Run from backend/:  python -m benchmarks.bench_readability [--words 10000] [--docs 200]
+
+The multi-document row uses NumPy when it is installed and reports the fallback otherwise.
+"""
+import argparse
+
+from app.utils import seo_analyzer
+from benchmarks.bench_seo_analyzer import best_of, legacy_readability, make_document
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=10000, help="words in the single large document")
+    parser.add_argument("--docs", type=int, default=200, help="documents in the multi-document run")
+    parser.add_argument("--doc-words", type=int, default=1500, help="words per document in the multi-document run")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    doc = make_document(args.words, "seo")
+    assert seo_analyzer.calculate_readability_score(doc) == legacy_readability(doc), "scores diverged"
+
+    legacy = best_of(lambda: legacy_readability(doc), args.repeat)
+    current = best_of(lambda: seo_analyzer.calculate_readability_score(doc), args.repeat)
+    print(f"single document, {args.words} words, best of {args.repeat}")
+    print(f"  legacy per-word   : {legacy * 1000:8.2f} ms")
+    print(f"  whole-text scan   : {current * 1000:8.2f} ms   ({legacy / current:.2f}x)")
+
+    corpus = [make_document(args.doc_words, "seo", seed=i) for i in range(args.docs)]
+    assert seo_analyzer.readability_scores(corpus) == [legacy_readability(d) for d in corpus], "scores diverged"
+
+    legacy = best_of(lambda: [legacy_readability(d) for d in corpus], args.repeat)
+    scalar = best_of(lambda: [seo_analyzer.calculate_readability_score(d) for d in corpus], args.repeat)
+    batched = best_of(lambda: seo_analyzer.readability_scores(corpus), args.repeat)
+    engine = "numpy" if seo_analyzer.np is not None else "fallback, numpy not installed"
+    print(f"{args.docs} documents x {args.doc_words} words, best of {args.repeat}")
+    print(f"  legacy per-word   : {legacy * 1000:8.2f} ms")
+    print(f"  whole-text scan   : {scalar * 1000:8.2f} ms   ({legacy / scalar:.2f}x)")
+    print(f"  readability_scores: {batched * 1000:8.2f} ms   ({legacy / batched:.2f}x, {engine})")
+
+
+if __name__ == "__main__":
+    main()
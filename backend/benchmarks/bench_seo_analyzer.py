@@ -0,0 +1,119 @@
+"""Compare the single-pass TextStats scorers with the original multi-pass ones.
+
+Run from backend/:  python -m benchmarks.bench_seo_analyzer [--words 10000] [--repeat 20]
+"""
+import argparse
+import random
+import re
+import time
+
+from app.utils import seo_analyzer
+
+
+# ----------------------------------------
+# 📏 Original implementation (reference)
+# ----------------------------------------
+def legacy_count_syllables(word: str) -> int:
+    return len(re.findall(r'[aeiouy]+', word.lower()))
+
+def legacy_readability(text: str) -> float:
+    words = text.split()
+    sentences = re.split(r'[.!?]+', text)
+    syllables = sum(legacy_count_syllables(word) for word in words)
+    num_sentences = max(1, len([s for s in sentences if s.strip()]))
+    num_words = max(1, len(words))
+    return 206.835 - 1.015 * (num_words / num_sentences) - 84.6 * (syllables / num_words)
+
+def legacy_density(text: str, keyword: str) -> float:
+    words = text.lower().split()
+    count = words.count(keyword.lower())
+    return (count / len(words)) * 100 if len(words) > 0 else 0.0
+
+def legacy_seo_score(content: str, keyword: str) -> int:
+    density = legacy_density(content, keyword)
+    readability = legacy_readability(content)
+    score = 0
+    if 1 <= density <= 2.5:
+        score += 40
+    if readability >= 60:
+        score += 30
+    if len(content) >= 500:
+        score += 30
+    return min(score, 100)
+
+def legacy_suggestions(content: str, keyword: str) -> list:
+    suggestions = []
+    if legacy_density(content, keyword) < 1:
+        suggestions.append("Increase keyword usage.")
+    if len(content) < 500:
+        suggestions.append("Write at least 500 words.")
+    if legacy_readability(content) < 60:
+        suggestions.append("Simplify sentences for better readability.")
+    return suggestions
+
+def legacy_analysis(content: str, keyword: str) -> dict:
+    # Mirrors the original SEOService.full_seo_analysis content section
+    return {
+        "seo_score": legacy_seo_score(content, keyword),
+        "readability": legacy_readability(content),
+        "keyword_density": legacy_density(content, keyword),
+        "recommendations": legacy_suggestions(content, keyword),
+    }
+
+
+def current_analysis(content: str, keyword: str) -> dict:
+    stats = seo_analyzer.TextStats.from_text(content, keyword)
+    return {
+        "seo_score": seo_analyzer.seo_score(content, keyword, stats),
+        "readability": seo_analyzer.calculate_readability_score(content, stats),
+        "keyword_density": seo_analyzer.keyword_density(content, keyword, stats),
+        "recommendations": seo_analyzer.get_suggestions(content, keyword, stats),
+    }
+
+
+# ----------------------------------------
+# 🧪 Harness
+# ----------------------------------------
+VOCABULARY = (
+    "search engine optimization content ranking keyword strategy audience article "
+    "readability sentence paragraph structure heading backlink traffic organic page "
+    "marketing conversion analytics quality helpful guide tips the a of and to in"
+).split()
+
+def make_document(words: int, keyword: str, seed: int = 42) -> str:
+    rng = random.Random(seed)
+    out = []
+    for i in range(words):
+        out.append(keyword if rng.random() < 0.015 else rng.choice(VOCABULARY))
+        if i % rng.randint(8, 20) == 0:
+            out[-1] += rng.choice([".", "!", "?"])
+    return " ".join(out)
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    keyword = "seo"
+    doc = make_document(args.words, keyword)
+    assert legacy_analysis(doc, keyword) == current_analysis(doc, keyword), "scores diverged"
+
+    legacy = best_of(lambda: legacy_analysis(doc, keyword), args.repeat)
+    current = best_of(lambda: current_analysis(doc, keyword), args.repeat)
+    print(f"{args.words} words, best of {args.repeat}")
+    print(f"  legacy multi-pass : {legacy * 1000:8.2f} ms")
+    print(f"  TextStats         : {current * 1000:8.2f} ms")
+    print(f"  speedup           : {legacy / current:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
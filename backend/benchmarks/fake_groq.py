@@ -0,0 +1,109 @@
+"""Local stand-in for Groq's chat completions API that enforces rate limits.
+
+Run from backend/:  uvicorn benchmarks.fake_groq:app --port 8766
+then point the API at it with GROQ_BASE_URL=http://127.0.0.1:8766/openai/v1
+
+Requests and tokens are limited by token buckets (FAKE_GROQ_RPM, FAKE_GROQ_TPM, each
+holding FAKE_GROQ_WINDOW seconds' worth). Over-limit requests get a 429 with Retry-After
+and x-ratelimit-* headers, like the real API. Responses report usage, and `stream: true`
+is answered as SSE with usage in the final chunk's `x_groq` field.
+"""
+import asyncio
+import json
+import os
+import time
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+LATENCY = float(os.getenv("FAKE_GROQ_LATENCY", "0.2"))
+COMPLETION_TOKENS = int(os.getenv("FAKE_GROQ_COMPLETION_TOKENS", "150"))
+
+
+class Bucket:
+    def __init__(self, per_minute: float, window: float):
+        self.rate = per_minute / 60
+        self.capacity = self.rate * window
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def try_take(self, amount: float):
+        """Take `amount` and return 0, or return the seconds until it would fit."""
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.level >= amount:
+            self.level -= amount
+            return 0
+        return (amount - self.level) / self.rate
+
+
+class Limits:
+    def __init__(self, rpm: float, tpm: float, window: float):
+        self.requests = Bucket(rpm, window)
+        self.tokens = Bucket(tpm, window)
+        self.served = 0
+        self.rejected = 0
+
+
+limits = Limits(
+    float(os.getenv("FAKE_GROQ_RPM", "600")),
+    float(os.getenv("FAKE_GROQ_TPM", "600000")),
+    float(os.getenv("FAKE_GROQ_WINDOW", "2"))
+)
+
+
+def usage_for(body: dict) -> dict:
+    prompt = sum(len(m.get("content", "")) for m in body.get("messages", [])) // 4
+    return {"prompt_tokens": prompt, "completion_tokens": COMPLETION_TOKENS,
+            "total_tokens": prompt + COMPLETION_TOKENS}
+
+
+async def completions(request: Request):
+    body = await request.json()
+    usage = usage_for(body)
+
+    wait = limits.requests.try_take(1) or limits.tokens.try_take(usage["total_tokens"])
+    if wait:
+        limits.rejected += 1
+        return JSONResponse(
+            {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+            status_code=429,
+            headers={
+                "retry-after": f"{wait:.2f}",
+                "x-ratelimit-remaining-requests": str(int(limits.requests.level)),
+                "x-ratelimit-remaining-tokens": str(int(limits.tokens.level))
+            }
+        )
+
+    await asyncio.sleep(LATENCY)
+    limits.served += 1
+    text = "Generated article body. " * 10
+
+    if not body.get("stream"):
+        return JSONResponse({
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}}],
+            "usage": usage
+        })
+
+    async def events():
+        for word in text.split(" "):
+            chunk = {"choices": [{"index": 0, "delta": {"content": word + " "}}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+        final = {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "x_groq": {"usage": usage}}
+        yield f"data: {json.dumps(final)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+async def stats(request: Request):
+    return JSONResponse({"served": limits.served, "rejected": limits.rejected})
+
+
+app = Starlette(routes=[
+    Route("/openai/v1/chat/completions", completions, methods=["POST"]),
+    Route("/stats", stats)
+])
@@ -0,0 +1,172 @@
+"""Local stand-in for the PostgREST endpoints the API uses through supabase-py.
+
+Run from backend/:  uvicorn benchmarks.fake_postgrest:app --port 8767
+then point the API at it with SUPABASE_URL=http://127.0.0.1:8767
+
+Tables live in memory. Supported: select with `eq`/`neq`/`gt`/`gte`/`lt`/`lte` filters,
+`order`, `limit`, single-object responses, insert and upsert (`on_conflict`), update,
+delete, and the `get_dashboard_stats` / `record_analytics_rollup` RPCs. Keyset `or=`
+filters are applied for the (created_at, id) cursor shape the API sends. Set
+FAKE_POSTGREST_LATENCY (seconds) to simulate the database round trip.
+"""
+import asyncio
+import json
+import os
+import re
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+LATENCY = float(os.getenv("FAKE_POSTGREST_LATENCY", "0.01"))
+RESERVED = {"select", "order", "limit", "offset", "on_conflict", "columns", "or"}
+KEYSET = re.compile(r'created_at\.lt\."([^"]+)",and\(created_at\.eq\."([^"]+)",id\.lt\."([^"]+)"\)')
+
+tables = defaultdict(list)
+
+
+def _compare(op: str, left, right: str) -> bool:
+    if left is None:
+        return False
+    left = str(left)
+    return {
+        "eq": left == right, "neq": left != right, "gt": left > right,
+        "gte": left >= right, "lt": left < right, "lte": left <= right
+    }.get(op, True)
+
+
+def _filter(rows: list, params) -> list:
+    for column, value in params.multi_items():
+        if column in RESERVED or "." not in value:
+            continue
+        op, operand = value.split(".", 1)
+        rows = [r for r in rows if _compare(op, r.get(column), operand.strip('"'))]
+    keyset = KEYSET.search(params.get("or", ""))
+    if keyset:
+        created_at, _, row_id = keyset.groups()
+        rows = [r for r in rows if (r["created_at"], r["id"]) < (created_at, row_id)]
+    return rows
+
+
+def _order(rows: list, order: str) -> list:
+    for part in reversed([p for p in order.split(",") if p]):
+        column, _, direction = part.partition(".")
+        rows = sorted(rows, key=lambda r: str(r.get(column) or ""), reverse=direction.startswith("desc"))
+    return rows
+
+
+def _project(rows: list, select: str) -> list:
+    if not select or select == "*":
+        return rows
+    columns = [c.strip() for c in select.split(",")]
+    return [{c: r.get(c) for c in columns} for r in rows]
+
+
+def _respond(request: Request, rows: list, status: int = 200) -> Response:
+    if "return=minimal" in request.headers.get("prefer", ""):
+        return Response(status_code=201 if status == 201 else 204)
+    if "vnd.pgrst.object" in request.headers.get("accept", ""):
+        if len(rows) != 1:
+            return JSONResponse({"code": "PGRST116", "message": "JSON object requested, multiple (or no) rows returned",
+                                 "details": f"The result contains {len(rows)} rows", "hint": None}, status_code=406)
+        return JSONResponse(rows[0], status_code=status)
+    return JSONResponse(rows, status_code=status)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+async def table(request: Request):
+    await asyncio.sleep(LATENCY)
+    name = request.path_params["table"]
+    params = request.query_params
+
+    if request.method == "GET":
+        rows = _order(_filter(tables[name], params), params.get("order", ""))
+        if "limit" in params:
+            rows = rows[:int(params["limit"])]
+        return _respond(request, _project(rows, params.get("select", "*")))
+
+    if request.method == "POST":
+        body = json.loads(await request.body() or b"[]")
+        new_rows = body if isinstance(body, list) else [body]
+        conflict = [c for c in params.get("on_conflict", "").split(",") if c]
+        stored = []
+        for row in new_rows:
+            row = {"id": str(uuid.uuid4()), "created_at": _now(), **row}
+            existing = next((r for r in tables[name] if conflict and all(r.get(c) == row.get(c) for c in conflict)), None)
+            if existing is not None:
+                existing.update(row)
+                stored.append(existing)
+            else:
+                tables[name].append(row)
+                stored.append(row)
+        return _respond(request, stored, status=201)
+
+    if request.method == "PATCH":
+        changes = json.loads(await request.body())
+        rows = _filter(tables[name], params)
+        for row in rows:
+            row.update(changes)
+        return _respond(request, rows)
+
+    if request.method == "DELETE":
+        rows = _filter(tables[name], params)
+        tables[name] = [r for r in tables[name] if r not in rows]
+        return _respond(request, rows)
+
+    return Response(status_code=405)
+
+
+def dashboard_stats(user_id: str) -> dict:
+    articles = [a for a in tables["articles"] if a.get("user_id") == user_id]
+    reports = [r for r in tables["seo_reports"] if r.get("user_id") == user_id]
+    uses = Counter(a.get("keyword") for a in articles)
+    top = sorted(uses.items(), key=lambda kv: (-kv[1], kv[0] or ""))[:5]
+
+    def avg(column):
+        values = [r.get(column) or 0 for r in reports]
+        return sum(values) / len(values) if values else 0
+
+    return {
+        "total_articles": len(articles),
+        "top_keywords": [k for k, _ in top],
+        "avg_title_score": avg("title_score"),
+        "avg_meta_score": avg("meta_score"),
+        "avg_content_score": avg("seo_score")
+    }
+
+
+async def rpc(request: Request):
+    await asyncio.sleep(LATENCY)
+    args = json.loads(await request.body() or b"{}")
+    function = request.path_params["function"]
+    if function == "get_dashboard_stats":
+        return JSONResponse(dashboard_stats(args.get("p_user_id")))
+    return JSONResponse(None)
+
+
+async def reset(request: Request):
+    tables.clear()
+    return JSONResponse({"ok": True})
+
+
+async def seed(request: Request):
+    """Bulk-load rows without latency: {"table": [rows...], ...}."""
+    body = await request.json()
+    for name, rows in body.items():
+        tables[name].extend({"id": str(uuid.uuid4()), "created_at": _now(), **row} for row in rows)
+    return JSONResponse({name: len(tables[name]) for name in body})
+
+
+app = Starlette(routes=[
+    Route("/rest/v1/rpc/{function}", rpc, methods=["POST"]),
+    Route("/rest/v1/{table}", table, methods=["GET", "POST", "PATCH", "DELETE"]),
+    Route("/_fake/reset", reset, methods=["POST"]),
+    Route("/_fake/seed", seed, methods=["POST"])
+])
@@ -0,0 +1,76 @@
+"""Local SMTP sink for benchmarking the email paths.
+
+Run from backend/:  python -m benchmarks.fake_smtp --port 8825 [--latency 0.05]
+then point the API at it with EMAIL_HOST=127.0.0.1 EMAIL_PORT=8825 EMAIL_USE_TLS=false
+
+Speaks just enough ESMTP for smtplib: EHLO/HELO, AUTH (any credentials), MAIL, RCPT,
+DATA, RSET, NOOP and QUIT. STARTTLS is not offered. Each command answer is delayed by
+--latency seconds to simulate a remote relay. Messages are counted, not stored.
+"""
+import argparse
+import asyncio
+
+delivered = 0
+connections = 0
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latency: float):
+    global delivered, connections
+    connections += 1
+
+    async def reply(line: str):
+        if latency:
+            await asyncio.sleep(latency)
+        writer.write((line + "\r\n").encode())
+        await writer.drain()
+
+    await reply("220 fake-smtp ready")
+    try:
+        while True:
+            raw = await reader.readline()
+            if not raw:
+                break
+            command = raw.decode(errors="replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if verb == "EHLO":
+                writer.write(b"250-fake-smtp\r\n250-AUTH PLAIN LOGIN\r\n")
+                await reply("250 8BITMIME")
+            elif verb == "HELO":
+                await reply("250 fake-smtp")
+            elif verb == "AUTH":
+                await reply("235 2.7.0 Authentication successful")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                await reply("250 OK")
+            elif verb == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                while (await reader.readline()) not in (b".\r\n", b".\n", b""):
+                    pass
+                delivered += 1
+                await reply("250 OK queued")
+            elif verb == "QUIT":
+                await reply("221 Bye")
+                break
+            else:
+                await reply("502 Command not implemented")
+    finally:
+        writer.close()
+
+
+async def serve(host: str, port: int, latency: float):
+    server = await asyncio.start_server(lambda r, w: handle(r, w, latency), host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8825)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds before each reply")
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.latency))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,35 @@
+"""Local stand-in for the Google Suggest endpoint.
+
+Run from backend/:  uvicorn benchmarks.fake_suggest:app --port 8765
+then point the API at it with SUGGEST_API_URL=http://127.0.0.1:8765/complete/search
+
+Answers in the `client=firefox` shape, `[query, [suggestions...]]`, with deterministic
+suggestions that overlap between neighbouring queries so expansion dedupe has work to do.
+Set FAKE_SUGGEST_LATENCY (seconds) to simulate network latency.
+"""
+import asyncio
+import os
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+LATENCY = float(os.getenv("FAKE_SUGGEST_LATENCY", "0.05"))
+
+
+def suggestions_for(query: str, count: int = 8) -> list[str]:
+    seed = query.rsplit(" ", 1)[0] if " " in query else query
+    last = query[-1]
+    own = [f"{query} {word}" for word in ("guide", "tips", "review", "near me")]
+    shared = [f"{seed} {word}" for word in ("best", "cheap", "online", "2026")]
+    return (own + shared)[:count] if last.isalpha() else (shared + own)[:count]
+
+
+async def complete(request: Request):
+    await asyncio.sleep(LATENCY)
+    query = request.query_params.get("q", "")
+    return JSONResponse([query, suggestions_for(query)])
+
+
+app = Starlette(routes=[Route("/complete/search", complete)])
@@ -0,0 +1,410 @@
+"""Offline benchmark suite: the API on one uvicorn worker against local stand-ins.
+
+Run from backend/:
+    python -m benchmarks.harness [--levels 1 10 50] [--requests 200] [--only seo_analyze articles]
+                                 [--out results.json] [--compare previous.json]
+
+Starts benchmarks.fake_groq, fake_postgrest, fake_suggest and fake_smtp, plus the app
+itself (`uvicorn main:app`), each in its own process on a free port, with the app's
+environment pointing at the fakes. Every scenario is driven by a closed loop of
+`concurrency` clients; throughput and p50/p95/p99 latency are reported per level and
+saved as JSON (benchmarks/results/ by default) so runs can be compared with --compare.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import bcrypt
+import httpx
+import jwt
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+JWT_SECRET = "benchmark-secret"
+PASSWORD = "correct horse battery"
+
+SEO_CONTENT = " ".join(
+    f"Coffee beans from sample farm {i} are roasted to bring out their flavour. "
+    f"Choosing the best coffee beans depends on roast, origin and grind size."
+    for i in range(60)
+)
+
+
+# ---------------------------------------------------------------------------
+# Processes
+# ---------------------------------------------------------------------------
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise RuntimeError(f"nothing listening on :{port} after {timeout}s")
+
+
+class Stack:
+    """The fakes and the app, each in a subprocess."""
+
+    def __init__(self, args):
+        self.args = args
+        self.ports = {name: free_port() for name in ("groq", "postgrest", "suggest", "smtp", "app")}
+        self.workdir = tempfile.mkdtemp(prefix="rankcraft-bench-")
+        self.processes = []
+
+    def _spawn(self, name: str, command: list, env: dict):
+        log = open(os.path.join(self.workdir, f"{name}.log"), "w")
+        process = subprocess.Popen(
+            command, cwd=BACKEND_DIR, env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT
+        )
+        self.processes.append((name, process, log))
+
+    def _uvicorn(self, name: str, target: str, env: dict):
+        self._spawn(name, [
+            sys.executable, "-m", "uvicorn", target,
+            "--host", "127.0.0.1", "--port", str(self.ports[name]), "--log-level", "warning"
+        ], env)
+
+    def app_env(self) -> dict:
+        service_key = jwt.encode({"role": "service_role", "iss": "supabase"}, "unused", algorithm="HS256")
+        return {
+            "SUPABASE_URL": f"http://127.0.0.1:{self.ports['postgrest']}",
+            "SUPABASE_SERVICE_ROLE_KEY": service_key,
+            "JWT_SECRET": JWT_SECRET,
+            "EMAIL_HOST": "127.0.0.1",
+            "EMAIL_PORT": str(self.ports["smtp"]),
+            "EMAIL_USER": "bench",
+            "EMAIL_PASS": "bench",
+            "EMAIL_FROM": "bench@example.com",
+            "EMAIL_USE_TLS": "false",
+            "CODE_EXPIRATION_MINUTES": "10",
+            "BCRYPT_ROUNDS": str(self.args.bcrypt_rounds),
+            "GROQ_API_KEY": "bench",
+            "GROQ_BASE_URL": f"http://127.0.0.1:{self.ports['groq']}/openai/v1",
+            "GROQ_HTTP2": "false",
+            # The fake enforces no meaningful limit here; measure our code, not the budget
+            "GROQ_RPM": "0",
+            "GROQ_TPM": "0",
+            "SUGGEST_API_URL": f"http://127.0.0.1:{self.ports['suggest']}/complete/search",
+            "SUGGEST_RATE_LIMIT": "0",
+            "GENERATION_CACHE_BACKEND": "",
+            "JOB_DB_PATH": os.path.join(self.workdir, "jobs.sqlite3"),
+            "EXPORT_CACHE_DIR": os.path.join(self.workdir, "exports"),
+            "GENERATION_CACHE_DIR": os.path.join(self.workdir, "cache"),
+        }
+
+    def start(self):
+        a = self.args
+        self._uvicorn("groq", "benchmarks.fake_groq:app", {
+            "FAKE_GROQ_LATENCY": str(a.groq_latency), "FAKE_GROQ_RPM": "10000000", "FAKE_GROQ_TPM": "10000000000"
+        })
+        self._uvicorn("postgrest", "benchmarks.fake_postgrest:app", {"FAKE_POSTGREST_LATENCY": str(a.db_latency)})
+        self._uvicorn("suggest", "benchmarks.fake_suggest:app", {"FAKE_SUGGEST_LATENCY": str(a.suggest_latency)})
+        self._spawn("smtp", [
+            sys.executable, "-m", "benchmarks.fake_smtp",
+            "--port", str(self.ports["smtp"]), "--latency", str(a.smtp_latency)
+        ], {})
+        for name in ("groq", "postgrest", "suggest", "smtp"):
+            wait_for_port(self.ports[name])
+
+        self._uvicorn("app", "main:app", self.app_env())
+        wait_for_port(self.ports["app"], timeout=60)
+
+    def stop(self):
+        for _, process, log in reversed(self.processes):
+            process.terminate()
+        for name, process, log in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            log.close()
+
+    def url(self, name: str) -> str:
+        return f"http://127.0.0.1:{self.ports[name]}"
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+def token_for(user_id: str) -> str:
+    claims = {"email": f"{user_id}@bench.example.com", "uid": user_id,
+              "exp": datetime.now(timezone.utc) + timedelta(hours=2)}
+    return jwt.encode(claims, JWT_SECRET, algorithm="HS256")
+
+
+class Scenario:
+    """One endpoint under load. `request(i)` returns (method, path, kwargs) for the i-th call."""
+
+    def __init__(self, name: str, request, finish=None):
+        self.name = name
+        self.request = request
+        self.finish = finish
+
+
+def build_scenarios(stack: Stack, users: list) -> tuple:
+    """The scenarios, plus `seed(client)` (run once before them) and the batch-job response hook."""
+    main_user = users[0]
+    headers = {"Authorization": f"Bearer {token_for(main_user)}"}
+    user_headers = [{"Authorization": f"Bearer {token_for(u)}"} for u in users]
+    article = {"keyword": "coffee beans", "length": "short", "tone": "professional"}
+    submitted_jobs = []
+
+    async def seed(client: httpx.AsyncClient):
+        # Stored at the app's cost, so logins measure verification without a rehash
+        password_hash = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(stack.args.bcrypt_rounds)).decode()
+        rows = {
+            "users": [{"id": u, "email": f"{u}@bench.example.com", "password": password_hash, "is_verified": True}
+                      for u in users],
+            "articles": [
+                {"user_id": u, "keyword": f"keyword {i % 12}", "length": "short",
+                 "tone": "casual", "article": "Body text. " * 200}
+                for u in users for i in range(40)
+            ],
+            "seo_reports": [
+                {"user_id": u, "title": "t", "meta": "m", "content": "c", "keyword": f"keyword {i % 12}",
+                 "seo_score": 60 + i % 30, "title_score": 70, "meta_score": 80}
+                for u in users for i in range(20)
+            ]
+        }
+        (await client.post(f"{stack.url('postgrest')}/_fake/seed", json=rows)).raise_for_status()
+
+    def generate_batch(i):
+        return "POST", "/generate/batch", {"json": {"items": [article] * 5}, "headers": headers}
+
+    async def record_job(response: httpx.Response):
+        if response.status_code == 202:
+            submitted_jobs.append(response.json()["job_id"])
+
+    async def drain_jobs(client: httpx.AsyncClient) -> dict:
+        """Time until every job submitted at this level has completed."""
+        started = time.perf_counter()
+        pending = list(submitted_jobs)
+        while pending:
+            statuses = await asyncio.gather(*(
+                client.get(f"/generate/jobs/{job_id}", headers=headers) for job_id in pending
+            ))
+            pending = [j for j, r in zip(pending, statuses) if r.json().get("status") != "completed"]
+            if pending:
+                await asyncio.sleep(0.2)
+        jobs, submitted_jobs[:] = len(submitted_jobs), []
+        return {"jobs": jobs, "drain_seconds": round(time.perf_counter() - started, 3)}
+
+    return [
+        Scenario("generate_article", lambda i: (
+            "POST", "/generate/article?fresh=true", {"json": article, "headers": headers})),
+        Scenario("generate_batch", generate_batch, finish=drain_jobs),
+        Scenario("seo_analyze", lambda i: ("POST", "/seo/analyze", {"json": {
+            "title": "Best Coffee Beans: A Complete Buying Guide",
+            "meta_description": "Find the best coffee beans for your taste with our guide to roast, origin and grind "
+                                "size, plus tips for storing beans fresh.",
+            "content": SEO_CONTENT,
+            "keyword": "coffee beans"
+        }, "headers": headers})),
+        # Rotates through users so the 60s per-user cache sees a realistic mix of hits and misses
+        Scenario("dashboard_analytics", lambda i: (
+            "GET", "/dashboard/analytics", {"headers": user_headers[i % len(user_headers)]})),
+        Scenario("articles", lambda i: ("GET", "/articles/?limit=20", {"headers": headers})),
+        # A new address each call: users lookup + insert, bcrypt, and the verification email
+        Scenario("auth_register", lambda i: ("POST", "/auth/register", {"json": {
+            "email": f"bench-{uuid.uuid4().hex[:12]}@example.com", "password": PASSWORD
+        }})),
+        Scenario("auth_login", lambda i: ("POST", "/auth/login", {"json": {
+            "email": f"{users[i % len(users)]}@bench.example.com", "password": PASSWORD
+        }})),
+        # A new query each call, so every request misses the suggestion cache
+        Scenario("keywords_suggest", lambda i: (
+            "GET", "/keywords/suggest", {"params": {"q": f"bench seed {uuid.uuid4().hex[:8]}"}})),
+    ], seed, record_job
+
+
+# ---------------------------------------------------------------------------
+# Load generation
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+async def run_level(client: httpx.AsyncClient, scenario: Scenario, concurrency: int, total: int,
+                    on_response=None) -> dict:
+    latencies, errors = [], 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            method, path, kwargs = scenario.request(i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                elapsed = time.perf_counter() - started
+                if response.status_code >= 400:
+                    errors += 1
+                if on_response is not None:
+                    await on_response(response)
+            except httpx.HTTPError:
+                elapsed = time.perf_counter() - started
+                errors += 1
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda seconds: round(seconds * 1000, 2)
+    return {
+        "endpoint": scenario.name,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / wall, 2),
+        "mean_ms": ms(sum(latencies) / len(latencies)),
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1])
+    }
+
+
+async def run_suite(stack: Stack, args) -> list:
+    users = [str(uuid.uuid4()) for _ in range(args.users)]
+    scenarios, seed, record_job = build_scenarios(stack, users)
+    results = []
+
+    async with httpx.AsyncClient(base_url=stack.url("app"), timeout=120,
+                                 limits=httpx.Limits(max_connections=max(args.levels) + 10)) as client:
+        async with httpx.AsyncClient(timeout=30) as seed_client:
+            await seed(seed_client)
+        for scenario in scenarios:
+            if args.only and scenario.name not in args.only:
+                continue
+            on_response = record_job if scenario.name == "generate_batch" else None
+            # Warm-up: connections, imports, first-call caches
+            await run_level(client, scenario, 2, args.warmup, on_response)
+            if scenario.finish:
+                await scenario.finish(client)
+
+            for concurrency in args.levels:
+                total = max(args.requests, concurrency * 2)
+                result = await run_level(client, scenario, concurrency, total, on_response)
+                if scenario.finish:
+                    result["extra"] = await scenario.finish(client)
+                results.append(result)
+                print_row(result)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def print_row(r: dict, previous: dict = None):
+    line = (f"  {r['endpoint']:<20} c={r['concurrency']:<4} {r['throughput_rps']:>9.1f} req/s  "
+            f"p50 {r['p50_ms']:>8.1f}  p95 {r['p95_ms']:>8.1f}  p99 {r['p99_ms']:>8.1f} ms  "
+            f"errors {r['errors']}")
+    if r.get("extra"):
+        line += f"  {r['extra']}"
+    if previous:
+        line += (f"   [{_delta(previous['throughput_rps'], r['throughput_rps'])} req/s, "
+                 f"p95 {_delta(previous['p95_ms'], r['p95_ms'])}]")
+    print(line)
+
+
+def _delta(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.0f}%"
+
+
+def compare(results: list, baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = {(r["endpoint"], r["concurrency"]): r for r in json.load(f)["results"]}
+    print(f"\ncompared with {baseline_path}:")
+    for r in results:
+        print_row(r, baseline.get((r["endpoint"], r["concurrency"])))
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 50], help="concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and level")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--users", type=int, default=50, help="distinct users for the dashboard scenario")
+    parser.add_argument("--only", nargs="+", help="run only these scenarios")
+    parser.add_argument("--groq-latency", type=float, default=0.5)
+    parser.add_argument("--db-latency", type=float, default=0.01)
+    parser.add_argument("--suggest-latency", type=float, default=0.1)
+    parser.add_argument("--smtp-latency", type=float, default=0.05)
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="BCRYPT_ROUNDS for the app and seeded users")
+    parser.add_argument("--out", help="where to save the JSON results")
+    parser.add_argument("--compare", help="earlier results JSON to diff against")
+    args = parser.parse_args()
+
+    stack = Stack(args)
+    print(f"starting fakes and app (logs in {stack.workdir})")
+    stack.start()
+    try:
+        results = asyncio.run(run_suite(stack, args))
+    finally:
+        stack.stop()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "levels": args.levels,
+            "requests_per_level": args.requests,
+            "latencies": {
+                "groq": args.groq_latency, "postgrest": args.db_latency,
+                "suggest": args.suggest_latency, "smtp": args.smtp_latency
+            },
+            "bcrypt_rounds": args.bcrypt_rounds
+        },
+        "results": results
+    }
+    out = args.out or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['meta']['git_commit']}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"saved {out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,4 +1,8 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import (
@@ -9,11 +13,45 @@ from app.api import (
     seo,
     analytics,
 )
+from app.config import settings
+from app.core.groq_client import close_groq_client
+from app.database import close_async_supabase
+from app.services import rollup_service
+from app.services.scraping_service import close_scraping_client
+from app.services.batch_job_service import batch_jobs
+from app.services.email_outbox import outbox
+from app.utils.cache import default_cache
+from app.utils.process_pool import shutdown_process_pool
+from app.utils.password_hasher import password_hasher
+from app.utils.metrics import MetricsMiddleware, render_metrics
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    default_cache.start_sweeper(settings.CACHE_SWEEP_INTERVAL)
+    # Resumes any batch items left unfinished by the previous run
+    batch_jobs.start()
+    outbox.start()
+    yield
+    await batch_jobs.stop()
+    # Flushes queued verification/reset emails before exiting
+    await asyncio.to_thread(outbox.stop)
+    default_cache.stop_sweeper()
+    # Release pooled keep-alive connections on shutdown
+    await close_groq_client()
+    await close_scraping_client()
+    # Lets in-flight analytics rollups finish on the client they were started on
+    await rollup_service.drain()
+    await close_async_supabase()
+    shutdown_process_pool()
+    password_hasher.shutdown()
+
 
 app = FastAPI(
     title="RankCraft AI - SEO Content Generator",
     version="1.0.0",
-    description="Generate SEO content using Groq AI with keyword research, batch generation, and analytics."
+    description="Generate SEO content using Groq AI with keyword research, batch generation, and analytics.",
+    lifespan=lifespan
 )
 
 # CORS Middleware (Update allow_origins in production)
@@ -23,8 +61,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 # ✅ Route registration
 app.include_router(auth.router)
 app.include_router(keywords.router)
@@ -41,3 +82,14 @@ def root():
 def health_check():
     return {"status": "ok"}
 
+@app.get("/health/cache")
+def cache_stats():
+    return default_cache.stats()
+
+@app.get("/health/email")
+def email_stats():
+    return outbox.stats()
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
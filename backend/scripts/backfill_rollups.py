@@ -0,0 +1,20 @@
+"""Rebuild analytics rollups from the raw articles and seo_reports tables.
+
+Run from backend/:  python -m scripts.backfill_rollups [--user-id UUID]
+"""
+import argparse
+
+from app.services import rollup_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--user-id", help="only rebuild this user's buckets (default: everyone)")
+    args = parser.parse_args()
+
+    written = rollup_service.backfill(args.user_id)
+    print(f"✅ Rebuilt {written} rollup buckets" + (f" for {args.user_id}" if args.user_id else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+-- Dashboard aggregates computed in the database so /dashboard/analytics no longer
+-- pulls every article body and report row into the API process.
+
+create index if not exists articles_user_id_keyword_idx on public.articles (user_id, keyword);
+create index if not exists seo_reports_user_id_idx on public.seo_reports (user_id);
+
+create or replace function public.get_dashboard_stats(p_user_id uuid)
+returns json
+language sql
+stable
+as $$
+  select json_build_object(
+    'total_articles',
+      (select count(*) from public.articles a where a.user_id = p_user_id),
+    'top_keywords',
+      coalesce((
+        select json_agg(k.keyword order by k.uses desc, k.keyword)
+        from (
+          select a.keyword, count(*) as uses
+          from public.articles a
+          where a.user_id = p_user_id
+          group by a.keyword
+          order by uses desc, a.keyword
+          limit 5
+        ) k
+      ), '[]'::json),
+    'avg_title_score',
+      (select coalesce(avg(r.title_score), 0)::float8 from public.seo_reports r where r.user_id = p_user_id),
+    'avg_meta_score',
+      (select coalesce(avg(r.meta_score), 0)::float8 from public.seo_reports r where r.user_id = p_user_id),
+    'avg_content_score',
+      (select coalesce(avg(r.seo_score), 0)::float8 from public.seo_reports r where r.user_id = p_user_id)
+  );
+$$;
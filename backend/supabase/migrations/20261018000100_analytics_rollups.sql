@@ -0,0 +1,78 @@
+-- Per-user daily and weekly rollups for the analytics trend charts.
+-- Writers bump the current buckets through record_analytics_rollup();
+-- backfill_analytics_rollups() rebuilds them from the raw tables.
+
+create table if not exists public.analytics_rollups (
+  user_id uuid not null,
+  granularity text not null check (granularity in ('day', 'week')),
+  bucket_start date not null,
+  articles_generated integer not null default 0,
+  seo_reports integer not null default 0,
+  seo_score_sum bigint not null default 0,
+  title_score_sum bigint not null default 0,
+  meta_score_sum bigint not null default 0,
+  primary key (user_id, granularity, bucket_start)
+);
+
+create or replace function public.record_analytics_rollup(
+  p_user_id uuid,
+  p_articles integer default 0,
+  p_reports integer default 0,
+  p_seo_score_sum bigint default 0,
+  p_title_score_sum bigint default 0,
+  p_meta_score_sum bigint default 0,
+  p_at timestamptz default now()
+)
+returns void
+language sql
+as $$
+  insert into public.analytics_rollups as r (
+    user_id, granularity, bucket_start,
+    articles_generated, seo_reports, seo_score_sum, title_score_sum, meta_score_sum
+  )
+  select
+    p_user_id, g.granularity, date_trunc(g.granularity, p_at at time zone 'utc')::date,
+    p_articles, p_reports, p_seo_score_sum, p_title_score_sum, p_meta_score_sum
+  from (values ('day'), ('week')) as g (granularity)
+  on conflict (user_id, granularity, bucket_start) do update set
+    articles_generated = r.articles_generated + excluded.articles_generated,
+    seo_reports = r.seo_reports + excluded.seo_reports,
+    seo_score_sum = r.seo_score_sum + excluded.seo_score_sum,
+    title_score_sum = r.title_score_sum + excluded.title_score_sum,
+    meta_score_sum = r.meta_score_sum + excluded.meta_score_sum;
+$$;
+
+create or replace function public.backfill_analytics_rollups(p_user_id uuid default null)
+returns integer
+language plpgsql
+as $$
+declare
+  written integer;
+begin
+  delete from public.analytics_rollups where p_user_id is null or user_id = p_user_id;
+
+  insert into public.analytics_rollups (
+    user_id, granularity, bucket_start,
+    articles_generated, seo_reports, seo_score_sum, title_score_sum, meta_score_sum
+  )
+  select
+    e.user_id, g.granularity, date_trunc(g.granularity, e.created_at at time zone 'utc')::date,
+    sum(e.is_article), sum(e.is_report), sum(e.seo_score), sum(e.title_score), sum(e.meta_score)
+  from (
+    select a.user_id, a.created_at, 1 as is_article, 0 as is_report,
+           0 as seo_score, 0 as title_score, 0 as meta_score
+    from public.articles a
+    where p_user_id is null or a.user_id = p_user_id
+    union all
+    select s.user_id, s.created_at, 0, 1,
+           coalesce(s.seo_score, 0), coalesce(s.title_score, 0), coalesce(s.meta_score, 0)
+    from public.seo_reports s
+    where p_user_id is null or s.user_id = p_user_id
+  ) e
+  cross join (values ('day'), ('week')) as g (granularity)
+  group by 1, 2, 3;
+
+  get diagnostics written = row_count;
+  return written;
+end;
+$$;
@@ -0,0 +1,7 @@
+-- Support keyset pagination of GET /articles/ and GET /seo/reports/me.
+
+create index if not exists articles_user_created_id_idx
+  on public.articles (user_id, created_at desc, id desc);
+
+create index if not exists seo_reports_user_created_id_idx
+  on public.seo_reports (user_id, created_at desc, id desc);
@@ -0,0 +1,13 @@
+-- GET /keywords/suggest upserts on (query, suggestion) instead of inserting duplicates.
+
+-- Keep only the newest row of each existing duplicate group
+delete from public.keyword_research k
+using (
+  select ctid,
+         row_number() over (partition by query, suggestion order by created_at desc) as rn
+  from public.keyword_research
+) d
+where k.ctid = d.ctid and d.rn > 1;
+
+create unique index if not exists keyword_research_query_suggestion_key
+  on public.keyword_research (query, suggestion);
@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from conftest import api_client, auth_headers
+from app.core import groq_client
+from app.core.groq_scheduler import GroqScheduler
+from app.services import ai_service
+from app.utils.generation_cache import GenerationCache, MemoryBackend
+
+
+def sse(words: list, done: bool) -> bytes:
+    events = [f"data: {json.dumps({'choices': [{'index': 0, 'delta': {'content': w}}]})}\n\n" for w in words]
+    if done:
+        events.append("data: [DONE]\n\n")
+    return "".join(events).encode()
+
+
+@pytest.fixture
+def groq(monkeypatch):
+    """Answers every streamed completion with `groq.body`; counts the calls."""
+    state = type("Groq", (), {"body": b"", "calls": 0})()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state.calls += 1
+        return httpx.Response(200, content=state.body, headers={"content-type": "text/event-stream"})
+
+    cache = GenerationCache(MemoryBackend(10), ttl=60)
+    monkeypatch.setattr(ai_service, "generation_cache", cache)
+    monkeypatch.setattr(ai_service, "groq_scheduler", GroqScheduler(0, 0))
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://groq/openai/v1")
+    asyncio.run(groq_client.set_groq_client(client))
+    yield state
+    asyncio.run(groq_client.set_groq_client(None))
+
+
+async def collect() -> str:
+    return "".join([c async for c in ai_service.stream_chat_completion("system", "Write about coffee.")])
+
+
+def test_completed_stream_is_cached(groq):
+    groq.body = sse(["Fresh ", "coffee."], done=True)
+
+    assert asyncio.run(collect()) == "Fresh coffee."
+    assert asyncio.run(collect()) == "Fresh coffee."
+    assert groq.calls == 1
+
+
+def test_stream_cut_off_before_done_raises_and_is_not_cached(groq):
+    groq.body = sse(["Fresh ", "cof"], done=False)
+    with pytest.raises(ai_service.GroqStreamIncomplete):
+        asyncio.run(collect())
+
+    groq.body = sse(["Fresh ", "coffee."], done=True)
+    assert asyncio.run(collect()) == "Fresh coffee."
+    assert groq.calls == 2
+
+
+def test_stream_route_saves_nothing_when_the_stream_is_cut_off(groq, postgrest):
+    groq.body = sse(["Fresh ", "cof"], done=False)
+
+    async def run():
+        async with api_client() as api:
+            return await api.post(
+                "/generate/article/stream",
+                json={"keyword": "coffee beans", "length": "short", "tone": "professional"},
+                headers=auth_headers("8c5c2f0e-7d1e-4a53-9f33-0f2b3f1b6c11")
+            )
+
+    events = [block.split("\n")[0] for block in asyncio.run(run()).text.strip().split("\n\n")]
+
+    assert events[-1] == "event: error"
+    assert "event: done" not in events
+    assert postgrest.tables["articles"] == []
@@ -0,0 +1,228 @@
+import asyncio
+import time
+
+import bcrypt
+import jwt
+import pytest
+
+from conftest import api_client, auth_headers
+from app.config import settings
+from app.core import security
+from app.services import auth_service
+from app.services.email_outbox import EmailOutbox, OutboxFullError
+from app.utils import validators
+from app.utils.password_hasher import PasswordHasherBusy, password_hasher
+
+EMAIL = "reader@example.com"
+
+
+@pytest.fixture
+def fast_hashes(monkeypatch):
+    monkeypatch.setattr(password_hasher, "rounds", 4)
+
+
+@pytest.fixture
+def user(postgrest, fast_hashes):
+    old_hash = bcrypt.hashpw(b"old password", bcrypt.gensalt(4)).decode()
+    postgrest.tables["users"].append({"id": "u1", "email": EMAIL, "password": old_hash, "is_verified": True})
+    validators.store_code(EMAIL, "123456")
+    validators.rate_limit.pop(EMAIL, None)  # as if the code went out over a minute ago
+    yield postgrest.tables["users"][0]
+    validators.verification_codes.pop(EMAIL, None)
+    validators.rate_limit.pop(EMAIL, None)
+
+
+def reset(password: str = "new password"):
+    async def run():
+        async with api_client() as api:
+            return await api.post("/auth/reset-password",
+                                  json={"email": EMAIL, "code": "123456", "new_password": password})
+    return asyncio.run(run())
+
+
+def test_reset_rejected_by_admission_control_keeps_the_code(user, monkeypatch):
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    response = reset()
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert validators.check_code(EMAIL, "123456")
+
+    monkeypatch.setattr(password_hasher, "max_pending", 4)
+    assert reset().status_code == 200
+    assert bcrypt.checkpw(b"new password", user["password"].encode())
+    assert not validators.check_code(EMAIL, "123456")
+
+
+def test_reset_keeps_the_code_when_the_hasher_fills_up_mid_request(user, monkeypatch):
+    async def busy(password):
+        raise PasswordHasherBusy()
+
+    monkeypatch.setattr(password_hasher, "hash", busy)
+
+    assert reset().status_code == 503
+    assert validators.check_code(EMAIL, "123456")
+    assert bcrypt.checkpw(b"old password", user["password"].encode())
+
+
+def test_reset_with_a_wrong_code_does_not_hash(user, monkeypatch):
+    async def fail(password):
+        raise AssertionError("hashed before the code was checked")
+
+    monkeypatch.setattr(password_hasher, "hash", fail)
+
+    async def run():
+        async with api_client() as api:
+            return await api.post("/auth/reset-password",
+                                  json={"email": EMAIL, "code": "000000", "new_password": "x"})
+
+    assert asyncio.run(run()).status_code == 400
+    assert validators.check_code(EMAIL, "123456")
+
+
+@pytest.fixture
+def full_outbox(monkeypatch):
+    """An outbox whose single slot is taken and whose worker never starts."""
+    box = EmailOutbox("smtp.invalid", 25, None, None, "noreply@example.com", max_queued=1)
+    box._queue.put_nowait(("someone@example.com", "queued", 0))
+    monkeypatch.setattr(auth_service, "outbox", box)
+    return box
+
+
+def register():
+    async def run():
+        async with api_client() as api:
+            return await api.post("/auth/register", json={"email": EMAIL, "password": "a password"})
+    return asyncio.run(run())
+
+
+def test_register_with_a_full_outbox_creates_no_account(postgrest, fast_hashes, full_outbox):
+    response = register()
+
+    assert response.status_code == 503
+    assert postgrest.tables["users"] == []
+
+    full_outbox._queue.get_nowait()
+    full_outbox.start = lambda: None
+    assert register().status_code == 200
+    assert [u["email"] for u in postgrest.tables["users"]] == [EMAIL]
+
+
+def test_register_keeps_the_account_when_the_outbox_fills_up_mid_request(postgrest, fast_hashes, monkeypatch):
+    def full(to_email, subject, body):
+        raise OutboxFullError("Email service is busy, please try again shortly")
+
+    monkeypatch.setattr(auth_service.outbox, "send", full)
+
+    assert register().status_code == 200
+    assert [u["email"] for u in postgrest.tables["users"]] == [EMAIL]
+    # The code was never sent, so asking for a new one isn't held back by the cooldown
+    assert validators.rate_limit_check(EMAIL)
+    validators.verification_codes.pop(EMAIL, None)
+
+
+def post(path: str, body: dict):
+    async def run():
+        async with api_client() as api:
+            return await api.post(path, json=body)
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("path", ["/auth/resend-code", "/auth/password-reset-request"])
+def test_code_request_with_a_full_outbox_keeps_the_old_code_and_no_cooldown(user, full_outbox, path):
+    assert post(path, {"email": EMAIL}).status_code == 503
+    assert validators.check_code(EMAIL, "123456")
+    assert validators.rate_limit_check(EMAIL)
+
+    full_outbox._queue.get_nowait()
+    full_outbox.start = lambda: None
+    assert post(path, {"email": EMAIL}).status_code == 200
+    assert not validators.check_code(EMAIL, "123456")
+    assert full_outbox._queue.qsize() == 1
+
+
+@pytest.mark.parametrize("path", ["/auth/resend-code", "/auth/password-reset-request"])
+def test_code_request_lifts_the_cooldown_when_the_outbox_fills_up_mid_request(user, monkeypatch, path):
+    def full(to_email, subject, body):
+        raise OutboxFullError("Email service is busy, please try again shortly")
+
+    monkeypatch.setattr(auth_service.outbox, "send", full)
+
+    assert post(path, {"email": EMAIL}).status_code == 503
+    # A retry is a 503 again while the outbox is full, never a 429 for a code that was never sent
+    assert post(path, {"email": EMAIL}).status_code == 503
+    assert validators.check_code(EMAIL, "123456")
+    assert validators.rate_limit_check(EMAIL)
+
+
+def cached_user() -> dict:
+    """What the authenticated routes see for EMAIL; fills the user cache on first use."""
+    return asyncio.run(security.get_current_user({"email": EMAIL, "exp": time.time() + 300}))
+
+
+def user_lookups(postgrest) -> int:
+    return sum(1 for r in postgrest.requests if r.method == "GET" and r.url.path.endswith("/users"))
+
+
+@pytest.fixture
+def user_cache():
+    yield
+    security.invalidate_user(EMAIL)
+
+
+def test_user_row_is_cached_until_invalidated(user, user_cache):
+    cached_user()
+    user["password"] = "changed"
+
+    assert cached_user()["password"] != "changed"
+    security.invalidate_user(EMAIL)
+    assert cached_user()["password"] == "changed"
+
+
+def test_verify_drops_the_cached_user(user, user_cache):
+    user["is_verified"] = False
+    assert cached_user()["is_verified"] is False
+
+    assert post("/auth/verify", {"email": EMAIL, "code": "123456"}).status_code == 200
+    assert cached_user()["is_verified"] is True
+
+
+def test_password_reset_drops_the_cached_user(user, user_cache):
+    cached_user()
+
+    assert reset().status_code == 200
+    assert bcrypt.checkpw(b"new password", cached_user()["password"].encode())
+
+
+def test_rehash_on_login_drops_the_cached_user(user, user_cache, monkeypatch):
+    old_hash = cached_user()["password"]
+    monkeypatch.setattr(password_hasher, "rounds", 5)
+
+    assert post("/auth/login", {"email": EMAIL, "password": "old password"}).status_code == 200
+    new_hash = cached_user()["password"]
+    assert new_hash != old_hash
+    assert new_hash.startswith("$2b$05$")
+
+
+def test_token_with_uid_skips_the_user_lookup(postgrest):
+    async def run():
+        async with api_client() as api:
+            return await api.get("/articles/", headers=auth_headers("u1", EMAIL))
+
+    assert asyncio.run(run()).status_code == 200
+    assert user_lookups(postgrest) == 0
+    assert postgrest.requests  # the articles query itself
+
+
+def test_token_without_uid_looks_the_user_up_once(postgrest, user, user_cache):
+    token = jwt.encode({"email": EMAIL, "exp": time.time() + 300}, settings.JWT_SECRET, algorithm="HS256")
+
+    async def run():
+        async with api_client() as api:
+            for _ in range(2):
+                response = await api.get("/articles/", headers={"Authorization": f"Bearer {token}"})
+                assert response.status_code == 200
+
+    asyncio.run(run())
+    assert user_lookups(postgrest) == 1
@@ -0,0 +1,213 @@
+import asyncio
+import sqlite3
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import batch_job_service
+from app.services.batch_job_service import BatchJobRunner
+from app.utils.job_store import JobStore
+
+ITEM = {"keyword": "coffee beans", "length": "short", "tone": "professional"}
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    """Stands in for generation and saving; `script` lists what each call does, in order."""
+    state = SimpleNamespace(script=[], calls=0, keywords=[], save_delay=0, saved={})
+
+    async def generate(keyword, tone, length, template_id, fresh, priority):
+        step = state.script[min(state.calls, len(state.script) - 1)]
+        state.calls += 1
+        state.keywords.append(keyword)
+        if isinstance(step, Exception):
+            raise step
+        await asyncio.sleep(step)
+        return "article"
+
+    async def save(user_id, article, article_id=None):
+        # Committed straight away; the delay is the response being slow to come back
+        state.saved.setdefault(article_id, []).append(article.keyword)
+        await asyncio.sleep(state.save_delay)
+        return SimpleNamespace(id=article_id)
+
+    async def exists(user_id, article_id):
+        return article_id in state.saved
+
+    monkeypatch.setattr(batch_job_service, "generate_article_from_template", generate)
+    monkeypatch.setattr(batch_job_service.article_service, "save_article", save)
+    monkeypatch.setattr(batch_job_service.article_service, "article_exists", exists)
+    return state
+
+
+def make_runner(tmp_path, **options) -> BatchJobRunner:
+    return BatchJobRunner(JobStore(str(tmp_path / "jobs.sqlite3")), workers=1, lease=30,
+                          poll_interval=0.01, **{"item_timeout": 1, "max_attempts": 3, **options})
+
+
+async def wait_for_job(runner: BatchJobRunner, job_id: str) -> dict:
+    for _ in range(500):
+        job = await runner.get_job(job_id)
+        if job["status"] == "completed":
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job never finished: {job}")
+
+
+def run_job(tmp_path, items=(ITEM,), **options) -> dict:
+    runner = make_runner(tmp_path, **options)
+
+    async def run():
+        runner.start()
+        try:
+            return await wait_for_job(runner, await runner.submit("u1", list(items)))
+        finally:
+            await runner.stop()
+
+    return asyncio.run(run())
+
+
+def test_failed_items_are_retried_until_they_succeed(tmp_path, generator):
+    generator.script = [RuntimeError("Groq is down"), RuntimeError("Groq is down"), 0]
+
+    job = run_job(tmp_path)
+
+    assert job["counts"]["done"] == 1
+    assert job["items"][0]["attempts"] == 3
+    assert job["items"][0]["article_id"] in generator.saved
+
+
+def test_items_fail_after_max_attempts(tmp_path, generator):
+    generator.script = [RuntimeError("Groq is down")]
+
+    job = run_job(tmp_path, max_attempts=2)
+
+    assert job["counts"]["failed"] == 1
+    assert job["items"][0]["attempts"] == 2
+    assert job["items"][0]["error"] == "Groq is down"
+    assert generator.calls == 2
+
+
+def test_item_timeout_covers_saving_too(tmp_path, generator):
+    generator.script = [0.05]
+    generator.save_delay = 0.2
+
+    job = run_job(tmp_path, item_timeout=0.15, max_attempts=1)
+
+    assert job["items"][0]["error"] == "Timed out after 0.15s"
+
+
+def test_items_past_the_job_deadline_are_failed_without_retrying(tmp_path, generator):
+    generator.script = [0.3]
+
+    started = time.monotonic()
+    job = run_job(tmp_path, items=[ITEM, ITEM], item_timeout=5, deadline=0.1)
+
+    # The first item is cut short by the deadline; the second never starts
+    assert time.monotonic() - started < 2
+    assert job["counts"]["failed"] == 2
+    assert job["items"][0]["error"] == "Batch deadline passed before this item finished"
+    assert job["items"][1]["error"] == "Batch deadline passed before this item finished"
+    assert generator.calls == 1
+
+
+def test_timeout_after_the_save_landed_does_not_save_a_second_copy(tmp_path, generator):
+    generator.script = [0]
+    generator.save_delay = 0.2
+
+    job = run_job(tmp_path, item_timeout=0.1)
+
+    assert job["counts"]["done"] == 1
+    assert job["items"][0]["attempts"] == 2
+    assert list(generator.saved.values()) == [["coffee beans"]]
+    assert job["items"][0]["article_id"] in generator.saved
+    assert generator.calls == 1
+
+
+def test_worker_survives_job_store_errors(tmp_path, generator, monkeypatch):
+    generator.script = [0]
+    runner = make_runner(tmp_path)
+    claim, failures = runner.store.claim, []
+
+    def flaky_claim(owner, lease):
+        if len(failures) < 2:
+            failures.append(owner)
+            raise sqlite3.OperationalError("database is locked")
+        return claim(owner, lease)
+
+    monkeypatch.setattr(runner.store, "claim", flaky_claim)
+
+    async def run():
+        runner.start()
+        try:
+            return await wait_for_job(runner, await runner.submit("u1", [ITEM]))
+        finally:
+            await runner.stop()
+
+    assert asyncio.run(run())["counts"]["done"] == 1
+    assert len(failures) == 2
+
+
+def items(n: int) -> list:
+    return [{**ITEM, "keyword": f"keyword {i}"} for i in range(n)]
+
+
+def test_restart_after_a_crash_resumes_unfinished_items_only(tmp_path, generator):
+    generator.script = [0]
+    # A previous process finished item 0, died holding the lease on item 1, never reached item 2
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create_job("u1", batch_job_service.BATCH_JOB, items(3), {"fresh": False})
+    first = store.claim("crashed-process", lease=30)
+    store.finish(job_id, first["index"], "crashed-process", {"article_id": "from-before"})
+    store.claim("crashed-process", lease=0.05)
+
+    runner = make_runner(tmp_path)
+
+    async def run():
+        runner.start()
+        try:
+            return await wait_for_job(runner, job_id)
+        finally:
+            await runner.stop()
+
+    job = asyncio.run(run())
+
+    assert job["counts"]["done"] == 3
+    assert sorted(generator.keywords) == ["keyword 1", "keyword 2"]
+    assert job["items"][0]["article_id"] == "from-before" and job["items"][0]["attempts"] == 1
+    # Reclaimed once the dead process's lease ran out
+    assert job["items"][1]["attempts"] == 2
+
+
+def test_graceful_restart_hands_in_flight_items_to_the_next_process(tmp_path, generator):
+    generator.script = [5]
+    old = make_runner(tmp_path)
+
+    async def interrupted():
+        old.start()
+        job_id = await old.submit("u1", items(1))
+        while (await old.get_job(job_id))["counts"]["running"] == 0:
+            await asyncio.sleep(0.01)
+        await old.stop()
+        return job_id
+
+    job_id = asyncio.run(interrupted())
+    job = old.store.get_job(job_id)
+    assert job["counts"]["pending"] == 1 and job["items"][0]["attempts"] == 0
+
+    generator.script = [0]
+    new = make_runner(tmp_path)
+
+    async def resumed():
+        new.start()
+        try:
+            return await wait_for_job(new, job_id)
+        finally:
+            await new.stop()
+
+    job = asyncio.run(resumed())
+
+    assert job["counts"]["done"] == 1
+    assert job["items"][0]["attempts"] == 1
+    assert list(generator.saved.values()) == [["keyword 0"]]
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.utils.cache import TTLCache, cached
+
+
+def test_waiting_callers_share_the_leaders_result():
+    calls = []
+
+    @cached(cache=TTLCache())
+    async def lookup(query):
+        calls.append(query)
+        await asyncio.sleep(0.02)
+        return query.upper()
+
+    async def run():
+        return await asyncio.gather(*(lookup("coffee") for _ in range(5)))
+
+    assert asyncio.run(run()) == ["COFFEE"] * 5
+    assert calls == ["coffee"]
+
+
+def test_cancelled_leader_hands_over_to_a_waiting_caller():
+    calls = []
+
+    @cached(cache=TTLCache())
+    async def lookup(query):
+        calls.append(query)
+        await asyncio.sleep(0.05)
+        return query.upper()
+
+    async def run():
+        leader = asyncio.create_task(lookup("coffee"))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(lookup("coffee")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    assert asyncio.run(run()) == ["COFFEE"] * 3
+    # One follower recomputed; the others waited for it rather than each starting their own
+    assert calls == ["coffee", "coffee"]
+
+
+def test_cancelled_follower_leaves_the_leader_running():
+    @cached(cache=TTLCache())
+    async def lookup(query):
+        await asyncio.sleep(0.03)
+        return query.upper()
+
+    async def run():
+        leader = asyncio.create_task(lookup("coffee"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(lookup("coffee"))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader
+
+    assert asyncio.run(run()) == "COFFEE"
+
+
+def test_leader_errors_reach_the_waiting_callers():
+    @cached(cache=TTLCache())
+    async def lookup(query):
+        await asyncio.sleep(0.01)
+        raise ValueError(query)
+
+    async def run():
+        return await asyncio.gather(*(lookup("coffee") for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in asyncio.run(run()))
@@ -0,0 +1,100 @@
+import os
+import time
+
+import pytest
+
+from app.utils import export_cache as export_cache_module
+from app.utils.export_cache import TEMP_SUFFIX, ExportCache
+from app.utils.metrics import export_cache_events, render_metrics
+
+
+def events() -> dict:
+    return {event: export_cache_events._values.get((event,), 0) for event in ("hit", "miss", "eviction")}
+
+
+def age(cache: ExportCache, name: str, seconds_ago: float):
+    path = os.path.join(cache.directory, name)
+    then = time.time() - seconds_ago
+    os.utime(path, (then, then))
+
+
+def test_put_evicts_least_recently_used_files_past_max_bytes(tmp_path):
+    cache = ExportCache(str(tmp_path), max_bytes=30)
+    for name, seconds_ago in (("a.pdf", 300), ("b.pdf", 200), ("c.pdf", 100)):
+        cache.put(name, b"x" * 10)
+        age(cache, name, seconds_ago)
+    before = events()
+
+    assert cache.get("a.pdf") == b"x" * 10  # now the most recently used
+    cache.put("d.pdf", b"y" * 10)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.pdf", "c.pdf", "d.pdf"]
+    assert cache.get("b.pdf") is None
+    assert events() == {"hit": before["hit"] + 1, "miss": before["miss"] + 1, "eviction": before["eviction"] + 1}
+
+
+def test_a_single_export_larger_than_max_bytes_is_not_kept(tmp_path):
+    cache = ExportCache(str(tmp_path), max_bytes=5)
+
+    cache.put("big.pdf", b"x" * 10)
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_put_writes_a_temp_file_then_renames_it(tmp_path, monkeypatch):
+    cache = ExportCache(str(tmp_path), max_bytes=1024)
+    cache.put("report.pdf", b"old")
+    replaced = []
+    real_replace = os.replace
+
+    def replace(src, dst):
+        # The reader-visible file still holds the old export until the rename
+        assert src.endswith(TEMP_SUFFIX) and os.path.dirname(src) == str(tmp_path)
+        with open(src, "rb") as f:
+            assert f.read() == b"new"
+        assert cache.get("report.pdf") == b"old"
+        replaced.append(dst)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(export_cache_module.os, "replace", replace)
+    cache.put("report.pdf", b"new")
+
+    assert replaced == [os.path.join(str(tmp_path), "report.pdf")]
+    assert cache.get("report.pdf") == b"new"
+    assert os.listdir(tmp_path) == ["report.pdf"]
+
+
+def test_failed_put_removes_its_temp_file_and_keeps_the_old_export(tmp_path, monkeypatch):
+    cache = ExportCache(str(tmp_path), max_bytes=1024)
+    cache.put("report.pdf", b"old")
+
+    def replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(export_cache_module.os, "replace", replace)
+    with pytest.raises(OSError):
+        cache.put("report.pdf", b"new")
+
+    assert os.listdir(tmp_path) == ["report.pdf"]
+    assert cache.get("report.pdf") == b"old"
+
+
+def test_evict_removes_abandoned_temp_files_only(tmp_path):
+    cache = ExportCache(str(tmp_path), max_bytes=1024, temp_max_age=60)
+    for name in ("abandoned" + TEMP_SUFFIX, "in-progress" + TEMP_SUFFIX):
+        (tmp_path / name).write_bytes(b"partial")
+    age(cache, "abandoned" + TEMP_SUFFIX, 120)
+
+    cache.put("report.pdf", b"data")
+
+    assert sorted(os.listdir(tmp_path)) == ["in-progress" + TEMP_SUFFIX, "report.pdf"]
+
+
+def test_counters_are_exported_on_metrics(tmp_path):
+    cache = ExportCache(str(tmp_path), max_bytes=1024)
+    cache.get("missing.pdf")
+
+    text = render_metrics()
+
+    assert "# TYPE export_cache_events_total counter" in text
+    assert f'export_cache_events_total{{event="miss"}} {events()["miss"]:g}' in text
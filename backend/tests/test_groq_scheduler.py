@@ -0,0 +1,200 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from benchmarks import fake_groq
+from conftest import api_client, auth_headers
+from app.core import groq_client
+from app.core.groq_scheduler import BATCH, INTERACTIVE, GroqScheduler, estimate_tokens
+from app.services import ai_service
+
+PAYLOAD = ai_service.build_payload("system", "Write about coffee.")
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    """The fake Groq app with fresh limits; call it with the limits a test needs."""
+    monkeypatch.setattr(fake_groq, "LATENCY", 0.0)
+
+    def configure(rpm: float, tpm: float, window: float):
+        monkeypatch.setattr(fake_groq, "limits", fake_groq.Limits(rpm, tpm, window))
+        return fake_groq.limits
+
+    return configure
+
+
+def fake_client(sent: list = None) -> httpx.AsyncClient:
+    """A client wired to the fake in-process; `sent` collects (time, prompt) per request."""
+    async def record(request: httpx.Request):
+        if sent is not None:
+            sent.append((time.monotonic(), json.loads(request.content)["messages"][-1]["content"]))
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=fake_groq.app),
+        base_url="http://fake-groq/openai/v1",
+        event_hooks={"request": [record]}
+    )
+
+
+async def send(scheduler: GroqScheduler, client: httpx.AsyncClient, prompt: str = "Write about coffee.",
+               priority: int = INTERACTIVE) -> httpx.Response:
+    payload = ai_service.build_payload("system", prompt)
+    response, _ = await scheduler.send(
+        client,
+        lambda: client.build_request("POST", "/chat/completions", json=payload),
+        tokens=estimate_tokens(payload),
+        priority=priority
+    )
+    return response
+
+
+def test_retry_after_pauses_then_retries(fake):
+    # One request per second; the scheduler itself has no budget and learns the limit from the 429
+    limits = fake(rpm=60, tpm=10_000_000, window=1)
+    scheduler = GroqScheduler(0, 0, max_retries=3, backoff_base=0.01)
+    sent = []
+
+    async def run():
+        async with fake_client(sent) as client:
+            return await asyncio.gather(send(scheduler, client, "a"), send(scheduler, client, "b"))
+
+    responses = asyncio.run(run())
+
+    assert [r.status_code for r in responses] == [200, 200]
+    assert scheduler.throttled == 1 and scheduler.retries == 1
+    assert limits.rejected == 1
+    # The retry waited out Retry-After (~1s) instead of hammering the API
+    retried = [t for t, prompt in sent if prompt == sent[-1][1]]
+    assert len(retried) == 2
+    assert retried[1] - retried[0] >= 0.9
+
+
+def test_budgets_keep_requests_and_tokens_under_the_limits(fake):
+    rpm, tpm, window = 600, 30_000, 1  # 10 requests and 500 tokens per second
+    limits = fake(rpm, tpm, window)
+    # max_tokens is the bulk of each reservation; keep it close to what the fake charges
+    payload_tokens = estimate_tokens({**PAYLOAD, "max_tokens": 200})
+    scheduler = GroqScheduler(rpm, tpm, max_retries=0, window=window)
+
+    async def call(client):
+        payload = {**PAYLOAD, "max_tokens": 200}
+        response, _ = await scheduler.send(
+            client, lambda: client.build_request("POST", "/chat/completions", json=payload), tokens=payload_tokens
+        )
+        return response
+
+    async def run():
+        async with fake_client() as client:
+            return await asyncio.gather(*(call(client) for _ in range(12)))
+
+    started = time.monotonic()
+    responses = asyncio.run(run())
+    elapsed = time.monotonic() - started
+
+    assert all(r.status_code == 200 for r in responses)
+    assert limits.rejected == 0 and scheduler.throttled == 0
+    assert limits.served == 12
+    # 12 calls at ~155 tokens each need ~1860 tokens: the 500-token burst plus ~2.7s of refill
+    assert elapsed >= 2
+
+
+def test_interactive_calls_jump_ahead_of_queued_batch_work(fake):
+    fake(rpm=10_000, tpm=10_000_000, window=1)
+    scheduler = GroqScheduler(requests_per_minute=120, tokens_per_minute=0, window=0.5)  # 1 request, then 2/s
+    sent = []
+
+    async def run():
+        async with fake_client(sent) as client:
+            batch = [asyncio.create_task(send(scheduler, client, f"batch {i}", BATCH)) for i in range(4)]
+            await asyncio.sleep(0.05)  # batch work is already queued when the interactive calls arrive
+            interactive = [asyncio.create_task(send(scheduler, client, f"interactive {i}")) for i in range(2)]
+            await asyncio.gather(*batch, *interactive)
+
+    asyncio.run(run())
+
+    order = [prompt for _, prompt in sent]
+    assert order == ["batch 0", "interactive 0", "interactive 1", "batch 1", "batch 2", "batch 3"]
+
+
+def test_reserved_tokens_are_reconciled_with_reported_usage(fake, monkeypatch):
+    fake(rpm=10_000, tpm=10_000_000, window=1)
+    # A large budget that barely refills, so what's left is exactly capacity minus usage
+    scheduler = GroqScheduler(0, tokens_per_minute=6, window=100_000)
+    capacity = scheduler.tokens.capacity
+    usage = fake_groq.usage_for(PAYLOAD)["total_tokens"]
+    assert estimate_tokens(PAYLOAD) > usage
+
+    async def run():
+        async with fake_client() as client:
+            response = await send(scheduler, client)
+            assert response.status_code == 200
+            after_plain = scheduler.tokens.available
+
+            # The streamed path reads usage from the final chunk's x_groq field
+            monkeypatch.setattr(ai_service, "groq_scheduler", scheduler)
+            await groq_client.set_groq_client(client)
+            try:
+                chunks = [c async for c in ai_service.stream_chat_completion("system", "Write about coffee.",
+                                                                             fresh=True)]
+            finally:
+                await groq_client.set_groq_client(None)
+            return after_plain, chunks
+
+    after_plain, chunks = asyncio.run(run())
+
+    assert after_plain == pytest.approx(capacity - usage, abs=1)
+    assert chunks
+    assert scheduler.tokens.available == pytest.approx(capacity - 2 * usage, abs=1)
+
+
+def test_rate_limit_after_retries_becomes_503(fake, monkeypatch):
+    # One request per 100s, already used up: every attempt is answered 429 with Retry-After ~100
+    limits = fake(rpm=0.6, tpm=10_000_000, window=100)
+    limits.requests.level = 0
+    scheduler = GroqScheduler(0, 0, max_retries=2)
+    monkeypatch.setattr(ai_service, "groq_scheduler", scheduler)
+    # Don't actually wait 100s between the scheduler's attempts
+    monkeypatch.setattr("app.core.groq_scheduler.retry_after_seconds", lambda response: 0.01)
+
+    async def run():
+        await groq_client.set_groq_client(fake_client())
+        try:
+            async with api_client() as api:
+                return await api.post(
+                    "/generate/article?fresh=true",
+                    json={"keyword": "coffee beans", "length": "short", "tone": "professional"},
+                    headers=auth_headers("8c5c2f0e-7d1e-4a53-9f33-0f2b3f1b6c11")
+                )
+        finally:
+            await groq_client.close_groq_client()
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) >= 90  # Groq's Retry-After is passed on to the caller
+    assert scheduler.throttled == 3 and limits.rejected == 3
+
+
+def test_cancelled_send_gives_its_reservation_back():
+    # A large budget that barely refills, so any leaked reservation would show
+    scheduler = GroqScheduler(0, tokens_per_minute=6, window=100_000)
+    capacity = scheduler.tokens.capacity
+
+    async def hang(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(60)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(hang), base_url="http://groq") as client:
+            task = asyncio.create_task(send(scheduler, client))
+            await asyncio.sleep(0.05)
+            reserved_meanwhile = capacity - scheduler.tokens.available
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return reserved_meanwhile
+
+    assert asyncio.run(run()) == estimate_tokens(PAYLOAD)
+    assert scheduler.tokens.available == pytest.approx(capacity, abs=1)
@@ -0,0 +1,108 @@
+import asyncio
+import json
+from collections import Counter
+
+import httpx
+import pytest
+
+from benchmarks import fake_suggest
+from app.services import keyword_service, scraping_service
+from app.utils.cache import default_cache
+from app.utils.rate_limiter import HostRateLimiter
+
+SEED = "coffee beans"
+
+
+class Tracking:
+    """ASGI wrapper around the fake that records queries and the peak number in flight."""
+
+    def __init__(self, app):
+        self.app = app
+        self.queries = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        self.queries.append(httpx.QueryParams(scope["query_string"].decode()).get("q"))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def suggest(monkeypatch):
+    monkeypatch.setattr(fake_suggest, "LATENCY", 0.02)
+    tracking = Tracking(fake_suggest.app)
+    monkeypatch.setattr(scraping_service, "_client", httpx.AsyncClient(transport=httpx.ASGITransport(app=tracking)))
+    monkeypatch.setattr(scraping_service, "_limiter", HostRateLimiter(0))
+    monkeypatch.setattr(scraping_service.settings, "SUGGEST_API_URL", "http://fake-suggest/complete/search")
+    default_cache.clear()
+    yield tracking
+    default_cache.clear()
+
+
+def expected_ranking(seed: str) -> list[tuple]:
+    """(suggestion, frequency) in rank order, worked out from the fake's deterministic answers."""
+    queries = [seed] + [f"{seed} {suffix}" for suffix in keyword_service.EXPANSION_SUFFIXES]
+    frequency, best_position = Counter(), {}
+    for query in queries:
+        for position, suggestion in enumerate(fake_suggest.suggestions_for(query)):
+            if suggestion == seed:
+                continue
+            frequency[suggestion] += 1
+            best_position[suggestion] = min(best_position.get(suggestion, position), position)
+    ranked = sorted(frequency, key=lambda s: (-frequency[s], best_position[s], s))
+    return [(s, frequency[s]) for s in ranked]
+
+
+def test_seed_and_all_36_variants_are_requested(suggest, postgrest):
+    result = asyncio.run(keyword_service.expand_keywords(SEED, concurrency=8))
+
+    variants = {f"{SEED} {c}" for c in "abcdefghijklmnopqrstuvwxyz0123456789"}
+    assert len(variants) == 36
+    assert sorted(suggest.queries) == sorted(variants | {SEED})
+    assert [b["query"] for b in result["branches"]] == [SEED] + [f"{SEED} {c}" for c in keyword_service.EXPANSION_SUFFIXES]
+    assert result["failed"] == []
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_lookups_stay_within_the_concurrency_limit(suggest, postgrest, concurrency):
+    asyncio.run(keyword_service.expand_keywords(SEED, concurrency=concurrency))
+    assert suggest.peak == concurrency
+
+
+def test_default_concurrency_comes_from_settings(suggest, postgrest, monkeypatch):
+    monkeypatch.setattr(keyword_service.settings, "EXPAND_CONCURRENCY", 3)
+    asyncio.run(keyword_service.expand_keywords(SEED))
+    assert suggest.peak == 3
+
+
+def test_suggestions_are_deduplicated_and_ranked(suggest, postgrest):
+    result = asyncio.run(keyword_service.expand_keywords(SEED))
+
+    keywords = [(k["suggestion"], k["frequency"]) for k in result["keywords"]]
+    suggestions = [s for s, _ in keywords]
+    assert len(suggestions) == len(set(suggestions))
+    assert SEED not in suggestions
+    # Neighbouring branches share suggestions, so there is real merging to check
+    assert max(f for _, f in keywords) > 1
+    assert keywords == expected_ranking(SEED)
+
+
+def test_results_are_saved_with_a_single_upsert(suggest, postgrest):
+    result = asyncio.run(keyword_service.expand_keywords(SEED))
+
+    writes = [r for r in postgrest.requests if r.method != "GET"]
+    assert len(writes) == 1
+    write = writes[0]
+    assert write.method == "POST" and write.url.path == "/rest/v1/keyword_research"
+    assert write.url.params["on_conflict"] == "query,suggestion"
+    rows = json.loads(write.content)
+    assert [row["suggestion"] for row in rows] == [k["suggestion"] for k in result["keywords"]]
+    assert {row["query"] for row in rows} == {SEED}
+    assert len(postgrest.tables["keyword_research"]) == len(rows)
@@ -0,0 +1,63 @@
+import pytest
+
+from app.utils.keyword_matcher import KeywordMatcher, _cached_matcher, get_matcher, match_keywords
+from app.utils.seo_analyzer import TextStats
+
+TEXT = ("Best running shoes for trail running on weekends. Running shoes wear out, so the best running shoes "
+        "are the ones you replace. Shoes shoes shoes.")
+
+
+def tokens(text: str) -> list:
+    return text.lower().split()
+
+
+def test_multi_word_phrases_are_matched():
+    positions = match_keywords(tokens("I want the best running shoes and best running socks"), ["best running shoes"])
+    assert positions == {"best running shoes": [3]}
+
+
+def test_overlapping_and_suffix_matches_are_all_reported():
+    # "a a" overlaps itself; "b c" is a suffix of "a b c"; "c" is a suffix of both
+    positions = match_keywords(tokens("a a a b c"), ["a a", "a b c", "b c", "c"])
+    assert positions == {"a a": [0, 1], "a b c": [2], "b c": [3], "c": [4]}
+
+
+def test_failure_links_recover_a_match_that_starts_inside_a_partial_one():
+    # "running shoes" begins inside "running running" only after the automaton falls back
+    assert match_keywords(tokens("trail running running shoes"), ["running shoes", "trail running"]) == {
+        "running shoes": [2], "trail running": [0]
+    }
+
+
+def test_secondary_keywords_are_reported_alongside_the_target():
+    stats = TextStats.from_text(TEXT, "Best Running Shoes", ["trail running", "shoes", "socks"])
+
+    assert stats.keyword_hits == 2
+    report = {r["keyword"]: r for r in stats.keyword_report()}
+    assert list(report) == ["best running shoes", "trail running", "shoes", "socks"]
+    assert report["trail running"]["count"] == 1
+    assert report["socks"]["count"] == 0
+    assert report["shoes"]["density"] == pytest.approx(100 * report["shoes"]["count"] / stats.word_count)
+
+
+@pytest.mark.parametrize("keyword", ["running", "Shoes", "shoes.", "best", "missing", "  SHOES  "])
+def test_single_token_keywords_count_like_words_count(keyword):
+    words = tokens(TEXT)
+    stats = TextStats.from_text(TEXT, keyword)
+    # What keyword_density counted before the matcher, for the keyword as users type it
+    assert stats.keyword_hits == words.count(keyword.strip().lower())
+
+
+def test_single_token_fast_path_agrees_with_the_automaton():
+    words = tokens(TEXT) * 3
+    keywords = ("running", "shoes", "best")
+    fast = KeywordMatcher(keywords).scan(words)
+    automaton = KeywordMatcher(keywords + ("not in the text at all",)).scan(words)[:3]
+    assert fast == automaton
+
+
+def test_keyword_sets_share_one_automaton_whatever_the_order():
+    _cached_matcher.cache_clear()
+    first = get_matcher(("a", "b c"))
+    assert get_matcher(("B  C", "a", "a")) is first
+    assert _cached_matcher.cache_info().misses == 1
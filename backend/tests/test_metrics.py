@@ -0,0 +1,76 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.utils.metrics import MetricsMiddleware, dependency_latency, http_requests, instrument_httpx
+
+
+def count(histogram, labels: tuple) -> int:
+    series = histogram._series.get(labels)
+    return sum(series[:-1]) if series else 0
+
+
+@pytest.mark.parametrize("error, outcome", [
+    (httpx.ConnectError("refused"), "error"),
+    (httpx.ReadError("reset"), "error"),
+    (httpx.ReadTimeout("slow"), "timeout"),
+])
+def test_transport_errors_are_recorded(error, outcome):
+    def handler(request):
+        raise error
+
+    client = instrument_httpx(httpx.AsyncClient(transport=httpx.MockTransport(handler)), "flaky",
+                              lambda request: "call")
+    labels = ("flaky", "call", outcome)
+    before = count(dependency_latency, labels)
+
+    async def run():
+        async with client:
+            await client.get("http://flaky/")
+
+    with pytest.raises(type(error)):
+        asyncio.run(run())
+    assert count(dependency_latency, labels) == before + 1
+
+
+def test_responses_are_recorded_by_status_class():
+    statuses = iter([200, 503])
+    client = instrument_httpx(
+        httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(next(statuses)))), "upstream"
+    )
+    before = {o: count(dependency_latency, ("upstream", "GET /thing", o)) for o in ("ok", "5xx")}
+
+    with client:
+        client.get("http://upstream/thing")
+        client.get("http://upstream/thing")
+
+    assert count(dependency_latency, ("upstream", "GET /thing", "ok")) == before["ok"] + 1
+    assert count(dependency_latency, ("upstream", "GET /thing", "5xx")) == before["5xx"] + 1
+
+
+def test_middleware_labels_by_template_and_scans_routes_once_per_path(monkeypatch):
+    app = FastAPI()
+
+    @app.get("/widgets/{widget_id}")
+    async def widget(widget_id: str):
+        return {"id": widget_id}
+
+    app.add_middleware(MetricsMiddleware)
+    scans = []
+    match = MetricsMiddleware._match
+    monkeypatch.setattr(MetricsMiddleware, "_match", lambda self, scope: scans.append(scope["path"]) or match(self, scope))
+    labels = ("GET", "/widgets/{widget_id}", "200")
+    before = http_requests._values.get(labels, 0)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app") as client:
+            for path in ("/widgets/1", "/widgets/1", "/widgets/2", "/missing"):
+                await client.get(path)
+
+    asyncio.run(run())
+
+    assert http_requests._values[labels] == before + 3
+    assert http_requests._values[("GET", "unmatched", "404")] >= 1
+    assert scans == ["/widgets/1", "/widgets/2", "/missing"]
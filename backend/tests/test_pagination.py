@@ -0,0 +1,94 @@
+import asyncio
+import base64
+import uuid
+
+import pytest
+
+from conftest import api_client, auth_headers
+
+USER = str(uuid.uuid4())
+
+
+def seed(postgrest, table: str, rows: int, **fields):
+    for i in range(rows):
+        postgrest.tables[table].append({
+            "id": str(uuid.uuid4()), "created_at": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00",
+            "user_id": USER, **fields
+        })
+
+
+def article_rows(postgrest, rows: int):
+    seed(postgrest, "articles", rows, keyword="coffee", length="short", tone="casual", article="Body")
+
+
+def test_list_without_limit_returns_one_default_page(postgrest, monkeypatch):
+    monkeypatch.setattr("app.config.settings.LIST_PAGE_SIZE", 25)
+    article_rows(postgrest, 60)
+
+    async def run():
+        async with api_client() as api:
+            return await api.get("/articles/", headers=auth_headers(USER))
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 200
+    assert len(response.json()) == 25
+    assert response.headers["x-next-cursor"]
+    assert len(postgrest.requests) == 1
+
+
+def test_limit_pages_with_a_cursor(postgrest):
+    article_rows(postgrest, 120)
+
+    async def run():
+        seen = []
+        async with api_client() as api:
+            response = await api.get("/articles/", params={"limit": 50}, headers=auth_headers(USER))
+            while True:
+                assert response.status_code == 200
+                seen.extend(row["id"] for row in response.json())
+                cursor = response.headers.get("x-next-cursor")
+                if not cursor:
+                    return seen
+                response = await api.get("/articles/", params={"cursor": cursor}, headers=auth_headers(USER))
+
+    seen = asyncio.run(run())
+
+    assert len(seen) == len(set(seen)) == 120
+
+
+def test_reports_without_limit_page_by_list_page_size(postgrest):
+    seed(postgrest, "seo_reports", 75, keyword="coffee", seo_score=70)
+
+    async def run():
+        async with api_client() as api:
+            first = await api.get("/seo/reports/me", headers=auth_headers(USER))
+            rest = await api.get("/seo/reports/me", params={"cursor": first.headers["x-next-cursor"]},
+                                 headers=auth_headers(USER))
+            return first, rest
+
+    first, rest = asyncio.run(run())
+
+    assert [r.status_code for r in (first, rest)] == [200, 200]
+    assert len(first.json()) == 50 and len(rest.json()) == 25
+    assert "x-next-cursor" not in rest.headers
+
+
+@pytest.mark.parametrize("raw", [
+    "not a cursor",
+    '2026-01-01T00:00:00+00:00"),id.gt.(0|' + str(uuid.uuid4()),  # tries to break out of the or=() filter
+    "2026-01-01T00:00:00+00:00|1 or 1=1",
+    "yesterday|" + str(uuid.uuid4()),
+])
+def test_tampered_cursor_is_a_400(postgrest, raw):
+    cursor = base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=") if "|" in raw else raw
+
+    async def run():
+        async with api_client() as api:
+            return await asyncio.gather(*(
+                api.get(path, params={"cursor": cursor}, headers=auth_headers(USER))
+                for path in ("/articles/", "/seo/reports/me")
+            ))
+
+    assert [r.status_code for r in asyncio.run(run())] == [400, 400]
+    assert postgrest.requests == []
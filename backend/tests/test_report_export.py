@@ -0,0 +1,57 @@
+import asyncio
+import io
+import zipfile
+
+import pytest
+
+from conftest import api_client, auth_headers
+from app.services import seo_service as seo_module
+
+USER = "8c5c2f0e-7d1e-4a53-9f33-0f2b3f1b6c11"
+
+
+def report(report_id: str, title: str) -> dict:
+    return {"id": report_id, "user_id": USER, "created_at": f"2026-10-0{report_id[-1]}T00:00:00+00:00",
+            "title": title, "meta": "About beans", "content": "Beans. " * 40, "keyword": "coffee beans",
+            "seo_score": 80, "title_score": 70, "meta_score": 90}
+
+
+@pytest.fixture
+def reports(postgrest, monkeypatch):
+    async def in_thread(fn, *args):
+        return fn(*args)
+
+    # The renderers are what's under test, not the process pool
+    monkeypatch.setattr(seo_module, "run_in_process", in_thread)
+    postgrest.tables["seo_reports"].extend([
+        report("r1", "Plain title"),
+        report("r2", "Curly “quotes” — and ☕"),  # not latin-1: fpdf 1.x can't encode it
+        report("r3", "Another plain title"),
+    ])
+
+
+def export(file_format: str) -> zipfile.ZipFile:
+    async def run():
+        async with api_client() as api:
+            return await api.get("/seo/reports/export", params={"format": "zip", "file_format": file_format},
+                                 headers=auth_headers(USER))
+
+    response = asyncio.run(run())
+    assert response.status_code == 200
+    return zipfile.ZipFile(io.BytesIO(response.content))
+
+
+def test_a_report_that_fails_to_render_gets_a_placeholder_and_the_zip_completes(reports):
+    archive = export("pdf")
+
+    assert archive.testzip() is None
+    assert sorted(archive.namelist()) == ["seo_report_r1.pdf", "seo_report_r2.error.txt", "seo_report_r3.pdf"]
+    assert archive.read("seo_report_r1.pdf").startswith(b"%PDF")
+    assert b"could not be rendered as pdf" in archive.read("seo_report_r2.error.txt")
+
+
+def test_html_export_renders_every_report(reports):
+    archive = export("html")
+
+    assert sorted(archive.namelist()) == ["seo_report_r1.html", "seo_report_r2.html", "seo_report_r3.html"]
+    assert "“quotes”" in archive.read("seo_report_r2.html").decode()
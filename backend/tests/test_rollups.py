@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+from app.models.article import ArticleCreate
+from app.services import article_service, rollup_service
+
+USER = "8c5c2f0e-7d1e-4a53-9f33-0f2b3f1b6c11"
+ARTICLE = ArticleCreate(keyword="coffee beans", length="short", tone="casual", article="Body.")
+
+
+def rollups(postgrest) -> list:
+    return [json.loads(r.content) for r in postgrest.requests if r.url.path == "/rest/v1/rpc/record_analytics_rollup"]
+
+
+def test_save_returns_before_the_rollup_is_sent(postgrest):
+    async def run():
+        await article_service.save_article(USER, ARTICLE)
+        sent_during_request = len(rollups(postgrest))
+        await rollup_service.drain()
+        return sent_during_request
+
+    assert asyncio.run(run()) == 0
+    assert rollups(postgrest) == [{"p_user_id": USER, "p_articles": 1}]
+    assert not rollup_service._pending
+
+
+def test_delete_takes_the_article_out_of_its_creation_bucket(postgrest):
+    created_at = "2026-10-01T08:30:00+00:00"
+    postgrest.tables["articles"].append({"id": "a1", "user_id": USER, "created_at": created_at, **ARTICLE.model_dump()})
+
+    async def run():
+        deleted = await article_service.delete_article(USER, "a1")
+        missing = await article_service.delete_article(USER, "a1")
+        await rollup_service.drain()
+        return deleted, missing
+
+    assert asyncio.run(run()) == (True, False)
+    assert rollups(postgrest) == [{"p_user_id": USER, "p_articles": -1, "p_at": created_at}]
+
+
+def test_failed_rollup_does_not_fail_the_write(postgrest, monkeypatch):
+    def down(function, params):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(rollup_service.async_supabase, "rpc", down)
+
+    async def run():
+        saved = await article_service.save_article(USER, ARTICLE)
+        await rollup_service.drain()
+        return saved
+
+    assert asyncio.run(run()).keyword == "coffee beans"
+    assert len(postgrest.tables["articles"]) == 1
@@ -291,28 +291,36 @@ export const api = {
     try {
       const token = typeof window !== 'undefined' ? localStorage.getItem('rankcraft_token') : null;
       
-      const response = await fetch(`${API_BASE_URL}/articles/`, {
-        method: 'GET',
-        headers: {
-          'Content-Type': 'application/json',
-          'Authorization': `Bearer ${token}`,
-        },
-      });
+      // The list is paginated; follow X-Next-Cursor until the last page
+      const articles = [];
+      let cursor: string | null = null;
+      do {
+        const query: string = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+        const response: Response = await fetch(`${API_BASE_URL}/articles/${query}`, {
+          method: 'GET',
+          headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${token}`,
+          },
+        });
+
+        if (!response.ok) {
+          const errorData = await response.text();
+          let errorMessage = 'Failed to fetch articles';
+          try {
+            const parsedError = JSON.parse(errorData);
+            errorMessage = parsedError.error || errorMessage;
+          } catch {}
+          throw new Error(errorMessage);
+        }
 
-      if (!response.ok) {
-        const errorData = await response.text();
-        let errorMessage = 'Failed to fetch articles';
-        try {
-          const parsedError = JSON.parse(errorData);
-          errorMessage = parsedError.error || errorMessage;
-        } catch {}
-        throw new Error(errorMessage);
-      }
+        articles.push(...await response.json());
+        cursor = response.headers.get('X-Next-Cursor');
+      } while (cursor);
 
-      const result = await response.json();
       return {
         success: true,
-        data: result
+        data: articles
       };
     } catch (error) {
       return {